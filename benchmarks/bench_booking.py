@@ -0,0 +1,75 @@
+"""Fire many concurrent book_interview calls and check that no slot is double-booked.
+
+Usage (from the repository root):
+    python benchmarks/bench_booking.py --workers 300
+"""
+
+import argparse
+import collections
+import datetime
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Counter, List
+
+DB_DIR: str = tempfile.mkdtemp(prefix="bench_booking_")
+os.environ["METADATA_DB_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'metadata.db')}"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from models import SessionLocal, sql_models  # noqa: E402
+from utils.store_metadata import MetaData  # noqa: E402
+from type_definitions import FunctionResponse  # noqa: E402
+
+
+def book_all(store: MetaData, requests: List[tuple], workers: int) -> Counter[str]:
+    """Book every (name, date, time) request concurrently and count the outcomes."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results: List[FunctionResponse] = list(pool.map(
+            lambda request: store.add_interview(
+                name=request[0], email=f"{request[0]}@example.com", date=request[1], time=request[2]
+            ),
+            requests,
+        ))
+    return collections.Counter(result["status"] for result in results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=300)
+    args = parser.parse_args()
+
+    store: MetaData = MetaData()
+
+    # Everyone races for the same slot, or for one overlapping it by 15 minutes.
+    same_slot = [
+        (f"same{index}", "2025-09-10", "15:00" if index % 2 else "15:15")
+        for index in range(args.workers)
+    ]
+    started: float = time.perf_counter()
+    outcomes: Counter[str] = book_all(store, same_slot, args.workers)
+    elapsed: float = time.perf_counter() - started
+    print(f"same slot:     {dict(outcomes)} in {elapsed:.2f}s")
+    assert outcomes["success"] == 1, "exactly one booking must win the contested slot"
+
+    # Distinct, non-overlapping slots: every booking should succeed.
+    first: datetime.datetime = datetime.datetime(2025, 10, 1, 9, 0)
+    distinct_slots = [
+        (f"distinct{index}", slot.date().isoformat(), slot.strftime("%H:%M"))
+        for index, slot in enumerate(first + datetime.timedelta(minutes=30 * n) for n in range(args.workers))
+    ]
+    started = time.perf_counter()
+    outcomes = book_all(store, distinct_slots, args.workers)
+    elapsed = time.perf_counter() - started
+    print(f"distinct slots: {dict(outcomes)} in {elapsed:.2f}s ({args.workers / elapsed:.0f} bookings/s)")
+    assert outcomes["success"] == args.workers, "non-overlapping bookings must all succeed"
+
+    with SessionLocal() as db:
+        stored: int = db.query(sql_models.DataInterview).count()
+    print(f"rows stored:   {stored}")
+    assert stored == args.workers + 1
+
+
+if __name__ == "__main__":
+    main()
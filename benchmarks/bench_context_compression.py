@@ -0,0 +1,172 @@
+"""Benchmark query-focused context compression of the answer prompt.
+
+Stores synthetic documents, retrieves passages (lexical mode, one
+neighbouring chunk each side, as `retrieve_database_info` does) for a fixed
+set of questions with known answers, and compares the uncompressed context
+with the compressed one: estimated prompt tokens, compression time, and
+answer retention - the share of questions whose answer is in the
+uncompressed context that still have it after compression.
+
+With --live, both prompts are also sent to Gemini (GEMINI_API_KEY is needed)
+and the answers are compared by token-overlap F1 and by whether each
+contains the expected answer.
+
+Usage (from the repository root):
+    python benchmarks/bench_context_compression.py --documents 20 --questions 100 --budget 512
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Tuple
+
+DB_DIR: str = tempfile.mkdtemp(prefix="bench_context_")
+os.environ["METADATA_DB_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'metadata.db')}"
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from documents import make_sentences  # noqa: E402
+from type_definitions import ChunkRecord, CompressedContext, ContextPassage  # noqa: E402
+from utils import MetaData, SqlData, TextProcessor  # noqa: E402
+from utils.context_compression import ContextCompressor, estimate_tokens  # noqa: E402
+from utils.embedded_store import tokenize  # noqa: E402
+
+
+def populate(documents: int, chars: int) -> None:
+    """Store the synthetic documents, chunked like uploads."""
+    store: MetaData = MetaData()
+    processor: TextProcessor = TextProcessor()
+    for document in range(documents):
+        text: str = " ".join(make_sentences(chars, seed=document))
+        spans = processor.chunk_spans(text, "char", chunk_size=500, overlap=50)
+        records: List[ChunkRecord] = [
+            ChunkRecord(uuid=str(uuid.uuid4()), content=span["content"], chunk_index=position,
+                        start_offset=span["start"], end_offset=span["end"])
+            for position, span in enumerate(spans)
+        ]
+        store.add_data(f"handbook_{document}.txt", records)
+
+
+def make_questions(count: int, documents: int, sentences: int) -> List[Tuple[str, str]]:
+    """Questions with the text their answer must contain, half by policy number and half by team."""
+    rng: random.Random = random.Random(11)
+    questions: List[Tuple[str, str]] = []
+    for index in range(count):
+        seed: int = rng.randrange(documents)
+        sentence: int = rng.randrange(9, sentences, 10)
+        if index % 2:
+            questions.append((f"Which team has policy P-{seed:03d}-{sentence:06d}?", f"team {sentence}"))
+        else:
+            questions.append((f"What is the policy number for team {sentence}?", f"-{sentence:06d}"))
+    return questions
+
+
+def uncompressed_prompt(question: str, passages: List[ContextPassage]) -> str:
+    """The answer prompt as built before compression."""
+    context: str = "\n\n".join(passage["text"] for passage in passages)
+    return f'based on the user query {question} and the context {context} give the answer.'
+
+
+def compressed_prompt(question: str, context: CompressedContext) -> str:
+    """The answer prompt as built by retrieve_database_info."""
+    return (
+        f'based on the user query {question} and the context below give the answer, '
+        f'citing the sources you use by their [n] numbers.\n\n{context["text"]}'
+    )
+
+
+def f1(first: str, second: str) -> float:
+    """Token-overlap F1 of two answers."""
+    a: Counter = Counter(tokenize(first))
+    b: Counter = Counter(tokenize(second))
+    common: int = sum((a & b).values())
+    if not common:
+        return 0.0
+    precision: float = common / sum(a.values())
+    recall: float = common / sum(b.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--chars", type=int, default=250_000, help="characters per document")
+    parser.add_argument("--questions", type=int, default=100)
+    parser.add_argument("--budget", type=int, nargs="+", default=[256, 512, 1024], help="token budgets to compare")
+    parser.add_argument("--live", action="store_true", help="also compare Gemini's answers to both prompts")
+    args = parser.parse_args()
+
+    started: float = time.perf_counter()
+    populate(args.documents, args.chars)
+    print(f"stored {args.documents} documents in {time.perf_counter() - started:.1f}s ({DB_DIR})")
+
+    sentences: int = len(make_sentences(args.chars, seed=0))
+    questions: List[Tuple[str, str]] = make_questions(args.questions, args.documents, sentences)
+    retriever: SqlData = SqlData(retrieval_mode="lexical")
+    retrieved: List[List[ContextPassage]] = [
+        retriever.context_passages(question, neighbours=1) for question, _ in questions
+    ]
+    answerable: List[bool] = [
+        any(answer in passage["text"] for passage in passages)
+        for (_, answer), passages in zip(questions, retrieved)
+    ]
+    baseline: List[int] = [
+        estimate_tokens(uncompressed_prompt(question, passages))
+        for (question, _), passages in zip(questions, retrieved)
+    ]
+    print(f"uncompressed prompt: {statistics.mean(baseline):.0f} tokens on average, "
+          f"answer in context for {sum(answerable)}/{len(questions)} questions")
+
+    print(f"{'budget':>7} {'tokens':>7} {'saved':>7} {'p50 ms':>7} {'p95 ms':>7} {'retention':>10}")
+    results: Dict[int, List[CompressedContext]] = {}
+    for budget in args.budget:
+        compressor: ContextCompressor = ContextCompressor(token_budget=budget)
+        samples: List[float] = []
+        contexts: List[CompressedContext] = []
+        for (question, _), passages in zip(questions, retrieved):
+            began: float = time.perf_counter()
+            contexts.append(compressor.compress(question, passages))
+            samples.append((time.perf_counter() - began) * 1000)
+        results[budget] = contexts
+
+        tokens: List[int] = [
+            estimate_tokens(compressed_prompt(question, context))
+            for (question, _), context in zip(questions, contexts)
+        ]
+        kept: int = sum(
+            answer in context["text"]
+            for (_, answer), context, has_answer in zip(questions, contexts, answerable) if has_answer
+        )
+        samples.sort()
+        print(f"{budget:>7} {statistics.mean(tokens):>7.0f} {1 - sum(tokens) / sum(baseline):>7.1%} "
+              f"{statistics.median(samples):>7.3f} {samples[int(len(samples) * 0.95) - 1]:>7.3f} "
+              f"{kept / max(sum(answerable), 1):>10.1%}")
+
+    if not args.live:
+        return
+
+    from utils import get_gateway
+
+    gateway = get_gateway()
+    budget = args.budget[len(args.budget) // 2]
+    overlaps: List[float] = []
+    correct: Dict[str, int] = {"uncompressed": 0, "compressed": 0}
+    for (question, answer), passages, context in zip(questions, retrieved, results[budget]):
+        full: str = gateway.generate(uncompressed_prompt(question, passages), call_name="bench_uncompressed")
+        short: str = gateway.generate(compressed_prompt(question, context), call_name="bench_compressed")
+        overlaps.append(f1(full, short))
+        correct["uncompressed"] += answer in full
+        correct["compressed"] += answer in short
+    print(f"live answers at budget {budget}: mean token F1 between prompts {statistics.mean(overlaps):.3f}, "
+          f"correct uncompressed {correct['uncompressed']}/{len(questions)}, "
+          f"compressed {correct['compressed']}/{len(questions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark DOCX extraction and chunking on large generated documents.
+
+Compares the previous extractor (body paragraphs only, built with `+=`, then
+chunked as one string) with the streaming extractor (paragraphs, tables and
+headers/footers in document order, chunked segment by segment). Reports
+throughput, peak traced memory and how much table text each one captures.
+
+Usage (from the repository root):
+    python benchmarks/bench_docx.py --chars 1000000 5000000 --strategy char
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from docx import Document  # noqa: E402
+
+from documents import make_docx  # noqa: E402
+from type_definitions import ChunkSpan  # noqa: E402
+from utils import TextProcessor  # noqa: E402
+from utils.extraction import extract_segments  # noqa: E402
+
+
+def paragraphs_only(content: bytes, strategy: str) -> List[ChunkSpan]:
+    """The previous extractor: body paragraphs concatenated into one string."""
+    doc = Document(io.BytesIO(content))
+    text: str = ""
+    for para in doc.paragraphs:
+        text += para.text + "\n"
+    return TextProcessor().chunk_spans(text, strategy, chunk_size=100)
+
+
+def streaming(content: bytes, strategy: str) -> List[ChunkSpan]:
+    """The streaming extractor feeding the incremental chunker."""
+    document = extract_segments("bench.docx", content)
+    return list(TextProcessor().chunk_stream(document["segments"], strategy, chunk_size=100))
+
+
+def measure(extract: Callable[[bytes, str], List[ChunkSpan]], content: bytes, strategy: str) -> Dict[str, float]:
+    """Run one extractor and return its timing, peak memory and output size."""
+    started: float = time.perf_counter()
+    spans: List[ChunkSpan] = extract(content, strategy)
+    seconds: float = time.perf_counter() - started
+    characters: int = spans[-1]["end"] if spans else 0
+
+    tracemalloc.start()
+    extract(content, strategy)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    table_rows: int = sum(1 for span in spans if "Candidate " in span["content"] and " slot " in span["content"])
+    return {
+        "seconds": round(seconds, 3),
+        "chars_per_second": round(characters / seconds),
+        "peak_mb": round(peak / 1e6, 1),
+        "characters": characters,
+        "chunks": len(spans),
+        "table_chunks": table_rows,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chars", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    parser.add_argument("--strategy", choices=["char", "sentence"], default="char")
+    args = parser.parse_args()
+
+    print(f"{'chars':>10} {'docx MB':>8} {'extractor':16} {'seconds':>8} {'chars/s':>10} "
+          f"{'peak MB':>8} {'chars out':>10} {'chunks':>8} {'table chunks':>12}")
+    for size in args.chars:
+        content: bytes = make_docx(size, seed=size % 997)
+        for name, extract in (("paragraphs_only", paragraphs_only), ("streaming", streaming)):
+            result: Dict[str, float] = measure(extract, content, args.strategy)
+            print(f"{size:>10} {len(content) / 1e6:>8.1f} {name:16} {result['seconds']:>8.3f} "
+                  f"{result['chars_per_second']:>10} {result['peak_mb']:>8.1f} {result['characters']:>10} "
+                  f"{result['chunks']:>8} {result['table_chunks']:>12}")
+
+
+if __name__ == "__main__":
+    main()
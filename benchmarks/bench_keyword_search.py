@@ -0,0 +1,131 @@
+"""Benchmark lexical retrieval through the SQLite FTS5 keyword index.
+
+Fills the TextChunk table with synthetic documents for two tenants, then
+reports keyword search latency and hit rate for exact-term questions
+(policy numbers) and for natural-language questions, next to a LIKE scan
+of the chunk text as the baseline without an index. Also reports how long
+backfilling the index for an existing database takes.
+
+Usage (from the repository root):
+    python benchmarks/bench_keyword_search.py --chunks 100000 --queries 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from typing import Callable, Dict, List, Tuple
+
+DB_DIR: str = tempfile.mkdtemp(prefix="bench_keyword_")
+os.environ["METADATA_DB_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'metadata.db')}"
+# The LIKE baseline scans TextChunk.textChunk, which is only filled with inline storage.
+os.environ["CHUNK_TEXT_STORAGE"] = "inline"
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from sqlalchemy import text  # noqa: E402
+
+from documents import make_sentences  # noqa: E402
+from models import engine  # noqa: E402
+from type_definitions import ChunkRecord  # noqa: E402
+from utils import MetaData, SqlData, TextProcessor  # noqa: E402
+from utils.keyword_index import FTS_TABLE, KeywordIndex  # noqa: E402
+
+TENANTS: Tuple[str, ...] = ("acme", "globex")
+
+
+def populate(chunks: int) -> int:
+    """Store about `chunks` chunks per tenant and return the number of documents per tenant."""
+    store: MetaData = MetaData()
+    processor: TextProcessor = TextProcessor()
+    documents: int = 0
+    stored: int = 0
+    while stored < chunks:
+        text_: str = " ".join(make_sentences(250_000, seed=documents))
+        spans = processor.chunk_spans(text_, "char", chunk_size=500, overlap=50)
+        for tenant_id in TENANTS:
+            records: List[ChunkRecord] = [
+                ChunkRecord(uuid=str(uuid.uuid4()), content=span["content"], chunk_index=position,
+                            start_offset=span["start"], end_offset=span["end"])
+                for position, span in enumerate(spans)
+            ]
+            store.add_documents([(f"handbook_{documents}.txt", records)], tenant_id=tenant_id)
+        stored += len(spans)
+        documents += 1
+    return documents
+
+
+def timed(call: Callable[[str], List[str]], questions: List[Tuple[str, str]]) -> Dict[str, float]:
+    """Run every question and return latency statistics and the share answered by the top result."""
+    lookup: SqlData = SqlData(retrieval_mode="lexical")
+    samples: List[float] = []
+    hits: int = 0
+    for question, answer in questions:
+        started: float = time.perf_counter()
+        chunk_ids: List[str] = call(question)
+        samples.append((time.perf_counter() - started) * 1000)
+        top = lookup.get_chunks_data(chunk_ids[:1], tenant_id=TENANTS[0])
+        hits += bool(top) and answer in top[0]["text"]
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+        "hit_rate": round(hits / len(questions), 3),
+    }
+
+
+def like_scan(question: str) -> List[str]:
+    """The baseline: a LIKE scan for the question's last word, restricted to the tenant."""
+    term: str = question.rstrip("?").split()[-1]
+    with engine.connect() as connection:
+        return list(connection.execute(
+            text("SELECT chunkID FROM TextChunk WHERE tenantId = :tenant AND textChunk LIKE :term LIMIT 10"),
+            {"tenant": TENANTS[0], "term": f"%{term}%"},
+        ).scalars())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=100_000, help="chunks per tenant")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    started: float = time.perf_counter()
+    documents: int = populate(args.chunks)
+    print(f"stored {documents} documents per tenant in {time.perf_counter() - started:.1f}s ({DB_DIR})")
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f"DROP TABLE {FTS_TABLE}")
+    started = time.perf_counter()
+    backfilled: int = KeywordIndex(engine).ensure()
+    print(f"backfilled {backfilled} chunks in {time.perf_counter() - started:.2f}s")
+
+    rng: random.Random = random.Random(3)
+    numbers: List[Tuple[int, int]] = [(rng.randrange(documents), rng.randrange(9, 2500, 10)) for _ in range(args.queries)]
+    exact: List[Tuple[str, str]] = [
+        (f"Which team has policy P-{seed:03d}-{sentence:06d}?", f"P-{seed:03d}-{sentence:06d}")
+        for seed, sentence in numbers
+    ]
+    natural: List[Tuple[str, str]] = [
+        (f"What is the policy number for team {sentence}?", f"team {sentence} is")
+        for _, sentence in numbers
+    ]
+
+    retriever: SqlData = SqlData(retrieval_mode="lexical")
+
+    def search(question: str) -> List[str]:
+        return retriever.search(question, tenant_id=TENANTS[0])
+
+    print(f"{'method':12} {'questions':16} {'p50 ms':>8} {'p95 ms':>8} {'hit rate':>9}")
+    for method, call in (("fts5", search), ("like_scan", like_scan)):
+        for name, questions in (("exact_term", exact), ("natural_language", natural)):
+            result: Dict[str, float] = timed(call, questions)
+            print(f"{method:12} {name:16} {result['p50_ms']:>8.3f} {result['p95_ms']:>8.3f} {result['hit_rate']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
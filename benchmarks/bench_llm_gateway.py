@@ -0,0 +1,84 @@
+"""Measure LlmGateway throughput and failure handling against the fake Gemini server.
+
+Usage (from the repository root):
+    python benchmarks/bench_llm_gateway.py --calls 200 --distinct-prompts 50 --error-rate 0.2
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from fake_gemini import FakeGeminiConfig, start_fake_gemini  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=32, help="concurrent callers")
+    parser.add_argument("--distinct-prompts", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--rps", type=float, default=50.0)
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    config = FakeGeminiConfig(latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 2, error_rate=args.error_rate)
+    server, url = start_fake_gemini(config=config)
+    os.environ["GEMINI_API_ENDPOINT"] = url
+    os.environ.setdefault("GEMINI_API_KEY", "fake-key")
+
+    from utils.llm_gateway import LlmGateway, LlmGatewayError  # noqa: E402
+
+    gateway = LlmGateway(
+        requests_per_second=args.rps,
+        burst=int(args.rps),
+        max_concurrency=args.max_concurrency,
+        timeout=args.timeout,
+        backoff_base=0.05,
+        backoff_max=1.0,
+    )
+
+    def one_call(index: int) -> Optional[float]:
+        started: float = time.perf_counter()
+        try:
+            gateway.generate(f"question {index % args.distinct_prompts}", call_name="bench")
+        except LlmGatewayError:
+            return None
+        return (time.perf_counter() - started) * 1000
+
+    started: float = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        latencies: List[Optional[float]] = list(pool.map(one_call, range(args.calls)))
+    elapsed: float = time.perf_counter() - started
+
+    with urllib.request.urlopen(f"{url}/stats") as response:
+        server_stats: Dict[str, int] = json.load(response)
+    server.shutdown()
+    server.server_close()
+
+    succeeded: List[float] = sorted(latency for latency in latencies if latency is not None)
+    result: Dict[str, float] = {
+        "calls": args.calls,
+        "succeeded": len(succeeded),
+        "failed": args.calls - len(succeeded),
+        "calls_per_second": round(args.calls / elapsed, 1),
+        "p50_ms": round(statistics.median(succeeded), 1) if succeeded else 0.0,
+        "p99_ms": round(succeeded[max(0, int(len(succeeded) * 0.99) - 1)], 1) if succeeded else 0.0,
+        "upstream_requests": server_stats["requests"],
+        "upstream_injected_errors": server_stats["errors"],
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
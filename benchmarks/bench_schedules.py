@@ -0,0 +1,100 @@
+"""Benchmark get_past_schedules against a Meetings table with many rows.
+
+Usage (from the repository root):
+    python benchmarks/bench_schedules.py --meetings 100000
+"""
+
+import argparse
+import datetime
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+DB_DIR: str = tempfile.mkdtemp(prefix="bench_schedules_")
+os.environ["METADATA_DB_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'metadata.db')}"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from sqlalchemy import insert, text  # noqa: E402
+
+from models import engine, sql_models  # noqa: E402
+from utils.functions import GetFunctions  # noqa: E402
+
+
+def populate(meetings: int) -> None:
+    """Insert synthetic meetings spread over roughly three years."""
+    sql_models.Base.metadata.create_all(bind=engine)
+    first_day: datetime.date = datetime.date(2023, 1, 1)
+    rows: List[Dict] = []
+    for index in range(meetings):
+        interview_date: datetime.date = first_day + datetime.timedelta(days=random.randrange(1095))
+        interview_time: datetime.time = datetime.time(hour=random.randrange(8, 18), minute=random.choice((0, 30)))
+        rows.append({
+            "candidate_name": f"Candidate {index % 5000}",
+            "candidate_email": f"candidate{index % 5000}@example.com",
+            "interview_date": interview_date,
+            "interview_time": interview_time,
+            "starts_at": datetime.datetime.combine(interview_date, interview_time),
+        })
+    with engine.begin() as connection:
+        connection.execute(insert(sql_models.DataInterview), rows)
+
+
+def timed(call: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Run call repeatedly and return latency statistics in milliseconds."""
+    samples: List[float] = []
+    for _ in range(repeat):
+        started: float = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+    }
+
+
+def full_table_scan(tools: GetFunctions) -> List[Dict]:
+    """The previous behaviour: load every row and serialise every column."""
+    rows = tools._get_data.db.query(sql_models.DataInterview).all()
+    return [{column.name: str(getattr(row, column.name)) for column in row.__table__.columns} for row in rows]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--meetings", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(7)
+    populate(args.meetings)
+    tools: GetFunctions = GetFunctions()
+
+    cases: Dict[str, Callable[[], object]] = {
+        "full_table_scan": lambda: full_table_scan(tools),
+        "latest_20": lambda: tools.get_past_schedules(),
+        "one_week": lambda: tools.get_past_schedules(start_date="2024-03-01", end_date="2024-03-07", limit=100),
+        "one_candidate": lambda: tools.get_past_schedules(candidate="candidate42@example.com"),
+    }
+
+    print(f"meetings={args.meetings}")
+    for name, call in cases.items():
+        repeat: int = max(1, args.repeat // 10) if name == "full_table_scan" else args.repeat
+        stats: Dict[str, float] = timed(call, repeat)
+        payload_chars: int = len(str(call()))
+        print(f"{name:16} p50={stats['p50_ms']:>9.3f} ms  p95={stats['p95_ms']:>9.3f} ms  payload={payload_chars} chars")
+
+    with engine.connect() as connection:
+        plan = connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM Meetings "
+            "WHERE interview_date >= '2024-03-01' AND interview_date <= '2024-03-07' "
+            "ORDER BY interview_date DESC, interview_time DESC LIMIT 21"
+        )).fetchall()
+    print("date-range plan:", "; ".join(row[-1] for row in plan))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark the size of metadata.db and chunk read latency per chunk text storage.
+
+Each storage (`CHUNK_TEXT_STORAGE`) is measured in its own process with its
+own database: "inline" stores every chunk's text in TextChunk, "blocks" stores
+each document's text once in compressed blocks and chunks as offset ranges.
+The script reports the database size, ingest time and the latency of reading
+chunks by id, cold (blocks not cached) and warm.
+
+Usage (from the repository root):
+    python benchmarks/bench_text_storage.py --documents 20 --chars 500000 --chunk-size 100 --overlap 50
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List
+
+BENCH_DIR: str = os.path.dirname(os.path.abspath(__file__))
+STORAGES: List[str] = ["inline", "blocks"]
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    samples.sort()
+    return {"p50_ms": round(statistics.median(samples), 3), "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3)}
+
+
+def measure(args: argparse.Namespace) -> Dict[str, Any]:
+    """Ingest the corpus into this process's database and measure it."""
+    sys.path.insert(0, BENCH_DIR)
+    sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+    from documents import make_sentences
+    from models import engine
+    from type_definitions import ChunkRecord
+    from utils import MetaData, SqlData, TextProcessor
+    from utils.text_store import LruCache
+
+    store: MetaData = MetaData()
+    processor: TextProcessor = TextProcessor()
+    chunk_ids: List[str] = []
+    text_chars: int = 0
+    started: float = time.perf_counter()
+    for document in range(args.documents):
+        text: str = " ".join(make_sentences(args.chars, seed=document))
+        text_chars += len(text)
+        spans = processor.chunk_spans(text, "char", chunk_size=args.chunk_size, overlap=args.overlap)
+        records: List[ChunkRecord] = [
+            ChunkRecord(uuid=str(uuid.uuid4()), content=span["content"], chunk_index=position,
+                        start_offset=span["start"], end_offset=span["end"])
+            for position, span in enumerate(spans)
+        ]
+        store.add_data(f"handbook_{document}.txt", records)
+        chunk_ids.extend(record["uuid"] for record in records)
+    ingest_seconds: float = time.perf_counter() - started
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        page_size: int = connection.exec_driver_sql("PRAGMA page_size").scalar()
+        pages: int = connection.exec_driver_sql("PRAGMA page_count").scalar()
+
+    rng: random.Random = random.Random(7)
+    lookups: List[List[str]] = [rng.sample(chunk_ids, 10) for _ in range(args.queries)]
+    retriever: SqlData = SqlData()
+    cold: List[float] = []
+    warm: List[float] = []
+    for ids in lookups:
+        retriever.text_store.cache = LruCache(0)
+        retriever.db.expire_all()
+        started = time.perf_counter()
+        retriever.get_chunks_data(ids)
+        cold.append((time.perf_counter() - started) * 1000)
+    retriever.text_store.cache = LruCache(4096)
+    for ids in lookups + lookups:
+        retriever.db.expire_all()
+        started = time.perf_counter()
+        retriever.get_chunks_data(ids)
+        warm.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "storage": os.environ["CHUNK_TEXT_STORAGE"],
+        "chunks": len(chunk_ids),
+        "text_mb": round(text_chars / 1e6, 2),
+        "db_mb": round(page_size * pages / 1e6, 2),
+        "ingest_seconds": round(ingest_seconds, 2),
+        "read_cold": percentiles(cold),
+        "read_warm": percentiles(warm[len(lookups):]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--chars", type=int, default=500_000, help="characters per document")
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--overlap", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=200, help="lookups of 10 random chunks")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(args)))
+        return
+
+    print(f"{'storage':8} {'chunks':>8} {'text MB':>8} {'db MB':>8} {'ingest s':>9} "
+          f"{'cold p50':>9} {'cold p95':>9} {'warm p50':>9} {'warm p95':>9}")
+    for storage in STORAGES:
+        work_dir: str = tempfile.mkdtemp(prefix="bench_text_storage_")
+        env: Dict[str, str] = dict(
+            os.environ,
+            CHUNK_TEXT_STORAGE=storage,
+            METADATA_DB_URL=f"sqlite:///{os.path.join(work_dir, 'metadata.db')}",
+        )
+        output: str = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", *sys.argv[1:]],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout
+        result: Dict[str, Any] = json.loads(output.strip().splitlines()[-1])
+        print(f"{storage:8} {result['chunks']:>8} {result['text_mb']:>8.2f} {result['db_mb']:>8.2f} "
+              f"{result['ingest_seconds']:>9.2f} {result['read_cold']['p50_ms']:>9.3f} {result['read_cold']['p95_ms']:>9.3f} "
+              f"{result['read_warm']['p50_ms']:>9.3f} {result['read_warm']['p95_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
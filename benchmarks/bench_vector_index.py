@@ -0,0 +1,184 @@
+"""Benchmark the vector index presets of `models.weaviate_model` against a running Weaviate.
+
+For each preset a collection with self-provided vectors is filled with a
+synthetic clustered corpus (CLIP-sized by default). The script reports import
+throughput, query latency and recall@10 against exact numpy search. It also
+reports the memory footprint: always as an estimate from the index layout,
+and as measured Go heap growth when Weaviate's Prometheus endpoint is
+reachable.
+
+Start Weaviate with async indexing (needed by hnsw_pq and dynamic) and metrics:
+    WEAVIATE_ASYNC_INDEXING=true WEAVIATE_PROMETHEUS=true docker compose up -d weaviate
+
+Usage (from the repository root):
+    python benchmarks/bench_vector_index.py --objects 100000 --queries 200
+    python benchmarks/bench_vector_index.py --presets hnsw hnsw_bq --ef 128 --max-connections 16
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+os.environ.setdefault("METADATA_DB_URL", "sqlite://")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np  # noqa: E402
+import weaviate  # noqa: E402
+from weaviate.classes.config import Configure, DataType, Property  # noqa: E402
+from weaviate.util import generate_uuid5  # noqa: E402
+
+from models import VECTOR_INDEX_PRESETS, vector_index_config  # noqa: E402
+
+
+def make_corpus(objects: int, queries: int, dims: int, clusters: int, seed: int) -> Dict[str, np.ndarray]:
+    """Unit vectors drawn around random cluster centres, like embeddings of related documents."""
+    rng: np.random.Generator = np.random.default_rng(seed)
+    centres: np.ndarray = rng.normal(size=(clusters, dims)).astype(np.float32)
+
+    def sample(count: int) -> np.ndarray:
+        vectors = centres[rng.integers(0, clusters, count)] + 0.6 * rng.normal(size=(count, dims)).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    return {"vectors": sample(objects), "queries": sample(queries)}
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> List[set]:
+    """The true k nearest neighbours of every query by cosine similarity."""
+    truth: List[set] = []
+    for start in range(0, len(queries), 64):
+        scores: np.ndarray = queries[start:start + 64] @ vectors.T
+        top: np.ndarray = np.argpartition(-scores, k, axis=1)[:, :k]
+        truth.extend(set(row.tolist()) for row in top)
+    return truth
+
+
+def heap_bytes(metrics_url: Optional[str]) -> Optional[float]:
+    """Weaviate's in-use Go heap, or None if the metrics endpoint is unavailable."""
+    if not metrics_url:
+        return None
+    try:
+        with urllib.request.urlopen(metrics_url, timeout=5) as response:
+            text: str = response.read().decode()
+    except OSError:
+        return None
+    match = re.search(r"^go_memstats_heap_inuse_bytes\s+(\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def estimated_bytes(preset: str, objects: int, dims: int, max_connections: int, dynamic_threshold: int) -> int:
+    """Rough in-memory size: cached vectors plus the HNSW graph (layer 0 holds 2 x maxConnections links)."""
+    graph: int = objects * 2 * max_connections * 8
+    full: int = objects * dims * 4
+    pq: int = objects * (dims // 4)
+    bq: int = objects * dims // 8
+    if preset == "hnsw":
+        return full + graph
+    elif preset == "hnsw_pq":
+        return pq + graph
+    elif preset == "hnsw_bq":
+        return bq + graph
+    elif preset == "flat_bq":
+        return bq
+    return bq if objects < dynamic_threshold else pq + graph
+
+
+def run_preset(client: Any, preset: str, corpus: Dict[str, np.ndarray], truth: List[set], args: argparse.Namespace) -> Dict[str, Any]:
+    name: str = f"BenchIndex_{preset}"
+    if client.collections.exists(name):
+        client.collections.delete(name)
+
+    heap_before: Optional[float] = heap_bytes(args.metrics_url)
+    collection = client.collections.create(
+        name=name,
+        properties=[Property(name="position", data_type=DataType.INT)],
+        vector_config=Configure.Vectors.self_provided(vector_index_config=vector_index_config(
+            preset,
+            ef=args.ef,
+            ef_construction=args.ef_construction,
+            max_connections=args.max_connections,
+            pq_training_limit=args.pq_training_limit,
+            dynamic_threshold=args.dynamic_threshold,
+        )),
+    )
+
+    started: float = time.perf_counter()
+    with collection.batch.fixed_size(batch_size=1000) as batch:
+        for position, vector in enumerate(corpus["vectors"]):
+            batch.add_object(properties={"position": position}, uuid=generate_uuid5(position), vector=vector.tolist())
+    collection.batch.wait_for_vector_indexing()
+    import_seconds: float = time.perf_counter() - started
+    failed: int = len(collection.batch.failed_objects)
+
+    latencies: List[float] = []
+    hits: int = 0
+    for query, expected in zip(corpus["queries"], truth):
+        started = time.perf_counter()
+        response = collection.query.near_vector(near_vector=query.tolist(), limit=10, return_properties=["position"])
+        latencies.append((time.perf_counter() - started) * 1000)
+        hits += len(expected & {obj.properties["position"] for obj in response.objects})
+    heap_after: Optional[float] = heap_bytes(args.metrics_url)
+
+    if not args.keep:
+        client.collections.delete(name)
+
+    objects: int = len(corpus["vectors"])
+    latencies.sort()
+    return {
+        "preset": preset,
+        "import_objects_per_second": round(objects / import_seconds),
+        "failed_objects": failed,
+        "query_p50_ms": round(statistics.median(latencies), 2),
+        "query_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "recall_at_10": round(hits / (10 * len(truth)), 4),
+        "estimated_mb": round(estimated_bytes(
+            preset, objects, corpus["vectors"].shape[1], args.max_connections or 32, args.dynamic_threshold
+        ) / 1e6, 1),
+        "measured_heap_mb": round((heap_after - heap_before) / 1e6, 1) if heap_before and heap_after else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.getenv("WEAVIATE_HOST", "localhost"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("WEAVIATE_PORT", "8080")))
+    parser.add_argument("--metrics-url", default="http://localhost:2112/metrics")
+    parser.add_argument("--presets", nargs="+", choices=VECTOR_INDEX_PRESETS, default=list(VECTOR_INDEX_PRESETS))
+    parser.add_argument("--objects", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dims", type=int, default=512, help="512 matches multi2vec-clip ViT-B-32")
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--ef", type=int, default=None)
+    parser.add_argument("--ef-construction", type=int, default=None)
+    parser.add_argument("--max-connections", type=int, default=None)
+    parser.add_argument("--pq-training-limit", type=int, default=10_000)
+    parser.add_argument("--dynamic-threshold", type=int, default=10_000)
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark collections afterwards")
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    corpus: Dict[str, np.ndarray] = make_corpus(args.objects, args.queries, args.dims, args.clusters, seed=7)
+    truth: List[set] = exact_top_k(corpus["vectors"], corpus["queries"], k=10)
+
+    results: List[Dict[str, Any]] = []
+    with weaviate.connect_to_local(host=args.host, port=args.port) as client:
+        print(f"{'preset':12} {'import obj/s':>12} {'p50 ms':>8} {'p95 ms':>8} {'recall@10':>10} {'est MB':>8} {'heap MB':>8}")
+        for preset in args.presets:
+            result: Dict[str, Any] = run_preset(client, preset, corpus, truth, args)
+            results.append(result)
+            heap: str = "n/a" if result["measured_heap_mb"] is None else f"{result['measured_heap_mb']:.1f}"
+            print(f"{preset:12} {result['import_objects_per_second']:>12} {result['query_p50_ms']:>8.2f} "
+                  f"{result['query_p95_ms']:>8.2f} {result['recall_at_10']:>10.4f} {result['estimated_mb']:>8.1f} {heap:>8}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({"objects": args.objects, "dims": args.dims, "results": results}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
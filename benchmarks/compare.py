@@ -0,0 +1,55 @@
+"""Compare two run_suite.py result files and flag regressions.
+
+Usage:
+    python benchmarks/compare.py baseline.json candidate.json --threshold 0.10
+
+Exits with status 1 when any metric is worse than the baseline by more than
+the threshold (a fraction).
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Tuple
+
+
+def load(path: str) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    with open(path, encoding="utf-8") as handle:
+        report: Dict[str, Any] = json.load(handle)
+    return {
+        (entry["name"], json.dumps(entry["labels"], sort_keys=True)): entry
+        for entry in report["results"]
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    baseline = load(args.baseline)
+    candidate = load(args.candidate)
+    regressions: int = 0
+
+    for key in sorted(baseline.keys() & candidate.keys()):
+        before: float = baseline[key]["value"]
+        after: float = candidate[key]["value"]
+        if before == 0:
+            continue
+        change: float = (after - before) / before
+        worse: bool = change > args.threshold if baseline[key]["lower_is_better"] else change < -args.threshold
+        regressions += worse
+        marker: str = "REGRESSION" if worse else ""
+        print(f"{key[0]:28} {key[1]:48} {before:>12.3f} -> {after:>12.3f} {change:>+8.1%} {marker}")
+
+    for key in sorted(baseline.keys() ^ candidate.keys()):
+        print(f"{key[0]:28} {key[1]:48} only in {'baseline' if key in baseline else 'candidate'}")
+
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Deterministic synthetic TXT, DOCX and PDF documents for benchmarks."""
+
+import io
+import random
+from typing import List
+
+WORDS: List[str] = (
+    "candidate interview schedule policy benefits salary engineer manager onboarding review "
+    "remote office holiday leave contract probation training laptop security badge payroll "
+    "team project deadline feedback offer reference background relocation insurance pension"
+).split()
+
+
+def make_sentences(target_chars: int, seed: int = 0) -> List[str]:
+    """Generate sentences totalling about target_chars characters.
+
+    Every tenth sentence states a policy number, so exact-term questions have
+    a known answer in the corpus.
+    """
+    rng: random.Random = random.Random(seed)
+    sentences: List[str] = []
+    total: int = 0
+    while total < target_chars:
+        if len(sentences) % 10 == 9:
+            sentence: str = f"The policy number for team {len(sentences)} is P-{seed:03d}-{len(sentences):06d}."
+        else:
+            words: List[str] = [rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+            sentence = " ".join(words).capitalize() + "."
+        sentences.append(sentence)
+        total += len(sentence) + 1
+    return sentences
+
+
+def make_txt(target_chars: int, seed: int = 0) -> bytes:
+    """A UTF-8 text document of about target_chars characters."""
+    return " ".join(make_sentences(target_chars, seed)).encode("utf-8")
+
+
+def make_docx(target_chars: int, seed: int = 0, table_every: int = 20) -> bytes:
+    """A DOCX document of paragraphs with a small table after every table_every paragraphs."""
+    from docx import Document
+
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = f"Synthetic HR handbook {seed}"
+    sentences: List[str] = make_sentences(target_chars, seed)
+    for index in range(0, len(sentences), 5):
+        document.add_paragraph(" ".join(sentences[index:index + 5]))
+        if table_every and (index // 5) % table_every == table_every - 1:
+            table = document.add_table(rows=3, cols=3)
+            for row_index, row in enumerate(table.rows):
+                for column_index, cell in enumerate(row.cells):
+                    cell.text = f"Candidate {index + row_index} slot {column_index}"
+    buffer: io.BytesIO = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(target_chars: int, seed: int = 0, line_chars: int = 90, lines_per_page: int = 60) -> bytes:
+    """A text-only PDF of about target_chars characters, written without extra dependencies."""
+    text: str = " ".join(make_sentences(target_chars, seed))
+    lines: List[str] = [text[start:start + line_chars] for start in range(0, len(text), line_chars)]
+    pages: List[List[str]] = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)]
+
+    objects: List[bytes] = []
+    page_ids: List[int] = [4 + 2 * index for index in range(len(pages))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(
+        f"<< /Type /Pages /Kids [{' '.join(f'{page_id} 0 R' for page_id in page_ids)}] /Count {len(pages)} >>".encode()
+    )
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for page_id, page_lines in zip(page_ids, pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        stream: str = "BT /F1 9 Tf 11 TL 36 760 Td " + " ".join(
+            f"({_pdf_escape(line)}) '" for line in page_lines
+        ) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode("latin-1"))
+
+    output: io.BytesIO = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets: List[int] = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref_offset: int = output.tell()
+    output.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        output.write(f"{offset:010d} 00000 n \n".encode())
+    output.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode())
+    return output.getvalue()
+
+
+GENERATORS = {"txt": make_txt, "docx": make_docx, "pdf": make_pdf}
@@ -0,0 +1,171 @@
+"""A local stand-in for the Gemini REST API.
+
+Serves `POST /v1beta/models/<model>:generateContent` with scripted replies,
+configurable latency and injected 429/503 failures, so the LLM gateway and the
+chat pipeline can be exercised without a network or an API key. Point the
+application at it with `GEMINI_API_ENDPOINT=http://127.0.0.1:<port>`.
+
+Usage:
+    python benchmarks/fake_gemini.py --port 8123 --latency-ms 200 --error-rate 0.1
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FakeGeminiConfig:
+    """Behaviour of the fake server, shared by all request handlers."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        script: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """Initialize the configuration.
+
+        Args:
+            latency_ms: Base delay added to every successful reply.
+            jitter_ms: Maximum extra random delay.
+            error_rate: Fraction of requests answered with a 429 or 503 error.
+            script: Rules of the form {"match": "<substring>", "function_call":
+                {"name": ..., "args": {...}}}; a user message containing the
+                substring is answered with that function call.
+        """
+        self.latency_ms: float = latency_ms
+        self.jitter_ms: float = jitter_ms
+        self.error_rate: float = error_rate
+        self.script: List[Dict[str, Any]] = script or []
+        self.requests: int = 0
+        self.errors: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+
+def _last_user_parts(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the parts of the most recent content in the request."""
+    contents: List[Dict[str, Any]] = body.get("contents") or []
+    return contents[-1].get("parts", []) if contents else []
+
+
+def reply_for(body: Dict[str, Any], config: FakeGeminiConfig) -> Dict[str, Any]:
+    """Build the scripted model reply for a generateContent request body."""
+    parts: List[Dict[str, Any]] = _last_user_parts(body)
+    function_results = [part["functionResponse"] for part in parts if "functionResponse" in part]
+
+    if function_results:
+        summary: str = "; ".join(
+            f"{result.get('name')}: {json.dumps(result.get('response'))[:200]}" for result in function_results
+        )
+        reply_parts: List[Dict[str, Any]] = [{"text": f"Here is what I found. {summary}"}]
+    else:
+        text: str = " ".join(part.get("text", "") for part in parts)
+        calls = [rule["function_call"] for rule in config.script if body.get("tools") and rule["match"] in text]
+        if calls:
+            reply_parts = [{"functionCall": call} for call in calls]
+        else:
+            reply_parts = [{"text": f"Fake answer to: {text[:120]}"}]
+
+    return {
+        "candidates": [{
+            "content": {"role": "model", "parts": reply_parts},
+            "finishReason": "STOP",
+            "index": 0,
+        }],
+        "usageMetadata": {"promptTokenCount": 1, "candidatesTokenCount": 1, "totalTokenCount": 2},
+    }
+
+
+def make_handler(config: FakeGeminiConfig) -> type:
+    """Create a request handler class bound to a configuration."""
+
+    class FakeGeminiHandler(BaseHTTPRequestHandler):
+        """Answers generateContent calls and exposes /stats."""
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            data: bytes = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            if self.path.startswith("/stats"):
+                self._send_json(200, {"requests": config.requests, "errors": config.errors})
+            else:
+                self._send_json(404, {"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}})
+
+        def do_POST(self) -> None:
+            length: int = int(self.headers.get("Content-Length") or 0)
+            body: Dict[str, Any] = json.loads(self.rfile.read(length) or b"{}")
+
+            with config.lock:
+                config.requests += 1
+                failing: bool = random.random() < config.error_rate
+                if failing:
+                    config.errors += 1
+
+            if not self.path.split("?")[0].endswith(":generateContent"):
+                self._send_json(404, {"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}})
+                return
+            if failing:
+                code, status = random.choice(((429, "RESOURCE_EXHAUSTED"), (503, "UNAVAILABLE")))
+                self._send_json(code, {"error": {"code": code, "message": "injected failure", "status": status}})
+                return
+
+            time.sleep((config.latency_ms + random.uniform(0, config.jitter_ms)) / 1000)
+            self._send_json(200, reply_for(body, config))
+
+    return FakeGeminiHandler
+
+
+def start_fake_gemini(port: int = 0, config: Optional[FakeGeminiConfig] = None) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the fake server on a background thread.
+
+    Args:
+        port: Port to listen on; 0 picks a free port.
+        config: Server behaviour; defaults to instant, error-free replies.
+
+    Returns:
+        The server (call shutdown() to stop it) and its base URL.
+    """
+    server: ThreadingHTTPServer = ThreadingHTTPServer(("127.0.0.1", port), make_handler(config or FakeGeminiConfig()))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8123)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--script", help="JSON file with function-call rules")
+    args = parser.parse_args()
+
+    script: Optional[List[Dict[str, Any]]] = None
+    if args.script:
+        with open(args.script, encoding="utf-8") as handle:
+            script = json.load(handle)
+
+    config = FakeGeminiConfig(args.latency_ms, args.jitter_ms, args.error_rate, script)
+    server, url = start_fake_gemini(args.port, config)
+    print(f"Fake Gemini listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""End-to-end benchmark suite that runs fully offline.
+
+The API is served by uvicorn in-process with local stand-ins for every
+external service:
+
+- Weaviate: `standins.InMemoryWeaviateClient` (BM25 keyword index), or the
+  embedded NumPy vector store with `--vector-backend embedded`
+- Redis: `fakeredis`
+- Gemini: `fake_gemini` REST server with scripted function calls
+- SQLite: a temporary database (METADATA_DB_URL)
+
+It measures ingestion throughput per format and size, /chat latency per
+concurrency level, and retrieval latency as the corpus grows, then writes a
+JSON file that `compare.py` can diff between commits.
+
+Usage (from the repository root):
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/run_suite.py --output bench_results.json
+    python benchmarks/run_suite.py --quick
+    python benchmarks/run_suite.py --quick --vector-backend embedded
+    python benchmarks/run_suite.py --quick --retrieval-mode lexical
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List
+
+BENCH_DIR: str = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR: str = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "src"))
+
+from documents import GENERATORS, make_sentences  # noqa: E402
+from fake_gemini import FakeGeminiConfig, start_fake_gemini  # noqa: E402
+from standins import InMemoryWeaviateClient  # noqa: E402
+
+CHAT_SCRIPT: List[Dict[str, Any]] = [
+    {"match": "policy", "function_call": {"name": "retrieve_database_info", "args": {"user_query": "policy number for team 19"}}},
+    {"match": "schedule", "function_call": {"name": "get_past_schedules", "args": {"limit": 10}}},
+]
+
+
+class Results:
+    """Accumulates benchmark measurements in a machine-readable form."""
+
+    def __init__(self) -> None:
+        self.entries: List[Dict[str, Any]] = []
+
+    def add(self, name: str, value: float, unit: str, lower_is_better: bool, **labels: Any) -> None:
+        self.entries.append({
+            "name": name,
+            "labels": labels,
+            "value": round(value, 4),
+            "unit": unit,
+            "lower_is_better": lower_is_better,
+        })
+        label_text: str = " ".join(f"{key}={value}" for key, value in labels.items())
+        print(f"  {name:28} {label_text:32} {value:>12.3f} {unit}")
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered: List[float] = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=REPO_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_api(gemini_latency_ms: float, vector_backend: str, retrieval_mode: str) -> str:
+    """Configure the stand-ins, import the app and serve it on a background thread."""
+    work_dir: str = tempfile.mkdtemp(prefix="rag_bench_")
+    os.chdir(work_dir)
+    os.environ["METADATA_DB_URL"] = f"sqlite:///{os.path.join(work_dir, 'metadata.db')}"
+    os.environ.setdefault("GEMINI_API_KEY", "fake-key")
+    os.environ["GEMINI_REQUESTS_PER_SECOND"] = "1000"
+    os.environ["GEMINI_BURST"] = "1000"
+    os.environ["GEMINI_MAX_CONCURRENCY"] = "64"
+    os.environ["RETRIEVAL_MODE"] = retrieval_mode
+
+    _, gemini_url = start_fake_gemini(config=FakeGeminiConfig(
+        latency_ms=gemini_latency_ms, jitter_ms=gemini_latency_ms / 5, script=CHAT_SCRIPT
+    ))
+    os.environ["GEMINI_API_ENDPOINT"] = gemini_url
+
+    if vector_backend == "embedded":
+        os.environ["VECTOR_BACKEND"] = "embedded"
+        os.environ["EMBEDDED_VECTOR_DIR"] = os.path.join(work_dir, "vector_store")
+    else:
+        from models import set_weaviate_client
+        set_weaviate_client(InMemoryWeaviateClient())
+
+    import fakeredis
+    import uvicorn
+    from main import app
+    from routes import chat
+
+    redis_server = fakeredis.FakeServer()
+
+    def fake_redis_client() -> Iterator[fakeredis.FakeRedis]:
+        yield fakeredis.FakeRedis(server=redis_server)
+
+    app.dependency_overrides[chat.get_redis_client] = fake_redis_client
+
+    port: int = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def bench_ingestion(client: Any, results: Results, sizes: List[int]) -> None:
+    print("ingestion")
+    content_types: Dict[str, str] = {
+        "txt": "text/plain",
+        "pdf": "application/pdf",
+        "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    }
+    for file_format, generate in GENERATORS.items():
+        for size in sizes:
+            document: bytes = generate(size, seed=size % 997)
+            started: float = time.perf_counter()
+            response = client.post(
+                "/upload-docs/",
+                files={"file": (f"bench_{size}.{file_format}", document, content_types[file_format])},
+            )
+            elapsed: float = time.perf_counter() - started
+            response.raise_for_status()
+            match = re.search(r"added (\d+) chunks", response.text)
+            chunks: int = int(match.group(1)) if match else 0
+            labels = {"format": file_format, "chars": size}
+            results.add("ingest_seconds", elapsed, "s", True, **labels)
+            results.add("ingest_chars_per_second", size / elapsed, "chars/s", False, **labels)
+            results.add("ingest_chunks_per_second", chunks / elapsed, "chunks/s", False, **labels)
+
+
+def bench_chat(client: Any, results: Results, levels: List[int], requests_per_level: int) -> None:
+    print("chat")
+    messages: List[str] = ["What is the policy number for team 19?", "Show my schedule", "Hello there"]
+
+    def one_request(index: int) -> float:
+        started: float = time.perf_counter()
+        response = client.post("/chat", json={"user_id": f"bench-{index % 16}", "message": messages[index % len(messages)]})
+        response.raise_for_status()
+        return (time.perf_counter() - started) * 1000
+
+    for level in levels:
+        started: float = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=level) as pool:
+            latencies: List[float] = list(pool.map(one_request, range(requests_per_level)))
+        elapsed: float = time.perf_counter() - started
+        results.add("chat_p50_ms", statistics.median(latencies), "ms", True, concurrency=level)
+        results.add("chat_p99_ms", percentile(latencies, 0.99), "ms", True, concurrency=level)
+        results.add("chat_requests_per_second", requests_per_level / elapsed, "req/s", False, concurrency=level)
+
+
+def bench_retrieval(results: Results, corpus_sizes: List[int], queries: int) -> None:
+    print("retrieval")
+    from models import sql_models
+    from services import AddRecords
+    from utils import SqlData, TextProcessor
+
+    ingestor = AddRecords()
+    processor = TextProcessor()
+    retriever = SqlData()
+    stored: int = retriever.db.query(sql_models.DataChunks).count()
+    for target in corpus_sizes:
+        seed: int = 10_000 + target
+        while stored < target:
+            batch: int = min(5_000, target - stored)
+            text: str = " ".join(make_sentences(batch * 60, seed=seed + stored))
+            spans = processor.chunk_spans(text, "char", chunk_size=100, overlap=50)[:batch]
+            ingestor.ingest_data(document_name=f"corpus_{seed}_{stored}", text_chunks=spans)
+            stored += len(spans)
+
+        def timed(call: Callable[[], Any]) -> List[float]:
+            samples: List[float] = []
+            for index in range(queries):
+                started: float = time.perf_counter()
+                call()
+                samples.append((time.perf_counter() - started) * 1000)
+            return samples
+
+        for neighbours in (0, 1):
+            samples = timed(lambda: retriever.all_context(query="policy number team onboarding", neighbours=neighbours))
+            labels = {"chunks": stored, "neighbours": neighbours}
+            results.add("retrieval_p50_ms", statistics.median(samples), "ms", True, **labels)
+            results.add("retrieval_p99_ms", percentile(samples, 0.99), "ms", True, **labels)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=os.path.join(REPO_DIR, "bench_results.json"))
+    parser.add_argument("--quick", action="store_true", help="small sizes for a fast smoke run")
+    parser.add_argument("--gemini-latency-ms", type=float, default=50.0)
+    parser.add_argument("--vector-backend", choices=["standin", "embedded"], default="standin")
+    parser.add_argument("--retrieval-mode", choices=["hybrid", "lexical", "fusion"], default="hybrid")
+    args = parser.parse_args()
+    output: str = os.path.abspath(args.output)
+
+    sizes: List[int] = [10_000, 100_000] if args.quick else [10_000, 100_000, 1_000_000]
+    levels: List[int] = [1, 4] if args.quick else [1, 4, 16, 32]
+    corpus_sizes: List[int] = [1_000, 5_000] if args.quick else [1_000, 10_000, 50_000]
+
+    import httpx
+
+    base_url: str = start_api(args.gemini_latency_ms, args.vector_backend, args.retrieval_mode)
+    results = Results()
+    # Retrieval runs first so the corpus sizes it reports are exact.
+    bench_retrieval(results, corpus_sizes, queries=20 if args.quick else 100)
+    with httpx.Client(base_url=base_url, timeout=120) as client:
+        bench_ingestion(client, results, sizes)
+        bench_chat(client, results, levels, requests_per_level=32 if args.quick else 128)
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "gemini_latency_ms": args.gemini_latency_ms,
+            "vector_backend": args.vector_backend,
+            "retrieval_mode": args.retrieval_mode,
+        },
+        "results": results.entries,
+    }
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""In-process stand-ins for the external services used by the benchmarks.
+
+`InMemoryWeaviateClient` implements the subset of the Weaviate v4 client the
+application uses (collection creation, tenants, fixed-size batches, deletion
+by id, hybrid and near_text queries) with a BM25 keyword index, so ingestion and retrieval
+run without a Weaviate or CLIP container. Its latencies reflect the application's own overhead, not
+Weaviate's.
+"""
+
+import math
+import re
+import threading
+import uuid as uuid_lib
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens of text."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class InMemoryCollection:
+    """A collection holding objects and a BM25 index over their text properties."""
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self._objects: Dict[uuid_lib.UUID, Dict[str, Any]] = {}
+        self._postings: Dict[str, Dict[uuid_lib.UUID, int]] = defaultdict(dict)
+        self._lengths: Dict[uuid_lib.UUID, int] = {}
+        self._total_length: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self.batch: "_BatchManager" = _BatchManager(self)
+        self.query: "_Query" = _Query(self)
+        self.data: "_Data" = _Data(self)
+        self.tenants: "_Tenants" = _Tenants()
+
+    def with_tenant(self, tenant: Any) -> "InMemoryCollection":
+        """Return the tenant's shard, creating or reactivating it like auto tenant creation/activation."""
+        return self.tenants.shard(self.name, getattr(tenant, "name", tenant))
+
+    def insert(self, properties: Dict[str, Any], uuid: Optional[uuid_lib.UUID] = None) -> uuid_lib.UUID:
+        """Store an object and index its string properties."""
+        object_id: uuid_lib.UUID = uuid or uuid_lib.uuid4()
+        tokens: List[str] = [
+            token for value in properties.values() if isinstance(value, str) for token in tokenize(value)
+        ]
+        with self._lock:
+            self._objects[object_id] = dict(properties)
+            for token, count in Counter(tokens).items():
+                self._postings[token][object_id] = count
+            self._lengths[object_id] = len(tokens)
+            self._total_length += len(tokens)
+        return object_id
+
+    def delete(self, object_ids: List[uuid_lib.UUID]) -> int:
+        """Remove objects from the store and the index; return how many existed."""
+        removed: int = 0
+        with self._lock:
+            for object_id in object_ids:
+                if self._objects.pop(object_id, None) is None:
+                    continue
+                for postings in self._postings.values():
+                    postings.pop(object_id, None)
+                self._total_length -= self._lengths.pop(object_id)
+                removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def search(self, query: str, limit: int) -> List[SimpleNamespace]:
+        """Return the best BM25 matches for query."""
+        with self._lock:
+            documents: int = len(self._objects)
+            if not documents:
+                return []
+            average_length: float = self._total_length / documents
+            scores: Dict[uuid_lib.UUID, float] = defaultdict(float)
+            for token in set(tokenize(query)):
+                postings: Dict[uuid_lib.UUID, int] = self._postings.get(token, {})
+                if not postings:
+                    continue
+                idf: float = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+                for object_id, frequency in postings.items():
+                    length_norm: float = 1.2 * (0.25 + 0.75 * self._lengths[object_id] / average_length)
+                    scores[object_id] += idf * frequency * 2.2 / (frequency + length_norm)
+            best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            return [
+                SimpleNamespace(uuid=object_id, properties=self._objects[object_id], metadata=SimpleNamespace(score=score))
+                for object_id, score in best
+            ]
+
+
+class _Batch:
+    """Collects objects for one fixed-size batch context."""
+
+    def __init__(self, collection: InMemoryCollection) -> None:
+        self._collection: InMemoryCollection = collection
+
+    def add_object(self, properties: Dict[str, Any], uuid: Optional[uuid_lib.UUID] = None, **_: Any) -> uuid_lib.UUID:
+        return self._collection.insert(properties, uuid)
+
+
+class _BatchManager:
+    """Mirrors `collection.batch` of the Weaviate client."""
+
+    def __init__(self, collection: InMemoryCollection) -> None:
+        self._collection: InMemoryCollection = collection
+        self.failed_objects: List[Any] = []
+
+    @contextmanager
+    def fixed_size(self, batch_size: int = 100, **_: Any) -> Iterator[_Batch]:
+        yield _Batch(self._collection)
+
+    @contextmanager
+    def dynamic(self) -> Iterator[_Batch]:
+        yield _Batch(self._collection)
+
+
+class _Query:
+    """Mirrors `collection.query` of the Weaviate client."""
+
+    def __init__(self, collection: InMemoryCollection) -> None:
+        self._collection: InMemoryCollection = collection
+
+    def hybrid(self, query: str, limit: int = 10, **_: Any) -> SimpleNamespace:
+        return SimpleNamespace(objects=self._collection.search(query, limit))
+
+    def bm25(self, query: str, limit: int = 10, **_: Any) -> SimpleNamespace:
+        return SimpleNamespace(objects=self._collection.search(query, limit))
+
+    def near_text(self, query: str, limit: int = 10, **_: Any) -> SimpleNamespace:
+        return SimpleNamespace(objects=self._collection.search(query, limit))
+
+
+class _Data:
+    """Mirrors `collection.data` of the Weaviate client."""
+
+    def __init__(self, collection: InMemoryCollection) -> None:
+        self._collection: InMemoryCollection = collection
+
+    def delete_many(self, where: Any, **_: Any) -> SimpleNamespace:
+        """Delete the objects matched by a `Filter.by_id().contains_any(...)` filter."""
+        object_ids: List[uuid_lib.UUID] = [uuid_lib.UUID(str(value)) for value in where.value]
+        removed: int = self._collection.delete(object_ids)
+        return SimpleNamespace(matches=removed, successful=removed, failed=0)
+
+
+class _Tenants:
+    """Mirrors `collection.tenants`; each tenant is a separate in-memory shard.
+
+    Unlike Weaviate, reading a tenant that does not exist yet returns an empty shard.
+    """
+
+    def __init__(self) -> None:
+        self._shards: Dict[str, InMemoryCollection] = {}
+        self._status: Dict[str, str] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def shard(self, collection_name: str, tenant: str) -> InMemoryCollection:
+        with self._lock:
+            self._status[tenant] = "ACTIVE"
+            return self._shards.setdefault(tenant, InMemoryCollection(f"{collection_name}/{tenant}"))
+
+    def exists(self, tenant: Any) -> bool:
+        return getattr(tenant, "name", tenant) in self._shards
+
+    def get(self) -> Dict[str, SimpleNamespace]:
+        return {name: SimpleNamespace(name=name, activity_status=status) for name, status in self._status.items()}
+
+    def activate(self, tenant: Any) -> None:
+        self._status[getattr(tenant, "name", tenant)] = "ACTIVE"
+
+    def deactivate(self, tenant: Any) -> None:
+        self._status[getattr(tenant, "name", tenant)] = "INACTIVE"
+
+    def offload(self, tenant: Any) -> None:
+        self._status[getattr(tenant, "name", tenant)] = "OFFLOADED"
+
+
+class _Collections:
+    """Mirrors `client.collections` of the Weaviate client."""
+
+    def __init__(self) -> None:
+        self._collections: Dict[str, InMemoryCollection] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def exists(self, name: str) -> bool:
+        return name in self._collections
+
+    def create(self, name: str, **_: Any) -> InMemoryCollection:
+        with self._lock:
+            return self._collections.setdefault(name, InMemoryCollection(name))
+
+    def get(self, name: str) -> InMemoryCollection:
+        return self.create(name)
+
+    def delete(self, name: str) -> None:
+        with self._lock:
+            self._collections.pop(name, None)
+
+
+class InMemoryWeaviateClient:
+    """A stand-in for `weaviate.WeaviateClient` that keeps everything in process memory."""
+
+    def __init__(self) -> None:
+        self.collections: _Collections = _Collections()
+
+    def is_ready(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,71 @@
+"""Bulk-ingest a directory of documents from the command line.
+
+Usage (from the src directory):
+    python ingest_cli.py /path/to/library --strategy sentence --workers 8 --tenant acme
+"""
+
+import argparse
+import json
+import os
+import re
+from typing import Iterator, Tuple
+
+from models import DEFAULT_TENANT, TENANT_ID_PATTERN
+from services import AddRecords, BulkIngestor
+from type_definitions import BulkIngestReport
+from utils.extraction import SUPPORTED_EXTENSIONS
+
+
+def walk_documents(root: str) -> Iterator[Tuple[str, bytes]]:
+    """Yield (relative path, content) for every file under root, reading lazily.
+
+    Files of unsupported types are not read; they are yielded with empty
+    content so the ingestor reports them as skipped.
+
+    Args:
+        root: The directory to walk.
+
+    Yields:
+        The file path relative to root and its content as bytes.
+    """
+    for directory, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            path: str = os.path.join(directory, filename)
+            if os.path.splitext(filename)[1].lower() not in SUPPORTED_EXTENSIONS:
+                yield os.path.relpath(path, root), b""
+                continue
+            with open(path, "rb") as handle:
+                yield os.path.relpath(path, root), handle.read()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-ingest a directory of .pdf, .txt and .docx documents.")
+    parser.add_argument("directory", help="Directory to walk recursively.")
+    parser.add_argument("--strategy", choices=["char", "sentence"], default="char", help="Chunking strategy.")
+    parser.add_argument("--chunk-size", type=int, default=100, help="Maximum chunk size for the char strategy.")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count).")
+    parser.add_argument("--batch-chunks", type=int, default=5000, help="Chunks per shared storage batch.")
+    parser.add_argument("--tenant", default=DEFAULT_TENANT, help="Tenant that owns the documents.")
+    args = parser.parse_args()
+    if not re.match(TENANT_ID_PATTERN, args.tenant):
+        parser.error("--tenant may only contain letters, digits, '-' and '_' (at most 64 characters).")
+
+    ingestor: BulkIngestor = BulkIngestor(
+        records=AddRecords(), max_workers=args.workers, batch_chunks=args.batch_chunks
+    )
+    try:
+        report: BulkIngestReport = ingestor.ingest_files(
+            walk_documents(args.directory), strategy=args.strategy, chunk_size=args.chunk_size,
+            tenant_id=args.tenant
+        )
+    finally:
+        ingestor.close()
+
+    for item in report["files"]:
+        detail: str = f" ({item['error']})" if item["error"] else ""
+        print(f"{item['status']:8} {item['chunks']:>7} chunks  {item['filename']}{detail}")
+    print(json.dumps({key: value for key, value in report.items() if key != "files"}))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,16 @@ from typing import Dict, Any
 from fastapi import FastAPI
 import uvicorn
 
-from routes import ingest_document, chat
+from routes import ingest_document, chat, metrics, tenants, admin
+from utils.tracing import TraceMiddleware
 
 app: FastAPI = FastAPI()
+app.add_middleware(TraceMiddleware)
 app.include_router(ingest_document.router)
 app.include_router(chat.router)
+app.include_router(metrics.router)
+app.include_router(tenants.router)
+app.include_router(admin.router)
 
 
 @app.get("/", tags=["health-check"], summary="Health check endpoint")
@@ -1,4 +1,11 @@
-from .sql_database import engine, SessionLocal
+from .sql_database import engine, SessionLocal, WriteSessionLocal
+from .tenancy import DEFAULT_TENANT, TENANT_ID_PATTERN
 from . import sql_models
-from .weaviate_model import WeaviateManager
-from .chat_model import ChatModel
\ No newline at end of file
+from .weaviate_model import (
+    WeaviateManager,
+    get_weaviate_client,
+    set_weaviate_client,
+    vector_index_config,
+    VECTOR_INDEX_PRESETS,
+)
+from .chat_model import ChatModel
@@ -1,8 +1,15 @@
 from typing import Annotated
 from pydantic import BaseModel, Field
 
+from .tenancy import DEFAULT_TENANT, TENANT_ID_PATTERN
+
 class ChatModel(BaseModel):
     """Model for chat message requests."""
     
     user_id: Annotated[str, Field(min_length=1, description="Unique identifier for the user")]
-    message: Annotated[str, Field(min_length=1, description="The chat message content")]
\ No newline at end of file
+    message: Annotated[str, Field(min_length=1, description="The chat message content")]
+    tenant_id: Annotated[str, Field(
+        default=DEFAULT_TENANT,
+        pattern=TENANT_ID_PATTERN,
+        description="Tenant whose documents are searched; defaults to the shared tenant",
+    )]
@@ -1,20 +1,51 @@
+import os
 from typing import Type
 
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import create_engine, event, Engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import declarative_base, DeclarativeMeta
 
-SQLALCHEMY_DATABASE_URL: str = "sqlite:///./metadata.db"
+SQLALCHEMY_DATABASE_URL: str = os.getenv("METADATA_DB_URL", "sqlite:///./metadata.db")
 
 engine: Engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False, "timeout": 30}
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record) -> None:
+        """Enable WAL and hand transaction control to SQLAlchemy's begin event."""
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _begin_sqlite(connection) -> None:
+        """Start a write-locked transaction when the `write_lock` option is set.
+
+        Other transactions start with a deferred BEGIN. In WAL mode a read
+        keeps its snapshot until the transaction ends, so long-lived sessions
+        must commit, roll back or close once a read is done.
+        """
+        if connection.get_execution_options().get("write_lock"):
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+        else:
+            connection.exec_driver_sql("BEGIN")
+
 SessionLocal: Type[Session] = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine
 )
 
+# Sessions that take SQLite's write lock when their transaction begins, so a
+# read-then-write sequence (such as a booking conflict check) is serialised.
+WriteSessionLocal: Type[Session] = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=engine.execution_options(write_lock=True)
+)
+
 Base: DeclarativeMeta = declarative_base()
\ No newline at end of file
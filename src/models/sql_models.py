@@ -1,33 +1,91 @@
+import datetime
 from typing import Optional
 
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Date, Time, DateTime, Index, LargeBinary
 from .sql_database import Base
+from .tenancy import DEFAULT_TENANT
 
 class DataChunks(Base):
-    """SQLAlchemy model for storing text chunks and their metadata."""
+    """SQLAlchemy model for storing text chunks and their metadata.
+
+    A chunk's text is normally read from its source text (sourceTextId,
+    startOffset, endOffset); textChunk is only set for chunks that are not an
+    exact slice of the source.
+    """
     
     __tablename__ = "TextChunk"
+    __table_args__ = (
+        Index("ix_TextChunk_tenant_chunk", "tenantId", "chunkID"),
+        Index("ix_TextChunk_tenant_source_position", "tenantId", "sourceId", "chunkIndex"),
+    )
 
-    id: int = Column(Integer, primary_key=True, index=True)
+    id: int = Column(Integer, primary_key=True)
+    tenantId: str = Column(String(64), nullable=False, default=DEFAULT_TENANT)
     sourceId: str = Column(String(100), nullable=False)
     chunkID: str = Column(String, nullable=False)
-    textChunk: str = Column(String, nullable=False)
+    textChunk: Optional[str] = Column(String, nullable=True)
+    sourceTextId: Optional[int] = Column(Integer, nullable=True)
+    chunkIndex: Optional[int] = Column(Integer, nullable=True)
+    startOffset: Optional[int] = Column(Integer, nullable=True)
+    endOffset: Optional[int] = Column(Integer, nullable=True)
 
     def __repr__(self) -> str:
         """String representation of the DataChunks instance."""
-        return f"textChunk={self.textChunk}, source_id='{self.sourceId}', chunk_id={self.chunkID}"
+        return (
+            f"textChunk={self.textChunk}, tenant_id='{self.tenantId}', "
+            f"source_id='{self.sourceId}', chunk_id={self.chunkID}"
+        )
+
+
+class DataSourceText(Base):
+    """SQLAlchemy model for the text of an ingested document, stored once and split into compressed blocks."""
+
+    __tablename__ = "SourceText"
+    __table_args__ = (
+        Index("ix_SourceText_tenant_hash", "tenantId", "contentHash"),
+    )
+
+    id: int = Column(Integer, primary_key=True)
+    tenantId: str = Column(String(64), nullable=False, default=DEFAULT_TENANT)
+    sourceId: str = Column(String(100), nullable=False)
+    contentHash: str = Column(String(64), nullable=False)
+    charCount: int = Column(Integer, nullable=False)
+    blockChars: int = Column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        """String representation of the DataSourceText instance."""
+        return f"source_id='{self.sourceId}', tenant_id='{self.tenantId}', chars={self.charCount}"
+
+
+class DataTextBlock(Base):
+    """SQLAlchemy model for one compressed block of a source text."""
+
+    __tablename__ = "TextBlock"
+
+    sourceTextId: int = Column(Integer, primary_key=True)
+    blockIndex: int = Column(Integer, primary_key=True)
+    codec: str = Column(String(8), nullable=False)
+    data: bytes = Column(LargeBinary, nullable=False)
+
+    def __repr__(self) -> str:
+        """String representation of the DataTextBlock instance."""
+        return f"source_text_id={self.sourceTextId}, block={self.blockIndex}, codec='{self.codec}', bytes={len(self.data)}"
 
 
 class DataInterview(Base):
     """SQLAlchemy model for storing interview scheduling information."""
     
     __tablename__ = "Meetings"
+    __table_args__ = (
+        Index("ix_Meetings_schedule", "interview_date", "interview_time"),
+    )
 
     id: int = Column(Integer, primary_key=True, index=True)
-    candidate_name: str = Column(String(100), nullable=False)
-    candidate_email: str = Column(String, nullable=False)
-    interview_date: str = Column(String, nullable=False)
-    interview_time: str = Column(String, nullable=False)
+    candidate_name: str = Column(String(100, collation="NOCASE"), nullable=False, index=True)
+    candidate_email: str = Column(String(collation="NOCASE"), nullable=False, index=True)
+    interview_date: datetime.date = Column(Date, nullable=False)
+    interview_time: datetime.time = Column(Time, nullable=False)
+    starts_at: datetime.datetime = Column(DateTime, nullable=False, index=True)
 
     def __repr__(self) -> str:
         """String representation of the DataInterview instance."""
@@ -0,0 +1,5 @@
+# Tenant used when a request does not name one, so single-tenant deployments need no changes.
+DEFAULT_TENANT: str = "default"
+
+# Weaviate tenant names: letters, digits, '-' and '_', at most 64 characters.
+TENANT_ID_PATTERN: str = r"^[A-Za-z0-9_-]{1,64}$"
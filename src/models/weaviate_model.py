@@ -1,32 +1,164 @@
-from typing import Optional
+import os
+import threading
+from typing import Optional, Tuple
 
 import weaviate
 from weaviate.collections.classes.config import Property, DataType, Configure
+from weaviate.collections.classes.config_base import _QuantizerConfigCreate
+from weaviate.collections.classes.config_vector_index import _VectorIndexConfigCreate
 from weaviate.client import WeaviateClient
 
+_shared_client: Optional[WeaviateClient] = None
+_client_lock: threading.Lock = threading.Lock()
+
+# Index layouts accepted by vector_index_config (WEAVIATE_INDEX_PRESET):
+#   hnsw       - HNSW with uncompressed vectors (Weaviate's default)
+#   hnsw_pq    - HNSW with product quantization, trained after pq_training_limit objects
+#   hnsw_bq    - HNSW with binary quantization, rescoring candidates with full vectors
+#   flat_bq    - brute-force search over binary-quantized vectors, no graph to keep in memory
+#   dynamic    - flat_bq per shard until dynamic_threshold objects, then hnsw_pq
+# PQ training and the dynamic index need ASYNC_INDEXING enabled on the server.
+VECTOR_INDEX_PRESETS: Tuple[str, ...] = ("hnsw", "hnsw_pq", "hnsw_bq", "flat_bq", "dynamic")
+
+
+def _env_int(name: str) -> Optional[int]:
+    """Read an optional integer environment variable."""
+    value: Optional[str] = os.getenv(name)
+    return int(value) if value else None
+
+
+def vector_index_config(
+    preset: str = "hnsw",
+    ef: Optional[int] = None,
+    ef_construction: Optional[int] = None,
+    max_connections: Optional[int] = None,
+    pq_training_limit: Optional[int] = None,
+    dynamic_threshold: Optional[int] = None,
+) -> _VectorIndexConfigCreate:
+    """Build the vector index configuration for one of VECTOR_INDEX_PRESETS.
+
+    HNSW parameters left as None use Weaviate's defaults (ef=-1 for dynamic
+    ef, efConstruction=128, maxConnections=32).
+
+    Args:
+        preset: The index layout.
+        ef: HNSW query-time candidate list size; higher improves recall and costs latency.
+        ef_construction: HNSW build-time candidate list size; higher improves recall and slows imports.
+        max_connections: HNSW edges per node; higher improves recall and costs memory.
+        pq_training_limit: Objects per shard used to train product quantization.
+        dynamic_threshold: Objects per shard at which the dynamic index switches to HNSW.
+
+    Returns:
+        The index configuration to pass as vector_index_config.
+
+    Raises:
+        ValueError: If the preset is unknown.
+    """
+    def hnsw(quantizer: Optional[_QuantizerConfigCreate] = None) -> _VectorIndexConfigCreate:
+        return Configure.VectorIndex.hnsw(
+            ef=ef,
+            ef_construction=ef_construction,
+            max_connections=max_connections,
+            quantizer=quantizer,
+        )
+
+    if preset == "hnsw":
+        return hnsw()
+    elif preset == "hnsw_pq":
+        return hnsw(Configure.VectorIndex.Quantizer.pq(training_limit=pq_training_limit))
+    elif preset == "hnsw_bq":
+        return hnsw(Configure.VectorIndex.Quantizer.bq())
+    elif preset == "flat_bq":
+        return Configure.VectorIndex.flat(quantizer=Configure.VectorIndex.Quantizer.bq(cache=True))
+    elif preset == "dynamic":
+        return Configure.VectorIndex.dynamic(
+            threshold=dynamic_threshold,
+            hnsw=hnsw(Configure.VectorIndex.Quantizer.pq(training_limit=pq_training_limit)),
+            flat=Configure.VectorIndex.flat(quantizer=Configure.VectorIndex.Quantizer.bq(cache=True)),
+        )
+    raise ValueError(f"Unknown vector index preset '{preset}'. Use one of: {', '.join(VECTOR_INDEX_PRESETS)}.")
+
+
+def vector_index_config_from_env() -> _VectorIndexConfigCreate:
+    """Build the vector index configuration from the WEAVIATE_INDEX_* and WEAVIATE_HNSW_* variables.
+
+    Returns:
+        The index configuration for new collections.
+    """
+    return vector_index_config(
+        preset=os.getenv("WEAVIATE_INDEX_PRESET", "hnsw"),
+        ef=_env_int("WEAVIATE_HNSW_EF"),
+        ef_construction=_env_int("WEAVIATE_HNSW_EF_CONSTRUCTION"),
+        max_connections=_env_int("WEAVIATE_HNSW_MAX_CONNECTIONS"),
+        pq_training_limit=_env_int("WEAVIATE_PQ_TRAINING_LIMIT"),
+        dynamic_threshold=_env_int("WEAVIATE_DYNAMIC_THRESHOLD"),
+    )
+
+
+def get_weaviate_client() -> WeaviateClient:
+    """Return the process-wide Weaviate client, connecting on first use.
+
+    The instance is read from the WEAVIATE_HOST and WEAVIATE_PORT environment
+    variables (default localhost:8080).
+
+    Returns:
+        The shared WeaviateClient.
+    """
+    global _shared_client
+    with _client_lock:
+        if _shared_client is None:
+            _shared_client = weaviate.connect_to_local(
+                host=os.getenv("WEAVIATE_HOST", "localhost"),
+                port=int(os.getenv("WEAVIATE_PORT", "8080")),
+            )
+        return _shared_client
+
+
+def set_weaviate_client(client: WeaviateClient) -> None:
+    """Use the given client for all Weaviate access, e.g. a local stand-in for benchmarks.
+
+    Args:
+        client: An already-connected client.
+    """
+    global _shared_client
+    with _client_lock:
+        _shared_client = client
+
 
 class WeaviateManager:
     """Manages Weaviate collection creation and connection."""
     
-    def __init__(self, host: str = "localhost", port: int = 8080) -> None:
+    def __init__(self, client: Optional[WeaviateClient] = None) -> None:
         """Initialize the Weaviate client.
 
         Args:
-            host: The host address of the Weaviate instance.
-            port: The port of the Weaviate instance.
+            client: The client to use; defaults to the shared client.
         """
-        self.client: WeaviateClient = weaviate.connect_to_local(host=host, port=port)
+        self.client: WeaviateClient = client or get_weaviate_client()
         self.collection: Optional[object] = None
 
-    def create_collection(self, collection_name: str) -> None:
+    def create_collection(
+        self, collection_name: str, index_config: Optional[_VectorIndexConfigCreate] = None
+    ) -> Optional[str]:
         """Create a new collection in Weaviate if it doesn't already exist.
 
+        The vector index settings of an existing collection are not changed.
+
         Args:
             collection_name: The name of the collection to create.
+            index_config: The vector index configuration; defaults to vector_index_config_from_env().
+
+        Returns:
+            None if the collection exists or was created, otherwise the error message.
+
+        Raises:
+            ValueError: If WEAVIATE_INDEX_PRESET names an unknown preset.
         """
         if self.client.collections.exists(collection_name):
             pass
         else:
+            # Built outside the try block, so a misconfigured preset is raised rather than reported.
+            vector_index = index_config or vector_index_config_from_env()
             try:
                 self.collection = self.client.collections.create(
                         name=collection_name,
@@ -38,7 +170,14 @@ class WeaviateManager:
                         ],
                         vector_config=Configure.Vectors.multi2vec_clip(
                             text_fields=["text_content"],
-                            image_fields=None
+                            image_fields=None,
+                            vector_index_config=vector_index
+                        ),
+                        # One shard per tenant, created and reactivated on first use.
+                        multi_tenancy_config=Configure.multi_tenancy(
+                            enabled=True,
+                            auto_tenant_creation=True,
+                            auto_tenant_activation=True,
                         )
                     )
                 
@@ -0,0 +1,78 @@
+import os
+import datetime
+import secrets
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+
+from type_definitions import ProfileResult, RequestTraceRecord
+from utils.profiler import PROFILE_MAX_SECONDS, profiler
+from utils.tracing import REQUEST_TRACING, SLOW_REQUEST_LOG_SIZE, slow_requests
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None, description="The ADMIN_TOKEN of the server.")) -> None:
+    """Allow the request only if it carries the admin token.
+
+    Raises:
+        HTTPException: 404 if ADMIN_TOKEN is not set, 401 if the token is missing or wrong.
+    """
+    admin_token: str = os.getenv("ADMIN_TOKEN", "")
+    if not admin_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token.encode(), admin_token.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin token.")
+
+
+router: APIRouter = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)], include_in_schema=False)
+
+
+@router.get(
+    "/slow-requests",
+    summary="Slowest traced requests",
+    description="""The slowest requests since startup with their stage spans,
+    slowest first. Requests are traced only when REQUEST_TRACING is on.
+    """,
+)
+def get_slow_requests(
+    limit: int = Query(SLOW_REQUEST_LOG_SIZE, ge=1, le=max(SLOW_REQUEST_LOG_SIZE, 1)),
+) -> List[RequestTraceRecord]:
+    """Return the slow request log."""
+    if not REQUEST_TRACING:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Request tracing is off. Set REQUEST_TRACING=on to record slow requests."
+        )
+    return slow_requests.slowest(limit)
+
+
+@router.post(
+    "/profile",
+    summary="Sample the worker's stacks",
+    description="""Samples the stack of every thread of this worker process for the
+    given time, then returns the collapsed stacks (flamegraph.pl, speedscope) as a
+    download. One profile runs at a time.
+    """,
+)
+async def run_profile(
+    seconds: float = Query(10.0, gt=0, le=PROFILE_MAX_SECONDS, description="How long to sample."),
+    interval_ms: float = Query(5.0, ge=1, le=1000, description="Milliseconds between samples."),
+) -> Response:
+    """Run a sampling profile in a worker thread and return it as a file."""
+    try:
+        result: ProfileResult = await run_in_threadpool(
+            profiler.profile, seconds=seconds, interval=interval_ms / 1000
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    filename: str = f"profile-{datetime.datetime.now(datetime.timezone.utc):%Y%m%dT%H%M%SZ}.collapsed"
+    return Response(
+        content=result["collapsed"],
+        media_type="text/plain",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Profile-Samples": str(result["samples"]),
+            "X-Profile-Seconds": str(result["seconds"]),
+        },
+    )
@@ -2,11 +2,13 @@ from typing import List, Dict, Any, Generator
 import json
 
 from redis import Redis
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Query, status, Depends
+from fastapi.concurrency import run_in_threadpool
 
-from models import ChatModel
+from models import ChatModel, DEFAULT_TENANT, TENANT_ID_PATTERN
 from services import ChatRag
 from type_definitions import ChatResponse, ChatHistoryResponse, ChatHistoryEntry
+from utils.metrics import track_stage
 
 router: APIRouter = APIRouter()
 gemini_client: ChatRag = ChatRag()
@@ -26,6 +28,15 @@ def get_redis_client() -> Generator[Redis, None, None]:
         redis_client.close()
 
 
+def history_key(user_id: str, tenant_id: str) -> str:
+    """Return the Redis key of a user's conversation within a tenant.
+
+    The key includes the tenant so a user id used in two tenants never
+    replays one tenant's retrieved context into the other's conversation.
+    """
+    return f"chat_history:{tenant_id}:{user_id}"
+
+
 @router.post(
     "/chat",
     summary="Chat with the LLM",
@@ -48,23 +59,27 @@ async def chat_rag(
     user_id: str = chat_message.user_id
     user_message: str = chat_message.message
 
-    conversation_key: str = f"chat_history:{user_id}"
-    history_bytes = redis_client.get(conversation_key)
-    
-    history: List[ChatHistoryEntry]
-    if history_bytes:
-        try:
-            history_data = json.loads(history_bytes)
-            history = [ChatHistoryEntry(role=item["role"], parts=item["parts"]) for item in history_data]
-        except json.JSONDecodeError:
+    conversation_key: str = history_key(user_id, chat_message.tenant_id)
+    with track_stage("history_load"):
+        history_bytes = redis_client.get(conversation_key)
+        
+        history: List[ChatHistoryEntry]
+        if history_bytes:
+            try:
+                history_data = json.loads(history_bytes)
+                history = [ChatHistoryEntry(role=item["role"], parts=item["parts"]) for item in history_data]
+            except json.JSONDecodeError:
+                history = []
+        else:
             history = []
-    else:
-        history = []
     
-    machine_response: str = gemini_client.conversation(
-        user_input=user_message, 
-        chat_history=history
-    )
+    with track_stage("conversation"):
+        machine_response: str = await run_in_threadpool(
+            gemini_client.conversation,
+            user_input=user_message, 
+            chat_history=history,
+            tenant_id=chat_message.tenant_id
+        )
 
     new_user_entry = ChatHistoryEntry(role="user", parts=user_message)
     new_model_entry = ChatHistoryEntry(role="model", parts=machine_response)
@@ -72,7 +87,8 @@ async def chat_rag(
     history.append(new_user_entry)
     history.append(new_model_entry)
 
-    redis_client.set(conversation_key, json.dumps([dict(entry) for entry in history]))
+    with track_stage("history_save"):
+        redis_client.set(conversation_key, json.dumps([dict(entry) for entry in history]))
 
     return ChatResponse(user_id=user_id, response=machine_response)
 
@@ -80,17 +96,23 @@ async def chat_rag(
 @router.post(
     "/chat-history",
     summary="Get chat history",
-    description="Retrieve the full conversation history for a given user ID.",
+    description="Retrieve the full conversation history for a given user ID within a tenant.",
     status_code=status.HTTP_200_OK,
 )
 async def get_history(
-    user_id: str, 
+    user_id: str,
+    tenant_id: str = Query(
+        DEFAULT_TENANT,
+        pattern=TENANT_ID_PATTERN,
+        description="The tenant the conversation belongs to; defaults to the shared tenant.",
+    ),
     redis_client: Redis = Depends(get_redis_client)
 ) -> ChatHistoryResponse:
     """Retrieve and return the full conversation history for a given user ID.
     
     Args:
         user_id: The user's unique identifier.
+        tenant_id: The tenant the conversation belongs to.
         redis_client: Redis client for conversation history retrieval.
         
     Returns:
@@ -99,7 +121,7 @@ async def get_history(
     Raises:
         HTTPException: If no chat history is found for the user.
     """
-    conversation_key: str = f"chat_history:{user_id}"
+    conversation_key: str = history_key(user_id, tenant_id)
     history_bytes = redis_client.get(conversation_key)
 
     if not history_bytes:
@@ -1,19 +1,27 @@
-from typing import Literal, Optional, Dict, Any
+from typing import Literal, Optional, Dict, Any, List, Iterator, Tuple
 import os
-import io
+import zipfile
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, status, Query
-from pypdf import PdfReader
-from docx import Document
+from fastapi.concurrency import run_in_threadpool
 
 from utils import TextProcessor
+from utils.extraction import SUPPORTED_EXTENSIONS, extract_segments
+from models import DEFAULT_TENANT, TENANT_ID_PATTERN
 from services import AddRecords
+from services.bulk_ingest import BulkIngestor
+from utils.metrics import track_stage, INGEST_DOCUMENTS, INGEST_PAGES
+from type_definitions import ChunkSpan, DocumentSegments, BulkIngestReport
 
 router: APIRouter = APIRouter()
 
 data_ingestor: AddRecords = AddRecords()
+bulk_ingestor: BulkIngestor = BulkIngestor(records=data_ingestor)
 text_processor: TextProcessor = TextProcessor()
 
+# Upper bound on the total uncompressed size of an uploaded archive.
+MAX_ARCHIVE_BYTES: int = int(os.getenv("MAX_ARCHIVE_BYTES", str(2 * 1024 ** 3)))
+
 ChunkingStrategy = Literal["char", "sentence"]
 
 @router.post(
@@ -33,6 +41,11 @@ async def upload_and_process_document(
         description="""The strategy to use for text chunking.
         Accepted values are 'char' or 'sentence'.""",
     ),
+    tenant_id: str = Query(
+        DEFAULT_TENANT,
+        pattern=TENANT_ID_PATTERN,
+        description="The tenant that owns the documents; defaults to the shared tenant.",
+    ),
 ) -> Optional[str]:
     """Handle document upload, text extraction, and ingestion process."""
     if not file.filename:
@@ -43,7 +56,7 @@ async def upload_and_process_document(
     
     file_extension: str = os.path.splitext(file.filename)[1].lower()
 
-    if file_extension not in [".txt", ".pdf", ".docx"]:
+    if file_extension not in SUPPORTED_EXTENSIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unsupported file type: {file_extension}. Please upload a .pdf, .txt, or .docx file."
@@ -52,77 +65,120 @@ async def upload_and_process_document(
     try:
         content: bytes = await file.read()
         
-        text: str
-        if file_extension == ".txt":
-            text = _extract_text_from_txt(content)
-        elif file_extension == ".pdf":
-            text = _extract_text_from_pdf(content)
-        elif file_extension == ".docx":
-            text = _extract_text_from_docx(content)
-
-        chunks: list[str] = text_processor.chunk_text(
-            text=text,
-            strategy=chunking_strategy,
-            chunk_size=100
-        )
+        with track_stage("extract"):
+            document: DocumentSegments = extract_segments(file.filename, content)
+        INGEST_PAGES.inc(document["pages"])
+
+        # Segments are extracted lazily, so this stage also covers reading the text out.
+        with track_stage("chunking"):
+            chunks: list[ChunkSpan] = list(text_processor.chunk_stream(
+                segments=document["segments"],
+                strategy=chunking_strategy,
+                chunk_size=100
+            ))
         ingestion_response: Optional[str] = data_ingestor.ingest_data(
-            document_name=file.filename, text_chunks=chunks
+            document_name=file.filename, text_chunks=chunks, tenant_id=tenant_id
         )
+        succeeded: bool = ingestion_response is not None and not ingestion_response.startswith("Error")
+        INGEST_DOCUMENTS.labels("success" if succeeded else "failed").inc()
         return ingestion_response
 
+    except ValueError as e:
+        INGEST_DOCUMENTS.labels("failed").inc()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
+        INGEST_DOCUMENTS.labels("failed").inc()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An unexpected error occurred during file processing: {e}"
         )
 
 
-def _extract_text_from_txt(content: bytes) -> str:
-    """Extract text from a .txt file.
-    
-    Args:
-        content: The file content as bytes.
-        
-    Returns:
-        The decoded text content.
-        
-    Raises:
-        HTTPException: If the file cannot be decoded.
-    """
+@router.post(
+    "/upload-docs/bulk/",
+    summary="Upload and process several documents",
+    description="""Uploads any number of .pdf, .txt, or .docx files. Files are
+    extracted in parallel worker processes and stored in shared batches.
+    """,
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_documents_bulk(
+    files: List[UploadFile] = File(
+        ..., description="The documents to upload (PDF, TXT, or DOCX)."
+    ),
+    chunking_strategy: ChunkingStrategy = Query(
+        "char",
+        description="""The strategy to use for text chunking.
+        Accepted values are 'char' or 'sentence'.""",
+    ),
+    tenant_id: str = Query(
+        DEFAULT_TENANT,
+        pattern=TENANT_ID_PATTERN,
+        description="The tenant that owns the documents; defaults to the shared tenant.",
+    ),
+) -> BulkIngestReport:
+    """Handle a multi-file upload and report the status of every file."""
+    def read_uploads() -> Iterator[Tuple[str, bytes]]:
+        for upload in files:
+            yield upload.filename or "unnamed", upload.file.read()
+
+    return await run_in_threadpool(
+        bulk_ingestor.ingest_files, read_uploads(), strategy=chunking_strategy, chunk_size=100,
+        tenant_id=tenant_id
+    )
+
+
+@router.post(
+    "/upload-docs/archive/",
+    summary="Upload and process a zip archive of documents",
+    description="""Uploads a .zip archive; every .pdf, .txt, or .docx entry is
+    extracted in parallel worker processes and stored in shared batches.
+    """,
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_documents_archive(
+    file: UploadFile = File(
+        ..., description="A .zip archive of PDF, TXT, or DOCX documents."
+    ),
+    chunking_strategy: ChunkingStrategy = Query(
+        "char",
+        description="""The strategy to use for text chunking.
+        Accepted values are 'char' or 'sentence'.""",
+    ),
+    tenant_id: str = Query(
+        DEFAULT_TENANT,
+        pattern=TENANT_ID_PATTERN,
+        description="The tenant that owns the documents; defaults to the shared tenant.",
+    ),
+) -> BulkIngestReport:
+    """Handle an archive upload and report the status of every entry."""
     try:
-        return content.decode("utf-8")
-    except UnicodeDecodeError:
+        archive: zipfile.ZipFile = zipfile.ZipFile(file.file)
+    except zipfile.BadZipFile:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Could not decode .txt file. Ensure it is UTF-8 encoded."
+            detail="The uploaded file is not a valid .zip archive."
         )
 
-def _extract_text_from_pdf(content: bytes) -> str:
-    """Extract text from a .pdf file.
-    
-    Args:
-        content: The file content as bytes.
-        
-    Returns:
-        The extracted text content.
-    """
-    pdf_reader: PdfReader = PdfReader(io.BytesIO(content))
-    text: str = ""
-    for page in pdf_reader.pages:
-        text += page.extract_text() or ""
-    return text
-
-def _extract_text_from_docx(content: bytes) -> str:
-    """Extract text from a .docx file.
-    
-    Args:
-        content: The file content as bytes.
-        
-    Returns:
-        The extracted text content.
-    """
-    doc: Document = Document(io.BytesIO(content))
-    text: str = ""
-    for para in doc.paragraphs:
-        text += para.text + "\n"
-    return text
\ No newline at end of file
+    entries: List[zipfile.ZipInfo] = [info for info in archive.infolist() if not info.is_dir()]
+    if sum(info.file_size for info in entries) > MAX_ARCHIVE_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"The archive expands to more than {MAX_ARCHIVE_BYTES} bytes."
+        )
+
+    def read_entries() -> Iterator[Tuple[str, bytes]]:
+        with archive:
+            for info in entries:
+                if os.path.splitext(info.filename)[1].lower() in SUPPORTED_EXTENSIONS:
+                    yield info.filename, archive.read(info)
+                else:
+                    yield info.filename, b""
+
+    return await run_in_threadpool(
+        bulk_ingestor.ingest_files, read_entries(), strategy=chunking_strategy, chunk_size=100,
+        tenant_id=tenant_id
+    )
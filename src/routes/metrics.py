@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+router: APIRouter = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    summary="Prometheus metrics",
+    description="Latency histograms, ingestion counters and pool gauges in the Prometheus text format.",
+    include_in_schema=False,
+)
+def metrics() -> Response:
+    """Expose the process metrics for Prometheus to scrape."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,62 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.concurrency import run_in_threadpool
+
+from models import TENANT_ID_PATTERN
+from routes.admin import require_admin
+from utils import WeaviateCollection
+
+# Deactivating or reloading a tenant affects every caller of that tenant, so
+# these routes need the admin token.
+router: APIRouter = APIRouter(dependencies=[Depends(require_admin)])
+
+weaviate_collection: WeaviateCollection = WeaviateCollection()
+
+
+@router.post(
+    "/tenants/{tenant_id}/deactivate",
+    summary="Deactivate an idle tenant",
+    description="""Unloads a tenant's shard from Weaviate memory. With offload=true
+    the shard is moved to cloud storage (requires an offload module). A deactivated
+    tenant is reactivated automatically on its next ingestion or chat request; an
+    offloaded one must be loaded back with /tenants/{tenant_id}/activate first.
+    """,
+    status_code=status.HTTP_200_OK,
+)
+async def deactivate_tenant(
+    tenant_id: str = Path(..., pattern=TENANT_ID_PATTERN, description="The tenant to deactivate."),
+    offload: bool = Query(False, description="Move the shard to cloud storage instead of local disk."),
+) -> Optional[str]:
+    """Deactivate or offload a tenant's shard."""
+    response: str = await run_in_threadpool(
+        weaviate_collection.deactivate_tenant, tenant_id=tenant_id, offload=offload
+    )
+    if response.startswith("Error"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=response
+        )
+    return response
+
+
+@router.post(
+    "/tenants/{tenant_id}/activate",
+    summary="Activate a tenant",
+    description="""Loads a deactivated or offloaded tenant's shard back into Weaviate
+    memory. Onloading from cloud storage runs in the background; the tenant serves
+    requests again once it is active.
+    """,
+    status_code=status.HTTP_200_OK,
+)
+async def activate_tenant(
+    tenant_id: str = Path(..., pattern=TENANT_ID_PATTERN, description="The tenant to activate."),
+) -> Optional[str]:
+    """Activate or onload a tenant's shard."""
+    response: str = await run_in_threadpool(weaviate_collection.activate_tenant, tenant_id=tenant_id)
+    if response.startswith("Error"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=response
+        )
+    return response
@@ -1,2 +1,3 @@
 from .data_ingest import AddRecords
-from .chat_gemini import ChatRag
\ No newline at end of file
+from .chat_gemini import ChatRag
+from .bulk_ingest import BulkIngestor
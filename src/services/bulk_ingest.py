@@ -0,0 +1,155 @@
+import multiprocessing
+import os
+import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Iterable, List, Literal, Optional, Set, Tuple
+
+from models import DEFAULT_TENANT
+from utils.extraction import SUPPORTED_EXTENSIONS, extract_and_chunk
+from utils.metrics import INGEST_DOCUMENTS, INGEST_PAGES
+from type_definitions import BulkIngestReport, ChunkedDocument, ChunkSpan, FileIngestStatus
+from .data_ingest import AddRecords
+
+
+class BulkIngestor:
+    """Ingests many documents at once, extracting them in parallel worker processes.
+
+    Extraction and chunking are CPU bound and run in a process pool; the
+    resulting chunks are merged and written to Weaviate and SQLite in large
+    shared batches instead of one batch per document.
+    """
+
+    def __init__(
+        self,
+        records: AddRecords,
+        max_workers: Optional[int] = None,
+        batch_chunks: int = 5000,
+    ) -> None:
+        """Initialize the bulk ingestor.
+
+        Args:
+            records: The ingestion pipeline used to store merged batches.
+            max_workers: Number of extraction processes; defaults to the CPU count.
+            batch_chunks: Number of chunks collected before a shared batch is written.
+        """
+        self.records: AddRecords = records
+        self.max_workers: int = max_workers or os.cpu_count() or 1
+        self.batch_chunks: int = batch_chunks
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock: threading.Lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Return the worker pool, starting it on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                # Workers are spawned, not forked, because the API process is multi-threaded.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def ingest_files(
+        self,
+        files: Iterable[Tuple[str, bytes]],
+        strategy: Literal["char", "sentence"] = "char",
+        chunk_size: int = 100,
+        tenant_id: str = DEFAULT_TENANT,
+    ) -> BulkIngestReport:
+        """Extract, chunk and store a collection of documents.
+
+        Files are read lazily from the iterable and at most two per worker are
+        in flight, so a large directory or archive is never fully in memory.
+
+        Args:
+            files: (document name, file content) pairs.
+            strategy: The chunking strategy ("char" or "sentence").
+            chunk_size: The maximum size of a chunk for character-based strategy.
+            tenant_id: The tenant that owns the documents.
+
+        Returns:
+            The per-file status and aggregate throughput.
+        """
+        started: float = time.perf_counter()
+        statuses: List[FileIngestStatus] = []
+        pending_batch: List[ChunkedDocument] = []
+        in_flight: Set[Future] = set()
+        pool: ProcessPoolExecutor = self._get_pool()
+
+        def collect(done: Iterable[Future]) -> None:
+            for future in done:
+                document: ChunkedDocument = future.result()
+                if document["error"] is not None:
+                    statuses.append(FileIngestStatus(
+                        filename=document["filename"], status="failed", chunks=0, error=document["error"]
+                    ))
+                    continue
+                INGEST_PAGES.inc(document["pages"])
+                pending_batch.append(document)
+                if sum(len(item["spans"]) for item in pending_batch) >= self.batch_chunks:
+                    statuses.extend(self._store_batch(pending_batch, tenant_id))
+                    pending_batch.clear()
+
+        for filename, content in files:
+            if os.path.splitext(filename)[1].lower() not in SUPPORTED_EXTENSIONS:
+                statuses.append(FileIngestStatus(
+                    filename=filename, status="skipped", chunks=0, error="Unsupported file type."
+                ))
+                continue
+            if len(in_flight) >= 2 * self.max_workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(pool.submit(extract_and_chunk, filename, content, strategy, chunk_size))
+
+        collect(wait(in_flight).done)
+        if pending_batch:
+            statuses.extend(self._store_batch(pending_batch, tenant_id))
+
+        elapsed: float = time.perf_counter() - started
+        ingested: int = sum(1 for item in statuses if item["status"] == "ingested")
+        failed: int = sum(1 for item in statuses if item["status"] == "failed")
+        INGEST_DOCUMENTS.labels("success").inc(ingested)
+        INGEST_DOCUMENTS.labels("failed").inc(failed)
+
+        return BulkIngestReport(
+            files=statuses,
+            documents_ingested=ingested,
+            documents_failed=failed,
+            chunks=sum(item["chunks"] for item in statuses),
+            seconds=round(elapsed, 3),
+            documents_per_second=round(ingested / elapsed, 2) if elapsed > 0 else 0.0,
+        )
+
+    def _store_batch(self, documents: List[ChunkedDocument], tenant_id: str) -> List[FileIngestStatus]:
+        """Write the chunks of several documents in one shared batch.
+
+        Args:
+            documents: Successfully chunked documents.
+            tenant_id: The tenant that owns the documents.
+
+        Returns:
+            The status of each document in the batch.
+        """
+        batch: List[Tuple[str, List[ChunkSpan]]] = [(item["filename"], item["spans"]) for item in documents]
+        try:
+            response: Optional[str] = self.records.ingest_documents(batch, tenant_id)
+            error: Optional[str] = response if response and response.startswith("Error") else None
+        except Exception as e:
+            error = str(e)
+
+        return [
+            FileIngestStatus(
+                filename=item["filename"],
+                status="failed" if error else "ingested",
+                chunks=0 if error else len(item["spans"]),
+                error=error,
+            )
+            for item in documents
+        ]
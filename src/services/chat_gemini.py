@@ -1,23 +1,35 @@
-import os
-from typing import List, Dict, Any, Optional
+import time
+import inspect
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Set
 
-from dotenv import load_dotenv
 import google.generativeai as genai
 
+from models import DEFAULT_TENANT
 from utils.functions import GetFunctions
-from type_definitions import ChatHistoryEntry
+from utils.llm_gateway import LlmGateway, LlmGatewayError, get_gateway
+from utils.metrics import TOOL_LATENCY
+from utils.tracing import span
+from type_definitions import ChatHistoryEntry, ToolCallResult
+
+logger: logging.Logger = logging.getLogger(__name__)
 
 
 class ChatRag:
     """RAG-based chat service using Google Gemini with function calling capabilities."""
     
-    def __init__(self) -> None:
-        """Initialize the ChatRag service with tools and model configuration."""
-        self._all_tools: GetFunctions = GetFunctions()
-        load_dotenv()
+    def __init__(self, max_tool_rounds: int = 5) -> None:
+        """Initialize the ChatRag service with tools and model configuration.
 
-        self._gemini_key: Optional[str] = os.getenv('GEMINI_API_KEY')
-        genai.configure(api_key=self._gemini_key)
+        Args:
+            max_tool_rounds: Maximum number of model turns that may request tools
+                before a text answer is required.
+        """
+        self.max_tool_rounds: int = max_tool_rounds
+        self._all_tools: GetFunctions = GetFunctions()
+        self._gateway: LlmGateway = get_gateway()
 
         self._tools: genai.protos.Tool = genai.protos.Tool(
             function_declarations=[
@@ -28,10 +40,7 @@ class ChatRag:
             ]
         )
 
-        self._model: genai.GenerativeModel = genai.GenerativeModel(
-            model_name='gemini-2.5-flash',
-            tools=[self._tools]
-        )
+        self._model: genai.GenerativeModel = self._gateway.model(tools=[self._tools])
 
         self._function_map: Dict[str, Any] = {
             "book_interview": self._all_tools.book_interview,
@@ -39,13 +48,96 @@ class ChatRag:
             "get_current_time": self._all_tools.get_current_time,
             "retrieve_database_info": self._all_tools.retrieve_database_info,
         }
+        # Tools that take a tenant get it from the request; the model never sees the parameter.
+        self._tenant_scoped: Set[str] = {
+            name for name, func in self._function_map.items()
+            if "tenant_id" in inspect.signature(func).parameters
+        }
+
+    def _run_tool(self, function_name: str, arguments: Dict[str, Any], tenant_id: str) -> ToolCallResult:
+        """Execute a single tool call and time it.
+
+        Args:
+            function_name: The name of the tool requested by the model.
+            arguments: The arguments supplied by the model.
+            tenant_id: The tenant of the request, passed to tenant-scoped tools.
 
-    def conversation(self, user_input: str, chat_history: List[ChatHistoryEntry]) -> str:
+        Returns:
+            The tool result, or an error description the model can act on.
+        """
+        # Unknown names come from the model, so they are not used as label values.
+        tool_label: str = function_name if function_name in self._function_map else "unknown"
+        started: float = time.perf_counter()
+        outcome: str = "error"
+        with span(f"tool.{tool_label}"):
+            if function_name not in self._function_map:
+                result: Any = {"error": f"No tool is available to perform the action '{function_name}'."}
+            else:
+                if function_name in self._tenant_scoped:
+                    arguments = {**arguments, "tenant_id": tenant_id}
+                try:
+                    result = self._function_map[function_name](**arguments)
+                    outcome = "success"
+                except TypeError as e:
+                    logger.warning("Error calling function '%s': %s", function_name, e)
+                    result = {"error": "Missing or invalid arguments. Ask the user for all the details."}
+                except Exception:
+                    # A failing tool must not discard the results of the other tools of the turn.
+                    logger.exception("Function '%s' failed", function_name)
+                    result = {"error": f"The action '{function_name}' failed. Tell the user it could not be completed."}
+
+        elapsed: float = time.perf_counter() - started
+        elapsed_ms: float = elapsed * 1000
+        TOOL_LATENCY.labels(tool_label, outcome).observe(elapsed)
+        logger.info("Tool '%s' finished in %.1f ms", function_name, elapsed_ms)
+        return ToolCallResult(name=function_name, result=result, elapsed_ms=elapsed_ms)
+
+    def _run_tools(self, function_calls: List[Any], tenant_id: str) -> List[ToolCallResult]:
+        """Execute every function call of one model turn concurrently.
+
+        A single call runs on the request's thread. Several calls each get a
+        thread of a pool created for the turn, so tool calls of concurrent
+        requests never queue behind each other.
+
+        Args:
+            function_calls: The function_call parts emitted by the model.
+            tenant_id: The tenant of the request.
+
+        Returns:
+            The tool results, in the order the calls were made.
+        """
+        if len(function_calls) == 1:
+            call = function_calls[0]
+            return [self._run_tool(call.name, {k: v for k, v in call.args.items()}, tenant_id)]
+
+        with ThreadPoolExecutor(max_workers=len(function_calls), thread_name_prefix="chat-tool") as executor:
+            # Each call runs in its own copy of the request's context, so its spans join the request trace.
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._run_tool,
+                    call.name,
+                    {k: v for k, v in call.args.items()},
+                    tenant_id,
+                )
+                for call in function_calls
+            ]
+            return [future.result() for future in futures]
+
+    def conversation(
+        self, user_input: str, chat_history: List[ChatHistoryEntry], tenant_id: str = DEFAULT_TENANT
+    ) -> str:
         """Process a conversation turn with function calling support.
+
+        Every function call in a model response is executed, independent calls
+        run in parallel, and all results are returned to the model in a single
+        message. This repeats until the model answers in text or
+        `max_tool_rounds` is reached.
         
         Args:
             user_input: The user's message
             chat_history: Previous conversation history
+            tenant_id: The tenant whose documents the tools may search
             
         Returns:
             The model's response as a string
@@ -53,34 +145,51 @@ class ChatRag:
         history_dicts = [{"role": entry["role"], "parts": entry["parts"]} for entry in chat_history]
         
         chat = self._model.start_chat(history=history_dicts)
-            
-        response = chat.send_message(user_input)
-
-        if response.candidates and response.candidates[0].content:
-            for part in response.candidates[0].content.parts:
-                if part.function_call:
-                    function_name: str = part.function_call.name
-                    arguments: Dict[str, Any] = {k: v for k, v in part.function_call.args.items()}
-
-                    if function_name in self._function_map:
-                        try:
-                            result: Any = self._function_map[function_name](**arguments)
-                            
-                            tool_response = chat.send_message([
-                                genai.protos.Part(
-                                    function_response=genai.protos.FunctionResponse(
-                                        name=function_name,
-                                        response={"result": result}
-                                    )
-                                )
-                            ])
-                            return f"{tool_response.text}"
-                        except TypeError as e:
-                            print(f"Error calling function '{function_name}': {e}")
-                            return "Assistant: I couldn't process your request due to missing information. Can you please provide all the details?"
-                    else:
-                        return f"Assistant: I'm sorry, I don't have a tool to perform the action '{function_name}'."
-                elif part.text:
-                    return f"Assistant: {part.text}"
-        else:
-            return "Assistant: I couldn't generate a response. Please try again."
\ No newline at end of file
+
+        try:
+            return self._converse(chat, user_input, tenant_id)
+        except LlmGatewayError as e:
+            logger.error("Gemini call failed: %s", e)
+            return "Assistant: The assistant is busy right now. Please try again shortly."
+
+    def _converse(self, chat: genai.ChatSession, user_input: str, tenant_id: str) -> str:
+        """Run the tool loop for one user message.
+
+        Args:
+            chat: The chat session holding the conversation history.
+            user_input: The user's message.
+            tenant_id: The tenant of the request.
+
+        Returns:
+            The model's response as a string.
+        """
+        response = self._gateway.send_message(chat, user_input, call_name="chat")
+
+        tool_rounds: int = 0
+        while True:
+            if not (response.candidates and response.candidates[0].content):
+                return "Assistant: I couldn't generate a response. Please try again."
+
+            parts = response.candidates[0].content.parts
+            function_calls = [part.function_call for part in parts if part.function_call]
+
+            if not function_calls:
+                text: str = "".join(part.text for part in parts if part.text)
+                if not text:
+                    return "Assistant: I couldn't generate a response. Please try again."
+                return text if tool_rounds else f"Assistant: {text}"
+
+            if tool_rounds == self.max_tool_rounds:
+                return "Assistant: I couldn't complete your request within the allowed number of steps."
+            tool_rounds += 1
+
+            tool_results: List[ToolCallResult] = self._run_tools(function_calls, tenant_id)
+            response = self._gateway.send_message(chat, [
+                genai.protos.Part(
+                    function_response=genai.protos.FunctionResponse(
+                        name=tool_result["name"],
+                        response={"result": tool_result["result"]}
+                    )
+                )
+                for tool_result in tool_results
+            ], call_name="chat_tool_results")
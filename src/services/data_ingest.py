@@ -1,9 +1,13 @@
-from typing import List, Dict, Any, Optional
+import time
+import logging
+from typing import List, Dict, Any, Optional, Tuple
 
+from models import DEFAULT_TENANT
 from utils import WeaviateCollection, MetaData
-from type_definitions import TextChunk, ContentUUID
+from utils.metrics import track_stage, INGEST_CHUNKS, INGEST_OBJECTS_PER_SECOND
+from type_definitions import TextChunk, ContentUUID, ChunkSpan, ChunkRecord
 
-new_data: MetaData = MetaData()
+logger: logging.Logger = logging.getLogger(__name__)
 
 
 class AddRecords:
@@ -14,35 +18,58 @@ class AddRecords:
         self.add_weaviate: WeaviateCollection = WeaviateCollection()
         self.add_sql: MetaData = MetaData()
 
-    def _add_in_weaviate(self, text_data: List[TextChunk]) -> List[ContentUUID]:
+    def _add_in_weaviate(self, text_data: List[TextChunk], tenant_id: str) -> List[ContentUUID]:
         """Import text data into the Weaviate vector database.
 
         Args:
             text_data: A list of TextChunk dictionaries containing text content to be ingested.
+            tenant_id: The tenant that owns the data.
 
         Returns:
             The response from the Weaviate import operation with UUIDs.
         """
-        weaviate_data: List[ContentUUID] = self.add_weaviate.import_data(data_rows=text_data)
+        weaviate_data: List[ContentUUID] = self.add_weaviate.import_data(data_rows=text_data, tenant_id=tenant_id)
         return weaviate_data
 
-    def _add_in_sql(self, document_name: str, text_chunks: List[ContentUUID]) -> Optional[str]:
+    def _add_in_sql(self, document_name: str, text_chunks: List[ChunkRecord], tenant_id: str) -> Optional[str]:
         """Add text chunks to SQL database.
 
         Args:
             document_name: The name of the source document.
-            text_chunks: A list of ContentUUID entries to be added.
+            text_chunks: A list of ChunkRecord entries to be added.
+            tenant_id: The tenant that owns the document.
             
         Returns:
             Success or error message from SQL operation.
         """
-        sql_data: Optional[str] = new_data.add_data(
+        sql_data: Optional[str] = self.add_sql.add_data(
             document_name=document_name, 
-            text_chunks=text_chunks
+            text_chunks=text_chunks,
+            tenant_id=tenant_id
         )
         return sql_data
-    
-    def ingest_data(self, document_name: str, text_chunks: List[str]) -> Optional[str]:
+
+    def _remove_from_weaviate(self, stored: List[ContentUUID], tenant_id: str, sql_response: str) -> str:
+        """Delete vectors whose metadata could not be stored, so searches never return them.
+
+        Args:
+            stored: The chunks imported into the vector store.
+            tenant_id: The tenant that owns the chunks.
+            sql_response: The error returned by the SQL insertion.
+
+        Returns:
+            The SQL error, completed with the outcome of the deletion.
+        """
+        uuids: List[str] = [item["uuid"] for item in stored]
+        delete_response: str = self.add_weaviate.delete_data(uuids=uuids, tenant_id=tenant_id)
+        if delete_response.startswith("Error"):
+            logger.error("Orphaned vectors in tenant '%s' after %s: %s", tenant_id, delete_response, uuids)
+            return f"{sql_response} The {len(uuids)} vectors already imported could not be removed: {delete_response}"
+        return f"{sql_response} The {len(uuids)} vectors already imported were removed."
+
+    def ingest_data(
+        self, document_name: str, text_chunks: List[ChunkSpan], tenant_id: str = DEFAULT_TENANT
+    ) -> Optional[str]:
         """Coordinate the complete data ingestion pipeline.
 
         This method orchestrates the process of adding data to both
@@ -50,20 +77,94 @@ class AddRecords:
 
         Args:
             document_name: The name of the source document.
-            text_chunks: A list of text chunks extracted from the document.
+            text_chunks: The chunk spans extracted from the document, in document order.
+            tenant_id: The tenant that owns the document.
 
         Returns:
             The response from the SQL data insertion.
         """
+        started: float = time.perf_counter()
         all_data: List[TextChunk] = []
         for chunks in text_chunks:
-            new_data_dict = TextChunk(text_content=chunks)
+            new_data_dict = TextChunk(text_content=chunks["content"])
             all_data.append(new_data_dict)
         
-        weaviate_response: List[ContentUUID] = self._add_in_weaviate(all_data)
-        sql_response: Optional[str] = self._add_in_sql(
-            document_name=document_name, 
-            text_chunks=weaviate_response
-        )
+        with track_stage("ingest_vector_store"):
+            weaviate_response: List[ContentUUID] = self._add_in_weaviate(all_data, tenant_id)
+
+        chunk_records: List[ChunkRecord] = []
+        for position, (span, stored) in enumerate(zip(text_chunks, weaviate_response)):
+            chunk_records.append(ChunkRecord(
+                content=stored["content"],
+                uuid=stored["uuid"],
+                chunk_index=position,
+                start_offset=span["start"],
+                end_offset=span["end"]
+            ))
+
+        with track_stage("ingest_metadata"):
+            sql_response: Optional[str] = self._add_in_sql(
+                document_name=document_name, 
+                text_chunks=chunk_records,
+                tenant_id=tenant_id
+            )
+        if sql_response is not None and sql_response.startswith("Error"):
+            return self._remove_from_weaviate(weaviate_response, tenant_id, sql_response)
+
+        INGEST_CHUNKS.inc(len(chunk_records))
+        elapsed: float = time.perf_counter() - started
+        if elapsed > 0:
+            INGEST_OBJECTS_PER_SECOND.set(len(chunk_records) / elapsed)
+
+        return sql_response
+
+    def ingest_documents(
+        self, documents: List[Tuple[str, List[ChunkSpan]]], tenant_id: str = DEFAULT_TENANT
+    ) -> Optional[str]:
+        """Ingest several documents with one Weaviate batch and one SQL commit.
+
+        Args:
+            documents: (document name, chunk spans) pairs.
+            tenant_id: The tenant that owns the documents.
+
+        Returns:
+            The response from the SQL data insertion.
+        """
+        started: float = time.perf_counter()
+        all_data: List[TextChunk] = [
+            TextChunk(text_content=span["content"])
+            for _, spans in documents
+            for span in spans
+        ]
+
+        with track_stage("ingest_vector_store"):
+            weaviate_response: List[ContentUUID] = self._add_in_weaviate(all_data, tenant_id)
+
+        records_by_document: List[Tuple[str, List[ChunkRecord]]] = []
+        offset: int = 0
+        for document_name, spans in documents:
+            records_by_document.append((document_name, [
+                ChunkRecord(
+                    content=stored["content"],
+                    uuid=stored["uuid"],
+                    chunk_index=position,
+                    start_offset=span["start"],
+                    end_offset=span["end"]
+                )
+                for position, (span, stored) in enumerate(
+                    zip(spans, weaviate_response[offset:offset + len(spans)])
+                )
+            ]))
+            offset += len(spans)
+
+        with track_stage("ingest_metadata"):
+            sql_response: Optional[str] = self.add_sql.add_documents(records_by_document, tenant_id)
+        if sql_response is not None and sql_response.startswith("Error"):
+            return self._remove_from_weaviate(weaviate_response, tenant_id, sql_response)
+
+        INGEST_CHUNKS.inc(len(all_data))
+        elapsed: float = time.perf_counter() - started
+        if elapsed > 0:
+            INGEST_OBJECTS_PER_SECOND.set(len(all_data) / elapsed)
 
-        return sql_response
\ No newline at end of file
+        return sql_response
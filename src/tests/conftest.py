@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# The engine is created when models is imported, so the test database must be set first.
+TEST_DB_DIR: str = tempfile.mkdtemp(prefix="rag_tests_")
+os.environ["METADATA_DB_URL"] = f"sqlite:///{os.path.join(TEST_DB_DIR, 'metadata.db')}"
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
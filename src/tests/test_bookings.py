@@ -0,0 +1,74 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from type_definitions import ChunkRecord, FunctionResponse, SchedulesResponse
+from utils import GetFunctions, MetaData, SqlData
+
+PARALLEL_BOOKINGS: int = 32
+
+
+def test_parallel_bookings_of_one_slot_exactly_one_wins() -> None:
+    store: MetaData = MetaData()
+    start_together: threading.Barrier = threading.Barrier(PARALLEL_BOOKINGS)
+
+    def book(index: int) -> FunctionResponse:
+        start_together.wait()
+        # Half ask for the slot itself, half for one overlapping it by 15 minutes.
+        return store.add_interview(
+            name=f"Candidate {index}",
+            email=f"candidate{index}@example.com",
+            date="2030-01-07",
+            time="10:00" if index % 2 else "10:15",
+        )
+
+    with ThreadPoolExecutor(max_workers=PARALLEL_BOOKINGS) as pool:
+        statuses: List[str] = [result["status"] for result in pool.map(book, range(PARALLEL_BOOKINGS))]
+
+    assert statuses.count("success") == 1
+    assert statuses.count("conflict") == PARALLEL_BOOKINGS - 1
+    schedules: SchedulesResponse = GetFunctions().get_past_schedules(start_date="2030-01-07", end_date="2030-01-07")
+    assert len(schedules["schedules"]) == 1
+
+
+def test_booking_is_visible_to_the_next_get_past_schedules() -> None:
+    tools: GetFunctions = GetFunctions()
+    assert tools.get_past_schedules(start_date="2030-02-01", end_date="2030-02-01")["schedules"] == []
+
+    booking: FunctionResponse = tools.book_interview(
+        name="Jane Doe", email="jane@example.com", date="2030-02-01", time="15:00"
+    )
+    assert booking["status"] == "success"
+
+    schedules: SchedulesResponse = tools.get_past_schedules(start_date="2030-02-01", end_date="2030-02-01")
+    assert [entry["candidate_email"] for entry in schedules["schedules"]] == ["jane@example.com"]
+
+
+def test_chunks_added_after_a_read_are_visible_to_the_same_reader() -> None:
+    store: MetaData = MetaData()
+    reader: SqlData = SqlData(retrieval_mode="lexical")
+    first: ChunkRecord = ChunkRecord(
+        uuid=str(uuid.uuid4()), content="Remote work is allowed twice a week.",
+        chunk_index=0, start_offset=0, end_offset=36,
+    )
+    second: ChunkRecord = ChunkRecord(
+        uuid=str(uuid.uuid4()), content="Annual leave is 25 days.",
+        chunk_index=0, start_offset=0, end_offset=24,
+    )
+
+    store.add_data("remote.txt", [first])
+    assert [chunk["text"] for chunk in reader.get_chunks_data([first["uuid"]])] == [first["content"]]
+
+    store.add_data("leave.txt", [second])
+    assert [chunk["text"] for chunk in reader.get_chunks_data([second["uuid"]])] == [second["content"]]
+    assert "Annual leave is 25 days." in reader.all_context("annual leave days")
+
+
+def test_get_past_schedules_rejects_non_numeric_paging() -> None:
+    tools: GetFunctions = GetFunctions()
+    for paging in ({"limit": "ten"}, {"offset": "next"}, {"limit": None}):
+        schedules: SchedulesResponse = tools.get_past_schedules(**paging)
+        assert schedules == SchedulesResponse(
+            status="error", schedules=[], has_more=False, message="limit and offset must be whole numbers."
+        )
@@ -0,0 +1,50 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from services import ChatRag
+from type_definitions import ToolCallResult
+
+CONCURRENT_TURNS: int = 16
+
+
+def test_tool_calls_of_concurrent_turns_run_at_the_same_time() -> None:
+    chat: ChatRag = ChatRag()
+    # Every tool call waits until all of them have started, so this only passes
+    # if no turn's tool queues behind another's.
+    all_started: threading.Barrier = threading.Barrier(CONCURRENT_TURNS, timeout=10)
+
+    def slow_tool() -> Dict[str, Any]:
+        all_started.wait()
+        return {"thread": threading.get_ident()}
+
+    chat._function_map["get_current_time"] = slow_tool
+    call = SimpleNamespace(name="get_current_time", args={})
+
+    def turn(_: int) -> List[ToolCallResult]:
+        results: List[ToolCallResult] = chat._run_tools([call], "default")
+        # A single call runs on the request's own thread.
+        assert results[0]["result"]["thread"] == threading.get_ident()
+        return results
+
+    with ThreadPoolExecutor(max_workers=CONCURRENT_TURNS) as pool:
+        turns: List[List[ToolCallResult]] = list(pool.map(turn, range(CONCURRENT_TURNS)))
+
+    assert len({results[0]["result"]["thread"] for results in turns}) == CONCURRENT_TURNS
+
+
+def test_several_calls_of_one_turn_run_in_parallel() -> None:
+    chat: ChatRag = ChatRag()
+    all_started: threading.Barrier = threading.Barrier(3, timeout=10)
+
+    def slow_tool() -> Dict[str, Any]:
+        all_started.wait()
+        return {"done": True}
+
+    chat._function_map["get_current_time"] = slow_tool
+    call = SimpleNamespace(name="get_current_time", args={})
+
+    results: List[ToolCallResult] = chat._run_tools([call, call, call], "default")
+
+    assert [result["result"] for result in results] == [{"done": True}] * 3
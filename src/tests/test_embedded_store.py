@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+
+from services import AddRecords
+from type_definitions import ChunkSpan
+from utils import WeaviateCollection
+from utils.embedded_store import EmbeddedBackend
+
+WRITERS: int = 4
+IMPORTS_PER_WRITER: int = 200
+
+
+def test_imports_racing_deactivation_keep_every_vector_with_its_text(tmp_path) -> None:
+    backend: EmbeddedBackend = EmbeddedBackend(directory=str(tmp_path))
+    writing: threading.Event = threading.Event()
+    writing.set()
+
+    def write(writer: int) -> None:
+        for number in range(IMPORTS_PER_WRITER):
+            backend.import_data([{"text_content": f"writer{writer} chunk{number} policy"}], tenant_id="acme")
+
+    def deactivate() -> None:
+        while writing.is_set():
+            backend.deactivate_tenant("acme")
+            backend.hybrid_search("policy", tenant_id="acme")
+
+    deactivator: threading.Thread = threading.Thread(target=deactivate)
+    deactivator.start()
+    with ThreadPoolExecutor(max_workers=WRITERS) as pool:
+        list(pool.map(write, range(WRITERS)))
+    writing.clear()
+    deactivator.join()
+
+    backend.deactivate_tenant("acme")
+    with open(os.path.join(tmp_path, "acme", "chunks.jsonl"), encoding="utf-8") as handle:
+        texts: List[str] = [json.loads(line)["text"] for line in handle]
+    assert len(texts) == WRITERS * IMPORTS_PER_WRITER
+
+    stored: np.ndarray = np.asarray(backend._tenant("acme", create=False)._matrix[:len(texts)])
+    assert np.allclose(stored, backend.embedder.embed(texts), atol=1e-6)
+    assert backend.vector_search("writer3 chunk150 policy", limit=1, tenant_id="acme") != []
+
+
+def test_failed_metadata_write_removes_the_imported_vectors(tmp_path) -> None:
+    backend: EmbeddedBackend = EmbeddedBackend(directory=str(tmp_path))
+    kept: str = backend.import_data([{"text_content": "Parking is free."}], tenant_id="acme")[0]["uuid"]
+    records: AddRecords = AddRecords()
+    records.add_weaviate = WeaviateCollection(backend)
+    records.add_sql.add_documents = lambda documents, tenant_id: "Error adding data: database is locked"
+    spans: List[ChunkSpan] = [ChunkSpan(content="Parking permits are issued by facilities.", start=0, end=41)]
+
+    response: str = records.ingest_documents([("parking.txt", spans)], tenant_id="acme")
+
+    assert response == "Error adding data: database is locked The 1 vectors already imported were removed."
+    assert backend.hybrid_search("parking permits", tenant_id="acme") == [kept]
+    # The deletion survives reloading the tenant from disk.
+    backend.deactivate_tenant("acme")
+    assert backend.hybrid_search("parking permits", tenant_id="acme") == [kept]
+    assert backend.vector_search("parking permits", tenant_id="acme") == [kept]
+
+
+def test_failed_single_document_write_removes_the_imported_vectors(tmp_path) -> None:
+    backend: EmbeddedBackend = EmbeddedBackend(directory=str(tmp_path))
+    records: AddRecords = AddRecords()
+    records.add_weaviate = WeaviateCollection(backend)
+    records.add_sql.add_data = lambda document_name, text_chunks, tenant_id: "Error adding data: disk I/O error"
+    spans: List[ChunkSpan] = [ChunkSpan(content="Visitors sign in at reception.", start=0, end=30)]
+
+    response: str = records.ingest_data("visitors.txt", spans, tenant_id="acme")
+
+    assert response == "Error adding data: disk I/O error The 1 vectors already imported were removed."
+    assert backend.hybrid_search("visitors reception", tenant_id="acme") == []
@@ -0,0 +1,27 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from type_definitions import ChunkRecord
+from utils import MetaData, SqlData
+
+INGEST_THREADS: int = 8
+DOCUMENTS: int = 64
+
+
+def test_concurrent_add_data_stores_every_document() -> None:
+    store: MetaData = MetaData(text_storage="blocks")
+
+    def ingest(document: int) -> Optional[str]:
+        content: str = f"Policy {document} covers travel expenses for team {document}."
+        record: ChunkRecord = ChunkRecord(
+            uuid=str(uuid.uuid4()), content=content, chunk_index=0, start_offset=0, end_offset=len(content)
+        )
+        return store.add_data(f"concurrent_{document}.txt", [record], tenant_id="concurrent")
+
+    with ThreadPoolExecutor(max_workers=INGEST_THREADS) as pool:
+        responses: List[Optional[str]] = list(pool.map(ingest, range(DOCUMENTS)))
+
+    assert [response for response in responses if not response.startswith("Successfully")] == []
+    reader: SqlData = SqlData(retrieval_mode="lexical")
+    assert "Policy 17 covers travel expenses" in reader.all_context("policy travel expenses team 17", tenant_id="concurrent")
@@ -0,0 +1,39 @@
+from typing import Any
+
+import google.generativeai as genai
+import pytest
+
+from services import ChatRag
+from utils import LlmGateway, LlmGatewayError
+
+
+class StoppedChat:
+    """A chat session whose every message ends in a provider-side refusal."""
+
+    def __init__(self, error: Exception) -> None:
+        self.error: Exception = error
+
+    def send_message(self, content: Any, **_: Any) -> Any:
+        raise self.error
+
+
+@pytest.mark.parametrize("error", [
+    genai.types.StopCandidateException("finish_reason: SAFETY"),
+    genai.types.BlockedPromptException("block_reason: OTHER"),
+])
+def test_send_message_wraps_blocked_and_stopped_responses(error: Exception) -> None:
+    gateway: LlmGateway = LlmGateway(max_retries=0)
+
+    with pytest.raises(LlmGatewayError) as raised:
+        gateway.send_message(StoppedChat(error), "hello")
+
+    assert raised.value.__cause__ is error
+
+
+def test_conversation_degrades_when_the_response_is_stopped() -> None:
+    chat: ChatRag = ChatRag()
+    chat._model.start_chat = lambda history: StoppedChat(genai.types.StopCandidateException("finish_reason: SAFETY"))
+
+    answer: str = chat.conversation("hello", [])
+
+    assert answer == "Assistant: The assistant is busy right now. Please try again shortly."
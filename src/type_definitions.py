@@ -1,6 +1,6 @@
 """Type definitions for the PDF RAG application."""
 
-from typing import TypedDict, List, Any
+from typing import TypedDict, List, Any, Optional, Iterator
 
 
 class ChatHistoryEntry(TypedDict):
@@ -37,9 +37,11 @@ class InterviewScheduleEntry(TypedDict):
 
 
 class SchedulesResponse(TypedDict):
-    """Type definition for schedules API response."""
+    """Type definition for schedules API response; message explains an "error" status."""
     status: str
     schedules: List[InterviewScheduleEntry]
+    has_more: bool
+    message: Optional[str]
 
 
 class TimeResponse(TypedDict):
@@ -48,6 +50,13 @@ class TimeResponse(TypedDict):
 
 
 
+class ToolCallResult(TypedDict):
+    """Type definition for the outcome of a single tool call."""
+    name: str
+    result: Any
+    elapsed_ms: float
+
+
 class ContentUUID(TypedDict):
     """Type definition for content with UUID."""
     content: str
@@ -57,3 +66,107 @@ class ContentUUID(TypedDict):
 class TextChunk(TypedDict):
     """Type definition for text chunks."""
     text_content: str
+
+
+class ChunkSpan(TypedDict):
+    """Type definition for a text chunk and its character offsets in the source text."""
+    content: str
+    start: int
+    end: int
+
+
+class ChunkRecord(ContentUUID):
+    """Type definition for a stored chunk with its ordinal position and offsets."""
+    chunk_index: int
+    start_offset: int
+    end_offset: int
+
+
+class StoredChunk(TypedDict):
+    """Type definition for a chunk read back from the metadata database, with its text."""
+    chunk_id: str
+    tenant_id: str
+    source_id: str
+    text: str
+    chunk_index: Optional[int]
+    start_offset: Optional[int]
+    end_offset: Optional[int]
+
+
+class ExtractedDocument(TypedDict):
+    """Type definition for the text extracted from an uploaded document."""
+    text: str
+    pages: int
+
+
+class DocumentSegments(TypedDict):
+    """Type definition for a parsed document whose text is streamed in order."""
+    segments: Iterator[str]
+    pages: int
+
+
+class ChunkedDocument(TypedDict):
+    """Type definition for a document after extraction and chunking."""
+    filename: str
+    spans: List[ChunkSpan]
+    pages: int
+    error: Optional[str]
+
+
+class FileIngestStatus(TypedDict):
+    """Type definition for the outcome of one file in a bulk ingestion."""
+    filename: str
+    status: str  # "ingested", "failed" or "skipped"
+    chunks: int
+    error: Optional[str]
+
+
+class BulkIngestReport(TypedDict):
+    """Type definition for a bulk ingestion response."""
+    files: List[FileIngestStatus]
+    documents_ingested: int
+    documents_failed: int
+    chunks: int
+    seconds: float
+    documents_per_second: float
+
+
+class ContextPassage(TypedDict):
+    """Type definition for a retrieved passage and the document it came from."""
+    source: str
+    text: str
+
+
+class CompressedContext(TypedDict):
+    """Type definition for the query-focused context given to the answer prompt."""
+    text: str
+    sources: List[str]
+    original_tokens: int
+    tokens: int
+
+
+class TraceSpan(TypedDict):
+    """Type definition for one timed stage of a traced request."""
+    name: str
+    start_ms: float  # Since the request started
+    duration_ms: float
+    depth: int  # Nesting level; 0 for stages entered directly by the request
+    thread: str
+
+
+class RequestTraceRecord(TypedDict):
+    """Type definition for a finished traced request and its stage breakdown."""
+    trace_id: str
+    method: str
+    path: str
+    status: int
+    started_at: str
+    duration_ms: float
+    spans: List[TraceSpan]
+
+
+class ProfileResult(TypedDict):
+    """Type definition for the result of a sampling profile."""
+    samples: int
+    seconds: float
+    collapsed: str  # One "frame;frame;frame count" line per distinct stack
@@ -1,5 +1,8 @@
 from .chunking import TextProcessor
 from .store_metadata import MetaData
+from .keyword_index import KeywordIndex
+from .vector_backend import VectorBackend, WeaviateBackend, get_vector_backend, set_vector_backend
 from .store_weaviate import WeaviateCollection
 from .functions import GetFunctions
-from .retrieve_data import SqlData
\ No newline at end of file
+from .retrieve_data import SqlData
+from .llm_gateway import LlmGateway, LlmGatewayError, get_gateway
@@ -1,62 +1,167 @@
 import re
-from typing import List, Literal
+from typing import Iterable, Iterator, List, Literal
+
+from type_definitions import ChunkSpan
+
+SENTENCE_BOUNDARY: re.Pattern = re.compile(r'(?<=[.!?])\s+')
 
 class TextProcessor:
     """A class to chunk text using different strategies."""
 
-    def _chunk_by_characters(self, text: str, chunk_size: int, overlap: int) -> List[str]:
-        """Chunk the text based on a fixed number of characters.
-        
+    def _chunk_by_characters(self, segments: Iterable[str], chunk_size: int, overlap: int) -> Iterator[ChunkSpan]:
+        """Chunk streamed text based on a fixed number of characters.
+
+        Only the text of the window being built is buffered, so the full
+        document never has to be joined into one string.
+
         Args:
-            text: The text to chunk.
+            segments: The text, as consecutive pieces in document order.
             chunk_size: Maximum size of each chunk.
             overlap: Number of characters to overlap between chunks.
-            
-        Returns:
-            List of text chunks.
+
+        Yields:
+            Text chunks with their character offsets.
         """
-        chunks: List[str] = []
+        step: int = chunk_size - overlap
+        buffer: str = ""
+        buffer_start: int = 0
         start: int = 0
-        while start < len(text):
-            end: int = start + chunk_size
-            chunks.append(text[start:end])
-            start += chunk_size - overlap
-        return chunks
-
-    def _chunk_by_sentences(self, text: str) -> List[str]:
-        """Chunk the text into individual sentences.
-        
+        for segment in segments:
+            buffer += segment
+            buffer_end: int = buffer_start + len(buffer)
+            while start + chunk_size <= buffer_end:
+                offset: int = start - buffer_start
+                yield ChunkSpan(content=buffer[offset:offset + chunk_size], start=start, end=start + chunk_size)
+                start += step
+            if start > buffer_start:
+                buffer = buffer[start - buffer_start:]
+                buffer_start = start
+        buffer_end = buffer_start + len(buffer)
+        while start < buffer_end:
+            end: int = min(start + chunk_size, buffer_end)
+            yield ChunkSpan(content=buffer[start - buffer_start:end - buffer_start], start=start, end=end)
+            start += step
+
+    def _chunk_by_sentences(self, segments: Iterable[str]) -> Iterator[ChunkSpan]:
+        """Chunk streamed text into individual sentences.
+
+        A sentence boundary at the end of a segment is only acted on once the
+        following text is known, so sentences spanning segments stay whole.
+
         Args:
-            text: The text to chunk.
-            
+            segments: The text, as consecutive pieces in document order.
+
+        Yields:
+            Sentences with their character offsets.
+        """
+        buffer: str = ""
+        buffer_start: int = 0
+        scan_from: int = 0
+        for segment in segments:
+            buffer += segment
+            start: int = 0
+            for separator in SENTENCE_BOUNDARY.finditer(buffer, scan_from):
+                if separator.end() == len(buffer):
+                    scan_from = separator.start()
+                    break
+                yield from self._sentence_span(buffer, buffer_start, start, separator.start())
+                start = separator.end()
+            else:
+                scan_from = max(len(buffer) - 1, 0)
+            buffer = buffer[start:]
+            buffer_start += start
+            scan_from -= start
+        start = 0
+        for separator in SENTENCE_BOUNDARY.finditer(buffer, scan_from):
+            yield from self._sentence_span(buffer, buffer_start, start, separator.start())
+            start = separator.end()
+        yield from self._sentence_span(buffer, buffer_start, start, len(buffer))
+
+    def _sentence_span(self, text: str, base: int, start: int, end: int) -> Iterator[ChunkSpan]:
+        """Yield the stripped sentence text[start:end] if it is not blank.
+
+        Args:
+            text: The buffered source text.
+            base: Offset of text within the whole document.
+            start: Offset in text where the sentence begins.
+            end: Offset in text where the sentence ends.
+
+        Yields:
+            The sentence span, with offsets in the whole document.
+        """
+        sentence: str = text[start:end]
+        stripped: str = sentence.strip()
+        if not stripped:
+            return
+        begin: int = base + start + (len(sentence) - len(sentence.lstrip()))
+        yield ChunkSpan(content=stripped, start=begin, end=begin + len(stripped))
+
+    def chunk_stream(self,
+                     segments: Iterable[str],
+                     strategy: Literal["char", "sentence"],
+                     chunk_size: int = 500,
+                     overlap: int = 50) -> Iterator[ChunkSpan]:
+        """Chunk text that arrives as consecutive segments, yielding chunks as they complete.
+
+        The chunks and offsets are identical to chunking the joined segments.
+
+        Args:
+            segments: The text, as consecutive pieces in document order.
+            strategy: The chunking strategy to use ("char" or "sentence").
+            chunk_size: The maximum size of a chunk for character-based strategy.
+            overlap: The number of characters to overlap between chunks.
+
         Returns:
-            List of sentences.
+            An iterator over the chunk spans, in document order.
+
+        Raises:
+            ValueError: If an unknown chunking strategy is provided.
+        """
+        if strategy == "char":
+            return self._chunk_by_characters(segments, chunk_size, overlap)
+        elif strategy == "sentence":
+            return self._chunk_by_sentences(segments)
+        else:
+            raise ValueError(f"Unknown chunking strategy '{strategy}'. Please use 'char' or 'sentence'.")
+
+    def chunk_spans(self,
+                    text: str,
+                    strategy: Literal["char", "sentence"],
+                    chunk_size: int = 500,
+                    overlap: int = 50) -> List[ChunkSpan]:
+        """Chunk the given text and keep each chunk's offsets in the source text.
+
+        Args:
+            text: The raw text to be processed.
+            strategy: The chunking strategy to use ("char" or "sentence").
+            chunk_size: The maximum size of a chunk for character-based strategy.
+            overlap: The number of characters to overlap between chunks.
+
+        Returns:
+            The list of chunk spans, in document order.
+
+        Raises:
+            ValueError: If an unknown chunking strategy is provided.
         """
-        sentences: List[str] = re.split(r'(?<=[.!?])\s+', text)
-        return [s.strip() for s in sentences if s.strip()]
+        return list(self.chunk_stream([text], strategy, chunk_size, overlap))
 
-    def chunk_text(self, 
-                   text: str, 
-                   strategy: Literal["char", "sentence"], 
-                   chunk_size: int = 500, 
+    def chunk_text(self,
+                   text: str,
+                   strategy: Literal["char", "sentence"],
+                   chunk_size: int = 500,
                    overlap: int = 50) -> List[str]:
         """Chunk the given text based on the specified strategy.
-        
+
         Args:
             text: The raw text to be processed.
             strategy: The chunking strategy to use ("char" or "sentence").
             chunk_size: The maximum size of a chunk for character-based strategy.
             overlap: The number of characters to overlap between chunks.
-        
+
         Returns:
             The list of chunks.
-        
+
         Raises:
             ValueError: If an unknown chunking strategy is provided.
         """
-        if strategy == "char":
-            return self._chunk_by_characters(text, chunk_size, overlap)
-        elif strategy == "sentence":
-            return self._chunk_by_sentences(text)
-        else:
-            raise ValueError(f"Unknown chunking strategy '{strategy}'. Please use 'char' or 'sentence'.")
\ No newline at end of file
+        return [span["content"] for span in self.chunk_spans(text, strategy, chunk_size, overlap)]
@@ -0,0 +1,182 @@
+import os
+import math
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from type_definitions import CompressedContext, ContextPassage
+from .chunking import SENTENCE_BOUNDARY
+from .embedded_store import HashingEmbedder, tokenize
+from .keyword_index import STOPWORDS
+
+# Tokens of retrieved context sent to the answer prompt; 0 sends every passage.
+CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "512"))
+
+# A rough count for English text with Gemini's tokenizer, used so that
+# budgeting needs no tokenizer call.
+CHARS_PER_TOKEN: int = 4
+
+# BM25 parameters for scoring sentences against the query.
+BM25_K1: float = 1.2
+BM25_B: float = 0.75
+
+# Sentences without a query term are kept only if their hashed vector is at
+# least this similar to the query's.
+MIN_SIMILARITY: float = 0.2
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text from its length."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def content_terms(text: str) -> List[str]:
+    """Return the text's lower-case words without stopwords, or all of them if only stopwords remain."""
+    terms: List[str] = tokenize(text)
+    return [term for term in terms if term not in STOPWORDS] or terms
+
+
+class ContextCompressor:
+    """Cuts retrieved passages down to the sentences that answer a query, within a token budget.
+
+    Sentences are scored by BM25 over the candidate sentences plus the cosine
+    similarity of hashed word vectors, both computed locally. The best ones
+    that fit the budget are kept in document order, and each passage keeps a
+    [n] marker that refers to its source document.
+    """
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        embedder: Optional[HashingEmbedder] = None,
+        vector_weight: float = 0.5,
+    ) -> None:
+        """Initialize the compressor.
+
+        Args:
+            token_budget: Maximum estimated tokens of selected sentences; defaults to CONTEXT_TOKEN_BUDGET.
+            embedder: Embeds the query and sentences for the similarity score.
+            vector_weight: Weight of the similarity score next to the normalised BM25 score.
+        """
+        self.token_budget: int = CONTEXT_TOKEN_BUDGET if token_budget is None else token_budget
+        self.embedder: HashingEmbedder = embedder or HashingEmbedder()
+        self.vector_weight: float = vector_weight
+
+    def _sentences(self, passages: List[ContextPassage]) -> List[Tuple[int, int, str]]:
+        """Split the passages into (passage index, sentence index, sentence), dropping repeated sentences."""
+        sentences: List[Tuple[int, int, str]] = []
+        seen: Set[str] = set()
+        for passage_index, passage in enumerate(passages):
+            for sentence_index, sentence in enumerate(SENTENCE_BOUNDARY.split(passage["text"].strip())):
+                sentence = sentence.strip()
+                if sentence and sentence not in seen:
+                    seen.add(sentence)
+                    sentences.append((passage_index, sentence_index, sentence))
+        return sentences
+
+    def _scores(self, query: str, sentences: List[str]) -> List[float]:
+        """Score each sentence's relevance to the query; 0 means not relevant.
+
+        Args:
+            query: The user's query.
+            sentences: The candidate sentences.
+
+        Returns:
+            One score per sentence.
+        """
+        query_terms: List[str] = content_terms(query)
+        if not query_terms or not sentences:
+            return [0.0] * len(sentences)
+
+        documents: List[Counter] = [Counter(tokenize(sentence)) for sentence in sentences]
+        average_length: float = sum(sum(document.values()) for document in documents) / len(documents) or 1.0
+        frequencies: Dict[str, int] = {
+            term: sum(1 for document in documents if term in document) for term in set(query_terms)
+        }
+        bm25: List[float] = []
+        for document in documents:
+            length: int = sum(document.values())
+            score: float = 0.0
+            for term in set(query_terms):
+                count: int = document.get(term, 0)
+                if count:
+                    idf: float = math.log(1 + (len(documents) - frequencies[term] + 0.5) / (frequencies[term] + 0.5))
+                    score += idf * count * (BM25_K1 + 1) / (
+                        count + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    )
+            bm25.append(score)
+        best: float = max(bm25) or 1.0
+
+        vectors: np.ndarray = self.embedder.embed([" ".join(query_terms)] + sentences)
+        similarity: np.ndarray = vectors[1:] @ vectors[0]
+
+        return [
+            lexical / best + self.vector_weight * float(cosine)
+            if lexical > 0 or cosine >= MIN_SIMILARITY else 0.0
+            for lexical, cosine in zip(bm25, similarity)
+        ]
+
+    def compress(self, query: str, passages: List[ContextPassage]) -> CompressedContext:
+        """Select the query-relevant sentences of the passages that fit the token budget.
+
+        If no sentence is relevant, sentences are taken in retrieval order,
+        since the retriever ranked the passages for the query. A first
+        sentence longer than the whole budget is cut to it.
+
+        Args:
+            query: The user's query.
+            passages: The retrieved passages, best first.
+
+        Returns:
+            The context text with [n] markers, the numbered sources, and the
+            estimated tokens before and after compression.
+        """
+        original_tokens: int = sum(estimate_tokens(passage["text"]) for passage in passages)
+        candidates: List[Tuple[int, int, str]] = self._sentences(passages)
+
+        if self.token_budget <= 0:
+            selected: List[Tuple[int, int, str]] = candidates
+        else:
+            scores: List[float] = self._scores(query, [sentence for _, _, sentence in candidates])
+            ranked: List[int] = sorted(
+                (index for index, score in enumerate(scores) if score > 0), key=lambda index: -scores[index]
+            ) or list(range(len(candidates)))
+
+            selected = []
+            used: int = 0
+            for index in ranked:
+                tokens: int = estimate_tokens(candidates[index][2])
+                if used + tokens <= self.token_budget:
+                    selected.append(candidates[index])
+                    used += tokens
+                elif not selected:
+                    passage_index, sentence_index, sentence = candidates[index]
+                    selected.append((passage_index, sentence_index, sentence[:self.token_budget * CHARS_PER_TOKEN]))
+                    used = self.token_budget
+            selected.sort(key=lambda candidate: candidate[:2])
+
+        sources: List[str] = []
+        blocks: List[str] = []
+        for passage_index in sorted({candidate[0] for candidate in selected}):
+            source: str = passages[passage_index]["source"]
+            if source not in sources:
+                sources.append(source)
+            parts: List[str] = []
+            previous: Optional[int] = None
+            for _, sentence_index, sentence in (candidate for candidate in selected if candidate[0] == passage_index):
+                if previous is not None and sentence_index != previous + 1:
+                    parts.append("...")
+                parts.append(sentence)
+                previous = sentence_index
+            blocks.append(f"[{sources.index(source) + 1}] " + " ".join(parts))
+
+        text: str = "\n".join(blocks)
+        if sources:
+            text += "\n\nSources:\n" + "\n".join(f"[{number}] {source}" for number, source in enumerate(sources, 1))
+        return CompressedContext(
+            text=text,
+            sources=sources,
+            original_tokens=original_tokens,
+            tokens=estimate_tokens(text),
+        )
@@ -0,0 +1,526 @@
+import json
+import math
+import os
+import re
+import threading
+import uuid as uuid_lib
+import zlib
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from models import DEFAULT_TENANT
+from type_definitions import ContentUUID, TextChunk
+from .vector_backend import VectorBackend
+
+TOKEN_PATTERN: re.Pattern = re.compile(r"\w+")
+
+# Weight of the vector leg in hybrid scores, as in Weaviate's relative score fusion.
+HYBRID_ALPHA: float = float(os.getenv("EMBEDDED_HYBRID_ALPHA", "0.75"))
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-case word tokens.
+
+    Args:
+        text: The text to split.
+
+    Returns:
+        The tokens in order.
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class HashingEmbedder:
+    """Embeds text by hashing its words and word pairs into a fixed number of signed buckets.
+
+    It needs no model or network, so vectors capture lexical rather than
+    semantic similarity; hashes are stable across processes.
+    """
+
+    def __init__(self, dimensions: int = 512) -> None:
+        """Initialize the embedder.
+
+        Args:
+            dimensions: The length of the produced vectors.
+        """
+        self.dimensions: int = dimensions
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed several texts.
+
+        Args:
+            texts: The texts to embed.
+
+        Returns:
+            A (len(texts), dimensions) float32 matrix of unit-length rows.
+        """
+        vectors: np.ndarray = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens: List[str] = tokenize(text)
+            features: List[str] = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+            for feature, count in Counter(features).items():
+                digest: int = zlib.crc32(feature.encode("utf-8"))
+                sign: float = -1.0 if digest & 0x80000000 else 1.0
+                vectors[row, digest % self.dimensions] += sign * (1.0 + math.log(count))
+        norms: np.ndarray = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class _TenantIndex:
+    """One tenant's vectors in a growable memory-mapped matrix, with a BM25 index and optional IVF.
+
+    Files in the tenant directory:
+        vectors.f32  - float32 rows, over-allocated so appends rarely remap
+        chunks.jsonl - one {"uuid", "text"} line per row, written after its vector
+        deleted.txt  - the UUID of each deleted row, one per line
+        index.json   - the vector dimensions
+
+    Deleted rows keep their place, so row numbers stay stable; their vectors
+    are zeroed and searches skip them.
+    """
+
+    def __init__(self, directory: str, dimensions: int, ivf_min_rows: int, nprobe: int) -> None:
+        """Open or create a tenant's store.
+
+        Args:
+            directory: The tenant's directory.
+            dimensions: The vector dimensions.
+            ivf_min_rows: Row count from which searches use the IVF index.
+            nprobe: Number of IVF lists scanned per query.
+
+        Raises:
+            ValueError: If the store was created with different dimensions.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.dimensions: int = dimensions
+        self.ivf_min_rows: int = ivf_min_rows
+        self.nprobe: int = nprobe
+        self._vectors_path: str = os.path.join(directory, "vectors.f32")
+        self._chunks_path: str = os.path.join(directory, "chunks.jsonl")
+        self._deleted_path: str = os.path.join(directory, "deleted.txt")
+        self._write_lock: threading.Lock = threading.Lock()
+        self._keyword_lock: threading.Lock = threading.Lock()
+        self._train_lock: threading.Lock = threading.Lock()
+        self.closed: bool = False
+
+        index_path: str = os.path.join(directory, "index.json")
+        if os.path.exists(index_path):
+            with open(index_path, encoding="utf-8") as handle:
+                stored: int = json.load(handle)["dimensions"]
+            if stored != dimensions:
+                raise ValueError(f"Store at '{directory}' has {stored} dimensions, not {dimensions}.")
+        else:
+            with open(index_path, "w", encoding="utf-8") as handle:
+                json.dump({"dimensions": dimensions}, handle)
+
+        deleted_uuids: Set[str] = set()
+        if os.path.exists(self._deleted_path):
+            with open(self._deleted_path, encoding="utf-8") as handle:
+                deleted_uuids = {line.strip() for line in handle if line.strip()}
+
+        self.uuids: List[str] = []
+        self._deleted: Set[int] = set()
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._lengths: List[int] = []
+        self._total_length: int = 0
+        if os.path.exists(self._chunks_path):
+            with open(self._chunks_path, encoding="utf-8") as handle:
+                for line in handle:
+                    chunk: Dict[str, str] = json.loads(line)
+                    if chunk["uuid"] in deleted_uuids:
+                        self._deleted.add(len(self.uuids))
+                        self._index_text(len(self.uuids), "")
+                    else:
+                        self._index_text(len(self.uuids), chunk["text"])
+                    self.uuids.append(chunk["uuid"])
+
+        capacity: int = os.path.getsize(self._vectors_path) // (4 * dimensions) if os.path.exists(self._vectors_path) else 0
+        self._matrix: Optional[np.memmap] = self._open_matrix(capacity) if capacity else None
+        self.count: int = min(len(self.uuids), capacity)
+        self._ivf_centroids: Optional[np.ndarray] = None
+        self._ivf_assignments: np.ndarray = np.empty(0, dtype=np.int32)
+        self._ivf_trained_rows: int = 0
+
+    def _open_matrix(self, capacity: int) -> np.memmap:
+        """Map the vector file, which holds capacity rows."""
+        return np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimensions))
+
+    def _ensure_capacity(self, rows: int) -> None:
+        """Grow the vector file geometrically so it holds at least rows rows."""
+        capacity: int = 0 if self._matrix is None else self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity: int = max(rows, 2 * capacity, 1024)
+        with open(self._vectors_path, "ab") as handle:
+            handle.truncate(new_capacity * self.dimensions * 4)
+        self._matrix = self._open_matrix(new_capacity)
+
+    def _index_text(self, row: int, text: str) -> None:
+        """Add a row's text to the BM25 index."""
+        tokens: List[str] = tokenize(text)
+        with self._keyword_lock:
+            for token, count in Counter(tokens).items():
+                self._postings[token][row] = count
+            self._lengths.append(len(tokens))
+            self._total_length += len(tokens)
+
+    def add(self, vectors: np.ndarray, texts: List[str]) -> Optional[List[str]]:
+        """Append rows and return their new UUIDs.
+
+        Args:
+            vectors: The (n, dimensions) vectors.
+            texts: The n chunk texts.
+
+        Returns:
+            The UUIDs assigned to the rows, or None if the index was closed and nothing was written.
+        """
+        with self._write_lock:
+            if self.closed:
+                return None
+            start: int = self.count
+            end: int = start + len(texts)
+            self._ensure_capacity(end)
+            self._matrix[start:end] = vectors
+            self._matrix.flush()
+
+            uuids: List[str] = [str(uuid_lib.uuid4()) for _ in texts]
+            with open(self._chunks_path, "a", encoding="utf-8") as handle:
+                handle.writelines(
+                    json.dumps({"uuid": uuid, "text": text}) + "\n" for uuid, text in zip(uuids, texts)
+                )
+            for offset, text in enumerate(texts):
+                self._index_text(start + offset, text)
+            self.uuids.extend(uuids)
+            if self._ivf_centroids is not None:
+                self._ivf_assignments = np.concatenate([
+                    self._ivf_assignments, np.argmax(vectors @ self._ivf_centroids.T, axis=1).astype(np.int32)
+                ])
+            # Published last, so concurrent searches only see complete rows.
+            self.count = end
+            return uuids
+
+    def delete(self, uuids: List[str]) -> Optional[int]:
+        """Zero the vectors of rows and hide them from searches.
+
+        Args:
+            uuids: The UUIDs of the rows to delete.
+
+        Returns:
+            The number of rows deleted, or None if the index was closed and nothing was deleted.
+        """
+        wanted: Set[str] = set(uuids)
+        with self._write_lock:
+            if self.closed:
+                return None
+            rows: List[int] = [
+                row for row, uuid in enumerate(self.uuids[:self.count])
+                if uuid in wanted and row not in self._deleted
+            ]
+            if not rows:
+                return 0
+            self._matrix[rows] = 0.0
+            self._matrix.flush()
+            with open(self._deleted_path, "a", encoding="utf-8") as handle:
+                handle.writelines(self.uuids[row] + "\n" for row in rows)
+            # Replaced rather than updated, so concurrent searches iterate a stable set.
+            self._deleted = self._deleted | set(rows)
+            return len(rows)
+
+    def _train_ivf(self, rows: int) -> None:
+        """Cluster the first rows vectors with spherical k-means and assign every row to a list."""
+        matrix: np.ndarray = self._matrix
+        lists: int = max(16, int(math.sqrt(rows)))
+        rng: np.random.Generator = np.random.default_rng(0)
+        sample: np.ndarray = np.asarray(matrix[np.sort(rng.choice(rows, min(rows, lists * 64), replace=False))])
+        centroids: np.ndarray = sample[rng.choice(len(sample), lists, replace=False)].copy()
+        for _ in range(10):
+            labels: np.ndarray = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(lists):
+                members: np.ndarray = sample[labels == cluster]
+                if len(members):
+                    centroids[cluster] = members.sum(axis=0)
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+
+        assignments: np.ndarray = np.concatenate([
+            np.argmax(np.asarray(matrix[block:min(block + 65536, rows)]) @ centroids.T, axis=1)
+            for block in range(0, rows, 65536)
+        ]).astype(np.int32)
+        with self._write_lock:
+            # Rows appended while training are assigned against the new centroids.
+            if self.count > rows:
+                tail: np.ndarray = np.asarray(matrix[rows:self.count])
+                assignments = np.concatenate([assignments, np.argmax(tail @ centroids.T, axis=1).astype(np.int32)])
+            self._ivf_assignments = assignments
+            self._ivf_centroids = centroids
+            self._ivf_trained_rows = len(assignments)
+
+    def vector_search(self, query: np.ndarray, limit: int) -> List[Tuple[int, float]]:
+        """Find the rows closest to the query by cosine similarity.
+
+        Small stores are scanned exactly; from ivf_min_rows rows on, only the
+        nprobe IVF lists nearest to the query are scanned. The IVF index is
+        retrained whenever the store has doubled since the last training.
+
+        Args:
+            query: The unit-length query vector.
+            limit: Maximum number of results.
+
+        Returns:
+            (row, similarity) pairs, best first.
+        """
+        rows: int = self.count
+        if rows == 0:
+            return []
+        matrix: np.ndarray = self._matrix
+
+        if rows < self.ivf_min_rows:
+            candidates: np.ndarray = np.arange(rows)
+            scores: np.ndarray = matrix[:rows] @ query
+        else:
+            if self._ivf_centroids is None or rows > 2 * self._ivf_trained_rows:
+                with self._train_lock:
+                    if self._ivf_centroids is None or rows > 2 * self._ivf_trained_rows:
+                        self._train_ivf(rows)
+            centroids: np.ndarray = self._ivf_centroids
+            probes: np.ndarray = np.argsort(-(centroids @ query))[:self.nprobe]
+            candidates = np.flatnonzero(np.isin(self._ivf_assignments[:rows], probes))
+            scores = matrix[candidates] @ query
+        deleted: Set[int] = self._deleted
+        if deleted:
+            live: np.ndarray = ~np.isin(candidates, list(deleted))
+            candidates, scores = candidates[live], scores[live]
+
+        top: np.ndarray = np.argpartition(-scores, limit)[:limit] if len(scores) > limit else np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return [(int(candidates[index]), float(scores[index])) for index in top]
+
+    def keyword_search(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        """Rank rows by BM25 against the query terms.
+
+        Args:
+            query: The query text.
+            limit: Maximum number of results.
+
+        Returns:
+            (row, score) pairs, best first.
+        """
+        rows: int = self.count
+        scores: Dict[int, float] = defaultdict(float)
+        with self._keyword_lock:
+            if not rows:
+                return []
+            average_length: float = self._total_length / len(self._lengths)
+            for token in set(tokenize(query)):
+                postings: Dict[int, int] = self._postings.get(token, {})
+                if not postings:
+                    continue
+                idf: float = math.log(1 + (len(self._lengths) - len(postings) + 0.5) / (len(postings) + 0.5))
+                for row, frequency in postings.items():
+                    if row >= rows or row in self._deleted:
+                        continue
+                    length_norm: float = 1.2 * (0.25 + 0.75 * self._lengths[row] / average_length)
+                    scores[row] += idf * frequency * 2.2 / (frequency + length_norm)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def close(self) -> None:
+        """Flush the vector file and refuse further writes.
+
+        The file is unmapped once searches still holding the index finish.
+        """
+        with self._write_lock:
+            self.closed = True
+            if self._matrix is not None:
+                self._matrix.flush()
+
+
+def _normalise(hits: List[Tuple[int, float]]) -> Dict[int, float]:
+    """Scale scores to [0, 1] by the min and max of the result list."""
+    if not hits:
+        return {}
+    scores: List[float] = [score for _, score in hits]
+    low, high = min(scores), max(scores)
+    return {row: (score - low) / (high - low) if high > low else 1.0 for row, score in hits}
+
+
+class EmbeddedBackend(VectorBackend):
+    """An in-process vector store: NumPy vectors memory-mapped from disk, one directory per tenant.
+
+    Queries fuse exact or IVF vector search with BM25 keyword search the way
+    Weaviate's relative score fusion does, so single-node deployments and
+    tests need neither Weaviate nor the CLIP container.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        embedder: Optional[HashingEmbedder] = None,
+        ivf_min_rows: Optional[int] = None,
+        nprobe: Optional[int] = None,
+    ) -> None:
+        """Initialize the embedded store.
+
+        Args:
+            directory: Root directory of the store; defaults to EMBEDDED_VECTOR_DIR or ./vector_store.
+            embedder: The text embedder; defaults to a HashingEmbedder of EMBEDDED_DIMENSIONS (512).
+            ivf_min_rows: Rows per tenant from which IVF search is used; defaults to EMBEDDED_IVF_MIN_ROWS (50000).
+            nprobe: IVF lists scanned per query; defaults to EMBEDDED_IVF_NPROBE (16).
+        """
+        self.directory: str = directory or os.getenv("EMBEDDED_VECTOR_DIR", "./vector_store")
+        self.embedder: HashingEmbedder = embedder or HashingEmbedder(int(os.getenv("EMBEDDED_DIMENSIONS", "512")))
+        self.ivf_min_rows: int = ivf_min_rows or int(os.getenv("EMBEDDED_IVF_MIN_ROWS", "50000"))
+        self.nprobe: int = nprobe or int(os.getenv("EMBEDDED_IVF_NPROBE", "16"))
+        self._tenants: Dict[str, _TenantIndex] = {}
+        self._tenants_lock: threading.Lock = threading.Lock()
+
+    def _tenant(self, tenant_id: str, create: bool) -> Optional[_TenantIndex]:
+        """Return the tenant's open index, loading it from disk or creating it as needed.
+
+        The index may be closed by deactivate_tenant at any time after it is
+        returned; callers check its closed flag and resolve the tenant again.
+        """
+        index: Optional[_TenantIndex] = self._tenants.get(tenant_id)
+        if index is not None:
+            return index
+        path: str = os.path.join(self.directory, tenant_id)
+        if not create and not os.path.isdir(path):
+            return None
+        with self._tenants_lock:
+            if tenant_id not in self._tenants:
+                self._tenants[tenant_id] = _TenantIndex(path, self.embedder.dimensions, self.ivf_min_rows, self.nprobe)
+            return self._tenants[tenant_id]
+
+    def import_data(self, data_rows: List[TextChunk], tenant_id: str = DEFAULT_TENANT) -> List[ContentUUID]:
+        """Embed and store chunks for a tenant.
+
+        Args:
+            data_rows: A list of TextChunk dictionaries to be imported.
+            tenant_id: The tenant that owns the data.
+
+        Returns:
+            A list of ContentUUID dictionaries containing content and UUID pairs.
+        """
+        if not data_rows:
+            return []
+        texts: List[str] = [row['text_content'] for row in data_rows]
+        vectors: np.ndarray = self.embedder.embed(texts)
+        uuids: Optional[List[str]] = None
+        while uuids is None:
+            uuids = self._tenant(tenant_id, create=True).add(vectors, texts)
+        return [ContentUUID(content=text, uuid=uuid) for text, uuid in zip(texts, uuids)]
+
+    def delete_data(self, uuids: List[str], tenant_id: str = DEFAULT_TENANT) -> str:
+        """Delete chunks from a tenant's store.
+
+        Args:
+            uuids: The UUIDs of the chunks to delete.
+            tenant_id: The tenant that owns the chunks.
+
+        Returns:
+            Success or error message.
+        """
+        deleted: Optional[int] = None
+        while deleted is None:
+            index: Optional[_TenantIndex] = self._tenant(tenant_id, create=False)
+            if index is None:
+                return f"Error: tenant '{tenant_id}' does not exist."
+            deleted = index.delete(uuids)
+        return f"Deleted {deleted} chunks."
+
+    def _search(self, tenant_id: str, search: Callable[[_TenantIndex], List[str]]) -> List[str]:
+        """Run a search on the tenant's index, again on a reloaded one if it was closed meanwhile.
+
+        Args:
+            tenant_id: The tenant whose chunks are searched.
+            search: Searches one index and returns UUIDs.
+
+        Returns:
+            The search's result; empty if the tenant has no data.
+        """
+        while True:
+            index: Optional[_TenantIndex] = self._tenant(tenant_id, create=False)
+            if index is None:
+                return []
+            uuids: List[str] = search(index)
+            if not index.closed:
+                return uuids
+
+    def hybrid_search(self, user_query: str, limit: int = 10, tenant_id: str = DEFAULT_TENANT) -> List[str]:
+        """Fuse vector and BM25 results with relative score fusion.
+
+        Args:
+            user_query: The query to search for.
+            limit: Maximum number of results.
+            tenant_id: The tenant whose chunks are searched.
+
+        Returns:
+            The UUIDs of the matching chunks, best first; empty if the tenant has no data.
+        """
+        candidates: int = max(limit * 5, 50)
+        query: np.ndarray = self.embedder.embed([user_query])[0]
+
+        def search(index: _TenantIndex) -> List[str]:
+            vector_hits: Dict[int, float] = _normalise(index.vector_search(query, candidates))
+            keyword_hits: Dict[int, float] = _normalise(index.keyword_search(user_query, candidates))
+
+            fused: Dict[int, float] = defaultdict(float)
+            for row, score in vector_hits.items():
+                fused[row] += HYBRID_ALPHA * score
+            for row, score in keyword_hits.items():
+                fused[row] += (1 - HYBRID_ALPHA) * score
+            best: List[int] = sorted(fused, key=fused.get, reverse=True)[:limit]
+            return [index.uuids[row] for row in best]
+
+        return self._search(tenant_id, search)
+
+    def vector_search(self, user_query: str, limit: int = 10, tenant_id: str = DEFAULT_TENANT) -> List[str]:
+        """Find the chunks whose hashed vectors are nearest to the query's.
+
+        Args:
+            user_query: The query to search for.
+            limit: Maximum number of results.
+            tenant_id: The tenant whose chunks are searched.
+
+        Returns:
+            The UUIDs of the matching chunks, best first; empty if the tenant has no data.
+        """
+        query: np.ndarray = self.embedder.embed([user_query])[0]
+        return self._search(
+            tenant_id, lambda index: [index.uuids[row] for row, _ in index.vector_search(query, limit)]
+        )
+
+    def deactivate_tenant(self, tenant_id: str, offload: bool = False) -> str:
+        """Unmap a tenant's vectors and drop its keyword index; it is reloaded from disk on next use.
+
+        Args:
+            tenant_id: The tenant to deactivate.
+            offload: Not supported by the embedded store.
+
+        Returns:
+            Success or error message.
+        """
+        if offload:
+            return "Error: the embedded vector store cannot offload tenants."
+        if not os.path.isdir(os.path.join(self.directory, tenant_id)):
+            return f"Error: tenant '{tenant_id}' does not exist."
+        # Closed under the tenants lock, so the tenant is not reloaded from
+        # disk before a write still in progress on this index has finished.
+        with self._tenants_lock:
+            index: Optional[_TenantIndex] = self._tenants.pop(tenant_id, None)
+            if index is not None:
+                index.close()
+        return f"Tenant '{tenant_id}' was deactivated."
+
+    def activate_tenant(self, tenant_id: str) -> str:
+        """Map a tenant's vectors and rebuild its keyword index now rather than on next use.
+
+        Args:
+            tenant_id: The tenant to activate.
+
+        Returns:
+            Success or error message.
+        """
+        if self._tenant(tenant_id, create=False) is None:
+            return f"Error: tenant '{tenant_id}' does not exist."
+        return f"Tenant '{tenant_id}' is active."
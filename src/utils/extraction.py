@@ -0,0 +1,199 @@
+import io
+import os
+from typing import Iterable, Iterator, List, Literal, Set, Union
+
+from pypdf import PdfReader
+from docx import Document
+from docx.section import _Footer, _Header
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+from .chunking import TextProcessor
+from type_definitions import ChunkedDocument, ChunkSpan, DocumentSegments, ExtractedDocument
+
+SUPPORTED_EXTENSIONS: tuple = (".txt", ".pdf", ".docx")
+
+
+def _txt_segments(content: bytes) -> DocumentSegments:
+    """Decode a .txt file as a single segment.
+
+    Args:
+        content: The file content as bytes.
+
+    Returns:
+        The decoded text as one segment.
+
+    Raises:
+        ValueError: If the file cannot be decoded.
+    """
+    try:
+        text: str = content.decode("utf-8")
+    except UnicodeDecodeError:
+        raise ValueError("Could not decode .txt file. Ensure it is UTF-8 encoded.")
+    return DocumentSegments(segments=iter([text]), pages=0)
+
+def _pdf_segments(content: bytes) -> DocumentSegments:
+    """Open a .pdf file and stream its text one page at a time.
+
+    Args:
+        content: The file content as bytes.
+
+    Returns:
+        The lazily extracted page texts and the number of pages.
+    """
+    pdf_reader: PdfReader = PdfReader(io.BytesIO(content))
+    segments: Iterator[str] = (page.extract_text() or "" for page in pdf_reader.pages)
+    return DocumentSegments(segments=segments, pages=len(pdf_reader.pages))
+
+def _docx_block_segments(block: Union[Paragraph, Table]) -> Iterator[str]:
+    """Yield the text of a paragraph or table, one line per paragraph or table row.
+
+    Cells in a row are separated by " | "; a merged cell is emitted once and
+    nested tables are expanded in place.
+
+    Args:
+        block: A paragraph or table from a document body, header, footer or cell.
+
+    Yields:
+        Text segments, each ending with a newline.
+    """
+    if isinstance(block, Paragraph):
+        yield block.text + "\n"
+        return
+    for row in block.rows:
+        cells: List[str] = []
+        seen: Set[int] = set()
+        for cell in row.cells:
+            if id(cell._tc) in seen:
+                continue
+            seen.add(id(cell._tc))
+            lines: Iterator[str] = (
+                segment.strip() for inner in cell.iter_inner_content() for segment in _docx_block_segments(inner)
+            )
+            cells.append(" ".join(line for line in lines if line))
+        yield " | ".join(cells) + "\n"
+
+def _docx_part_segments(parts: Iterable[Union[_Header, _Footer]], seen: Set[str]) -> Iterator[str]:
+    """Yield the text of headers or footers, skipping ones already emitted.
+
+    Args:
+        parts: Headers or footers of the document sections.
+        seen: Texts already emitted, shared across sections.
+
+    Yields:
+        Text segments, each ending with a newline.
+    """
+    for part in parts:
+        if part.is_linked_to_previous:
+            continue
+        text: str = "".join(
+            segment for block in part.iter_inner_content() for segment in _docx_block_segments(block)
+        )
+        if text.strip() and text not in seen:
+            seen.add(text)
+            yield text
+
+def _docx_segments(content: bytes) -> DocumentSegments:
+    """Open a .docx file and stream its text in document order.
+
+    Headers come first, then body paragraphs and tables as they appear, then
+    footers.
+
+    Args:
+        content: The file content as bytes.
+
+    Returns:
+        The lazily extracted text segments.
+    """
+    doc: Document = Document(io.BytesIO(content))
+
+    def segments() -> Iterator[str]:
+        seen: Set[str] = set()
+        yield from _docx_part_segments(
+            (header for section in doc.sections
+             for header in (section.first_page_header, section.header, section.even_page_header)),
+            seen,
+        )
+        for block in doc.iter_inner_content():
+            yield from _docx_block_segments(block)
+        yield from _docx_part_segments(
+            (footer for section in doc.sections
+             for footer in (section.first_page_footer, section.footer, section.even_page_footer)),
+            seen,
+        )
+
+    return DocumentSegments(segments=segments(), pages=0)
+
+def extract_segments(filename: str, content: bytes) -> DocumentSegments:
+    """Open a supported document and stream its text as segments.
+
+    The file is parsed eagerly, so unreadable files fail here; the text of
+    each page, paragraph or table row is produced as the segments are consumed.
+
+    Args:
+        filename: The document name, used to pick the extractor.
+        content: The file content as bytes.
+
+    Returns:
+        The text segments in document order and the page count.
+
+    Raises:
+        ValueError: If the file type is unsupported or the file cannot be read.
+    """
+    file_extension: str = os.path.splitext(filename)[1].lower()
+    if file_extension == ".txt":
+        return _txt_segments(content)
+    elif file_extension == ".pdf":
+        return _pdf_segments(content)
+    elif file_extension == ".docx":
+        return _docx_segments(content)
+    raise ValueError(
+        f"Unsupported file type: {file_extension}. Please upload a .pdf, .txt, or .docx file."
+    )
+
+def extract_text(filename: str, content: bytes) -> ExtractedDocument:
+    """Extract the full text from a supported document.
+
+    Args:
+        filename: The document name, used to pick the extractor.
+        content: The file content as bytes.
+
+    Returns:
+        The extracted text content and page count.
+
+    Raises:
+        ValueError: If the file type is unsupported or the file cannot be read.
+    """
+    document: DocumentSegments = extract_segments(filename, content)
+    return ExtractedDocument(text="".join(document["segments"]), pages=document["pages"])
+
+def extract_and_chunk(
+    filename: str,
+    content: bytes,
+    strategy: Literal["char", "sentence"],
+    chunk_size: int = 100,
+    overlap: int = 50,
+) -> ChunkedDocument:
+    """Extract and chunk one document; safe to run in a worker process.
+
+    Errors are returned rather than raised so one bad file does not abort a
+    bulk ingestion.
+
+    Args:
+        filename: The document name.
+        content: The file content as bytes.
+        strategy: The chunking strategy ("char" or "sentence").
+        chunk_size: The maximum size of a chunk for character-based strategy.
+        overlap: The number of characters to overlap between chunks.
+
+    Returns:
+        The document's chunk spans and page count, or the error message.
+    """
+    try:
+        document: DocumentSegments = extract_segments(filename, content)
+        spans: List[ChunkSpan] = list(TextProcessor().chunk_stream(
+            document["segments"], strategy=strategy, chunk_size=chunk_size, overlap=overlap
+        ))
+        return ChunkedDocument(filename=filename, spans=spans, pages=document["pages"], error=None)
+    except Exception as e:
+        return ChunkedDocument(filename=filename, spans=[], pages=0, error=str(e))
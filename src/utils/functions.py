@@ -1,21 +1,47 @@
-import os
 import json
 import inspect
 import datetime
-from typing import Callable, Any, Dict, List
-
-from dotenv import load_dotenv
-import google.generativeai as genai
+from typing import Callable, Any, Dict, List, Optional, Tuple
 
+from models import DEFAULT_TENANT
 from .store_metadata import MetaData
 from .retrieve_data import SqlData
+from .context_compression import ContextCompressor
+from .metrics import CONTEXT_TOKENS, track_stage
+from .llm_gateway import LlmGateway, LlmGatewayError, get_gateway
 from type_definitions import (
+    CompressedContext,
+    ContextPassage,
     FunctionResponse, 
     SchedulesResponse, 
     TimeResponse, 
     InterviewScheduleEntry
 )
 
+MAX_SCHEDULES_PER_CALL: int = 100
+
+PARAMETER_TYPES: Dict[Any, str] = {
+    int: "INTEGER",
+    float: "NUMBER",
+    bool: "BOOLEAN",
+}
+
+# Parameters filled in by the server from the request, never by the model.
+HIDDEN_PARAMETERS: Tuple[str, ...] = ("tenant_id",)
+
+PARAMETER_DESCRIPTIONS: Dict[str, Dict[str, str]] = {
+    "retrieve_database_info": {
+        "user_query": "The user's question or query that needs to be answered using database information.",
+    },
+    "get_past_schedules": {
+        "start_date": "Only include interviews on or after this date (YYYY-MM-DD). Leave empty for no lower bound.",
+        "end_date": "Only include interviews on or before this date (YYYY-MM-DD). Leave empty for no upper bound.",
+        "candidate": "Only include interviews for this candidate name or email. Leave empty for all candidates.",
+        "limit": f"Maximum number of schedules to return (at most {MAX_SCHEDULES_PER_CALL}).",
+        "offset": "Number of schedules to skip when paging through results.",
+    },
+}
+
 class GetFunctions:
     """Provides function tools for the Gemini chat model."""
     
@@ -23,15 +49,8 @@ class GetFunctions:
         """Initialize the function tools with database connections."""
         self._new_interview: MetaData = MetaData()
         self._get_data: SqlData = SqlData()
-
-        load_dotenv()
-
-        self._gemini_key = os.getenv('GEMINI_API_KEY')
-        genai.configure(api_key=self._gemini_key)
-
-        self._model: genai.GenerativeModel = genai.GenerativeModel(
-            model_name='gemini-2.5-flash',
-        )
+        self._compressor: ContextCompressor = ContextCompressor()
+        self._gateway: LlmGateway = get_gateway()
 
     def book_interview(self, name: str, email: str, date: str, time: str) -> FunctionResponse:
         """Book an interview with the provided details.
@@ -43,48 +62,70 @@ class GetFunctions:
             time: The time of the interview (e.g., "HH:MM").
             
         Returns:
-            A dictionary with status and message.
+            A dictionary with status ("success", "conflict" or "error") and message.
         """
-        response: str = self._new_interview.add_interview(
+        return self._new_interview.add_interview(
             name=name, email=email, date=date, time=time
         )
-        return FunctionResponse(
-            status="success", 
-            message=f"Interview for {name} has been booked for {date} at {time}."
-        )
 
-    def get_past_schedules(self) -> SchedulesResponse:
-        """Retrieve and return a list of past interview schedules.
+    def get_past_schedules(
+        self,
+        start_date: str = "",
+        end_date: str = "",
+        candidate: str = "",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> SchedulesResponse:
+        """Retrieve interview schedules, most recent first, optionally filtered by date range or candidate.
         
+        Args:
+            start_date: Earliest interview date to include ("YYYY-MM-DD").
+            end_date: Latest interview date to include ("YYYY-MM-DD").
+            candidate: Candidate name or email to filter by.
+            limit: Maximum number of schedules to return.
+            offset: Number of schedules to skip, for paging through results.
+
         Returns:
-            A dictionary with status and list of schedules.
+            A dictionary with status ("success" or "error"), list of schedules, whether more
+            results exist, and a message explaining an error.
         """
-        past_interviews = self._get_data.get_interview_data()
+        try:
+            start: Optional[datetime.date] = datetime.date.fromisoformat(start_date) if start_date else None
+            end: Optional[datetime.date] = datetime.date.fromisoformat(end_date) if end_date else None
+        except ValueError:
+            return SchedulesResponse(
+                status="error", schedules=[], has_more=False, message="Dates must use the YYYY-MM-DD format."
+            )
 
-        serializable_interviews: List[InterviewScheduleEntry] = []
-        for interview in past_interviews:
-            interview_dict: Dict[str, Any] = {}
-            
-            for column in interview.__table__.columns:
-                value = getattr(interview, column.name)
-                if isinstance(value, datetime.datetime):
-                    value = value.strftime("%Y-%m-%d %H:%M:%S")
-                elif isinstance(value, datetime.date):
-                    value = value.strftime("%Y-%m-%d")
-                elif isinstance(value, datetime.time):
-                    value = value.strftime("%H:%M:%S")
-                interview_dict[column.name] = value
-            
-            schedule_entry = InterviewScheduleEntry(
-                id=interview_dict["id"],
-                candidate_name=interview_dict["candidate_name"],
-                candidate_email=interview_dict["candidate_email"],
-                interview_date=interview_dict["interview_date"],
-                interview_time=interview_dict["interview_time"]
+        try:
+            page_size: int = max(1, min(int(limit), MAX_SCHEDULES_PER_CALL))
+            skip: int = max(0, int(offset))
+        except (TypeError, ValueError):
+            return SchedulesResponse(
+                status="error", schedules=[], has_more=False, message="limit and offset must be whole numbers."
             )
-            serializable_interviews.append(schedule_entry)
 
-        return SchedulesResponse(status="success", schedules=serializable_interviews)
+        rows = self._get_data.get_interview_data(
+            start_date=start,
+            end_date=end,
+            candidate=candidate or None,
+            limit=page_size + 1,
+            offset=skip,
+        )
+
+        schedules: List[InterviewScheduleEntry] = [
+            InterviewScheduleEntry(
+                id=row.id,
+                candidate_name=row.candidate_name,
+                candidate_email=row.candidate_email,
+                interview_date=row.interview_date.isoformat(),
+                interview_time=row.interview_time.strftime("%H:%M"),
+            )
+            for row in rows[:page_size]
+        ]
+        return SchedulesResponse(
+            status="success", schedules=schedules, has_more=len(rows) > page_size, message=None
+        )
     
     def get_current_time(self) -> TimeResponse:
         """Return the current date and time.
@@ -95,22 +136,35 @@ class GetFunctions:
         current_time: str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         return TimeResponse(current_time=current_time)
     
-    def retrieve_database_info(self, user_query: str) -> Dict:
+    def retrieve_database_info(self, user_query: str, tenant_id: str = DEFAULT_TENANT) -> Dict:
         """Retrieve relevant information from the database to answer user questions.
 
         Args:
             user_query: The user's specific query string that needs to be answered 
                        using database information.
+            tenant_id: The tenant whose documents are searched; supplied by the
+                       server, not the model.
                        
         Returns:
-            A dictionary with status and retrieved data.
+            A dictionary with status, the answer and the sources it was drawn from.
         """
-        chat = self._model.start_chat()
-        
-        context: str = self._get_data.all_context(query=user_query)
-        prompt = f'based on the user query {user_query} and the context {context} give the answer.'
-        response = chat.send_message(prompt)
-        return {'status':"success", 'data':response.text}
+        passages: List[ContextPassage] = self._get_data.context_passages(
+            query=user_query, neighbours=1, tenant_id=tenant_id
+        )
+        with track_stage("context_compression"):
+            context: CompressedContext = self._compressor.compress(user_query, passages)
+        CONTEXT_TOKENS.labels("retrieved").observe(context['original_tokens'])
+        CONTEXT_TOKENS.labels("prompt").observe(context['tokens'])
+
+        prompt = (
+            f'based on the user query {user_query} and the context below give the answer, '
+            f'citing the sources you use by their [n] numbers.\n\n{context["text"]}'
+        )
+        try:
+            answer: str = self._gateway.generate(prompt, call_name="retrieve_database_info")
+        except LlmGatewayError as e:
+            return {'status': "error", 'data': f"The answer could not be generated: {e}"}
+        return {'status':"success", 'data':answer, 'sources':context['sources']}
 
     def get_function_declaration(self, func: Callable[..., Any]) -> Dict[str, Any]:
         """Create a function declaration for the Gemini API from a Python function.
@@ -129,11 +183,12 @@ class GetFunctions:
         }
         
         for name, param in signature.parameters.items():
-            param_type: str = "STRING"
-            description: str = f"The {name} for the interview."
-            
-            if func.__name__ == "retrieve_database_info" and name == "user_query":
-                description = "The user's question or query that needs to be answered using database information."
+            if name in HIDDEN_PARAMETERS:
+                continue
+            param_type: str = PARAMETER_TYPES.get(param.annotation, "STRING")
+            description: str = PARAMETER_DESCRIPTIONS.get(func.__name__, {}).get(
+                name, f"The {name} for the interview."
+            )
             
             params["properties"][name] = {
                 "type": param_type, 
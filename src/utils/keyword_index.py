@@ -0,0 +1,163 @@
+import re
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+
+from models import engine, sql_models, DEFAULT_TENANT
+from .text_store import SourceTextStore
+
+FTS_TABLE: str = "TextChunkFts"
+
+TERM_PATTERN = re.compile(r"\w+")
+
+# Chunks read per batch while backfilling.
+BACKFILL_BATCH: int = 5000
+
+# Dropped from queries so that a question's content words decide the match.
+STOPWORDS = frozenset("""
+    a about an and are as at be but by can could did do does for from had has have how i in is it its
+    me my of on or our should that the their them there these they this to was we were what when where
+    which who whom why will with would you your
+""".split())
+
+_ensured: bool = False
+_ensure_lock: threading.Lock = threading.Lock()
+
+
+def match_expression(query: str) -> Tuple[Optional[str], Optional[str]]:
+    """Turn free text into FTS5 expressions that match all, or any, of its terms.
+
+    Each whitespace-separated word becomes a quoted phrase of its parts, so an
+    identifier such as "P-003-001009" must match in order, and FTS5 operators
+    in the query are treated as text. Stopwords are dropped unless the query
+    has nothing else.
+
+    Args:
+        query: The user's query.
+
+    Returns:
+        (all_terms, any_term) expressions, or (None, None) if the query has no terms.
+    """
+    phrases: List[str] = []
+    for word in query.split():
+        parts: List[str] = TERM_PATTERN.findall(word.lower())
+        if parts:
+            phrase: str = '"' + " ".join(parts) + '"'
+            if phrase not in phrases:
+                phrases.append(phrase)
+
+    content: List[str] = [phrase for phrase in phrases if phrase.strip('"') not in STOPWORDS] or phrases
+    if not content:
+        return None, None
+    return " AND ".join(content), " OR ".join(content)
+
+
+class KeywordIndex:
+    """A contentless SQLite FTS5 index over chunk text, ranked with BM25.
+
+    The index stores only tokens; its rowid is the TextChunk id, so matches
+    are joined back to TextChunk for the tenant and the chunk id. The tenant
+    is not indexed as a token: bm25() counts the rows matching every term of
+    the expression, and a term present in all of a tenant's rows would make
+    each query scan the whole tenant.
+    """
+
+    def __init__(self, bind: Engine = engine) -> None:
+        """Initialize the index.
+
+        Args:
+            bind: The engine of the metadata database.
+        """
+        self.bind: Engine = bind
+
+    def ensure(self) -> int:
+        """Create the FTS5 table if needed and index any chunks it is missing.
+
+        Chunks stored before the index existed are backfilled on first run;
+        later runs only index rows added since the last indexed id. Chunk
+        text stored as offset ranges is read from the source text blocks.
+
+        Returns:
+            The number of chunks backfilled.
+        """
+        text_store: SourceTextStore = SourceTextStore()
+        backfilled: int = 0
+        with Session(self.bind) as db, db.begin():
+            db.execute(text(f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(textChunk, content='')"))
+            last_id: int = db.execute(text(f"SELECT max(rowid) FROM {FTS_TABLE}")).scalar() or 0
+            while True:
+                chunks: List[sql_models.DataChunks] = db.query(sql_models.DataChunks).filter(
+                    sql_models.DataChunks.id > last_id
+                ).order_by(sql_models.DataChunks.id).limit(BACKFILL_BATCH).all()
+                if not chunks:
+                    return backfilled
+                self.add(db, list(zip((chunk.id for chunk in chunks), text_store.texts(db, chunks))))
+                backfilled += len(chunks)
+                last_id = chunks[-1].id
+                db.expunge_all()
+
+    def add(self, db: Session, rows: Sequence[Tuple[int, str]]) -> None:
+        """Index chunks in the caller's transaction, so they commit together.
+
+        Args:
+            db: The session that inserted the chunks.
+            rows: (TextChunk id, chunk text) for each chunk.
+        """
+        if not rows:
+            return
+        db.execute(
+            text(f"INSERT INTO {FTS_TABLE}(rowid, textChunk) VALUES (:id, :text)"),
+            [{"id": row_id, "text": chunk} for row_id, chunk in rows],
+        )
+
+    def _ranked(self, db: Session, expression: str, tenant_id: str, limit: int) -> List[str]:
+        """Run one MATCH expression and return chunk ids, best BM25 score first."""
+        return list(db.execute(
+            text(
+                f"SELECT c.chunkID FROM {FTS_TABLE} JOIN TextChunk c ON c.id = {FTS_TABLE}.rowid "
+                f"WHERE {FTS_TABLE} MATCH :expression AND c.tenantId = :tenant_id "
+                f"ORDER BY bm25({FTS_TABLE}) LIMIT :limit"
+            ),
+            {"expression": expression, "limit": limit, "tenant_id": tenant_id},
+        ).scalars())
+
+    def search(self, db: Session, query: str, limit: int = 10, tenant_id: str = DEFAULT_TENANT) -> List[str]:
+        """Find the tenant's chunks that best match the query's terms.
+
+        Chunks containing every term are searched first, which is fast for
+        the rare terms of names and numbers. Only if none match are chunks
+        containing any term searched: that query reads the postings of every
+        term, so it is not run just to fill the remaining places.
+
+        Args:
+            db: The session to query with.
+            query: The user's query.
+            limit: Maximum number of results.
+            tenant_id: The tenant whose chunks are searched.
+
+        Returns:
+            The chunk ids of the matches, best first.
+        """
+        all_terms, any_term = match_expression(query)
+        if all_terms is None:
+            return []
+
+        chunk_ids: List[str] = self._ranked(db, all_terms, tenant_id, limit)
+        if not chunk_ids and any_term != all_terms:
+            chunk_ids = self._ranked(db, any_term, tenant_id, limit)
+        return chunk_ids
+
+
+def ensure_keyword_index(bind: Engine = engine) -> None:
+    """Create and backfill the keyword index once per process.
+
+    Args:
+        bind: The engine of the metadata database.
+    """
+    global _ensured
+    with _ensure_lock:
+        if not _ensured:
+            KeywordIndex(bind).ensure()
+            _ensured = True
@@ -0,0 +1,315 @@
+import os
+import time
+import random
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+from .metrics import LLM_CALL_LATENCY, LLM_COALESCED, LLM_IN_FLIGHT, LLM_RETRIES
+from .tracing import span
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Provider errors that are worth retrying: quota, overload and transient server failures.
+RETRYABLE_ERRORS: Tuple[type, ...] = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.DeadlineExceeded,
+)
+
+
+class LlmGatewayError(Exception):
+    """Raised when a Gemini call fails after retries or runs out of time."""
+
+
+class TokenBucket:
+    """A thread-safe token bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum number of tokens, i.e. the allowed burst.
+
+        Raises:
+            ValueError: If rate is not positive or capacity is below 1.
+        """
+        if rate <= 0:
+            raise ValueError(f"The request rate must be greater than 0, got {rate}.")
+        if capacity < 1:
+            raise ValueError(f"The burst must be at least 1, got {capacity}.")
+        self.rate: float = rate
+        self.capacity: float = float(capacity)
+        self._tokens: float = float(capacity)
+        self._updated: float = time.monotonic()
+        self._lock: threading.Lock = threading.Lock()
+
+    def acquire(self, deadline: float) -> bool:
+        """Take one token, waiting for it until the deadline.
+
+        Args:
+            deadline: A time.monotonic() value after which to give up.
+
+        Returns:
+            True if a token was taken, False if the deadline passed first.
+        """
+        while True:
+            with self._lock:
+                now: float = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait: float = (1 - self._tokens) / self.rate
+
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class LlmGateway:
+    """Shared entry point for every Gemini call made by the application.
+
+    Calls are rate limited with a token bucket, capped in concurrency, retried
+    with exponential backoff on transient errors and bounded by a per-call
+    deadline. Identical stateless prompts that are in flight at the same time
+    share a single request.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "gemini-2.5-flash",
+        requests_per_second: float = 5.0,
+        burst: int = 10,
+        max_concurrency: int = 8,
+        timeout: float = 60.0,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+    ) -> None:
+        """Configure the Gemini SDK and the gateway limits.
+
+        Args:
+            model_name: The Gemini model used for every call.
+            requests_per_second: Sustained request rate allowed towards the provider.
+            burst: Number of requests that may be sent back to back.
+            max_concurrency: Maximum number of requests in flight at once.
+            timeout: Deadline in seconds for a call, including waits and retries.
+            max_retries: Number of retries after the first attempt.
+            backoff_base: Delay in seconds before the first retry.
+            backoff_max: Upper bound for a single retry delay.
+
+        Raises:
+            ValueError: If requests_per_second is not positive or burst is below 1.
+        """
+        load_dotenv()
+        configure_options: Dict[str, Any] = {"api_key": os.getenv("GEMINI_API_KEY")}
+        endpoint: Optional[str] = os.getenv("GEMINI_API_ENDPOINT")
+        if endpoint:
+            configure_options["transport"] = "rest"
+            configure_options["client_options"] = {"api_endpoint": endpoint}
+        genai.configure(**configure_options)
+
+        self.model_name: str = model_name
+        self.timeout: float = timeout
+        self.max_retries: int = max_retries
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+
+        self._bucket: TokenBucket = TokenBucket(rate=requests_per_second, capacity=burst)
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(max_concurrency)
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock: threading.Lock = threading.Lock()
+        self._plain_model: genai.GenerativeModel = self.model()
+
+    def model(self, tools: Optional[List[genai.protos.Tool]] = None) -> genai.GenerativeModel:
+        """Create a model bound to the gateway's model name.
+
+        Args:
+            tools: Tool declarations the model may call.
+
+        Returns:
+            A GenerativeModel instance.
+        """
+        return genai.GenerativeModel(model_name=self.model_name, tools=tools)
+
+    def _call(self, request: Callable[[float], Any], call_name: str, timeout: Optional[float]) -> Any:
+        """Run a provider request under the rate limit, concurrency cap, retries and deadline.
+
+        Args:
+            request: Sends the request, given the seconds left before the deadline.
+            call_name: A label used in logs.
+            timeout: Overrides the gateway deadline for this call.
+
+        Returns:
+            Whatever request returns.
+
+        Raises:
+            LlmGatewayError: If the deadline passes or every attempt fails.
+        """
+        started: float = time.monotonic()
+        outcome: str = "error"
+        try:
+            with span(f"llm.{call_name}"):
+                result: Any = self._call_with_retries(request, call_name, started + (timeout or self.timeout))
+            outcome = "success"
+            return result
+        finally:
+            LLM_CALL_LATENCY.labels(call_name, outcome).observe(time.monotonic() - started)
+
+    def _call_with_retries(self, request: Callable[[float], Any], call_name: str, deadline: float) -> Any:
+        """Send the request, retrying transient errors until it succeeds or the deadline passes.
+
+        Args:
+            request: Sends the request, given the seconds left before the deadline.
+            call_name: A label used in logs and metrics.
+            deadline: A time.monotonic() value after which to give up.
+
+        Returns:
+            Whatever request returns.
+        """
+        attempt: int = 0
+        while True:
+            if not self._bucket.acquire(deadline):
+                raise LlmGatewayError(f"{call_name}: rate limit wait exceeded the deadline")
+            if not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                raise LlmGatewayError(f"{call_name}: no free request slot before the deadline")
+
+            try:
+                remaining: float = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LlmGatewayError(f"{call_name}: deadline exceeded")
+                LLM_IN_FLIGHT.inc()
+                try:
+                    return request(remaining)
+                finally:
+                    LLM_IN_FLIGHT.dec()
+            except RETRYABLE_ERRORS as e:
+                error: Exception = e
+            except google_exceptions.GoogleAPIError as e:
+                raise LlmGatewayError(f"{call_name}: {e}") from e
+            finally:
+                self._slots.release()
+
+            delay: float = min(self.backoff_max, self.backoff_base * 2 ** attempt) * random.uniform(0.5, 1.0)
+            attempt += 1
+            if attempt > self.max_retries or time.monotonic() + delay >= deadline:
+                raise LlmGatewayError(f"{call_name}: failed after {attempt} attempt(s): {error}") from error
+            logger.warning("%s: retrying in %.2fs after %s", call_name, delay, error)
+            LLM_RETRIES.labels(call_name).inc()
+            time.sleep(delay)
+
+    def send_message(
+        self, chat: genai.ChatSession, content: Any, call_name: str = "chat", timeout: Optional[float] = None
+    ) -> genai.types.GenerateContentResponse:
+        """Send a message in a chat session through the gateway.
+
+        Args:
+            chat: The chat session; its history is only extended on success.
+            content: The message or function responses to send.
+            call_name: A label used in logs.
+            timeout: Overrides the gateway deadline for this call.
+
+        Returns:
+            The model response.
+
+        Raises:
+            LlmGatewayError: If the call fails for any reason, including a
+                blocked prompt or a response stopped by the provider.
+        """
+        try:
+            return self._call(
+                lambda remaining: chat.send_message(content, request_options={"timeout": remaining}),
+                call_name=call_name,
+                timeout=timeout,
+            )
+        except LlmGatewayError:
+            raise
+        except Exception as e:
+            # For example, the SDK's BlockedPromptException and StopCandidateException.
+            raise LlmGatewayError(f"{call_name}: {e}") from e
+
+    def generate(self, prompt: str, call_name: str = "generate", timeout: Optional[float] = None) -> str:
+        """Generate a single-turn answer, sharing the request with identical in-flight prompts.
+
+        Args:
+            prompt: The complete prompt.
+            call_name: A label used in logs.
+            timeout: Overrides the gateway deadline for this call.
+
+        Returns:
+            The response text.
+
+        Raises:
+            LlmGatewayError: If the call fails, the response has no text, or an
+                identical in-flight request does not finish before the deadline.
+        """
+        with self._in_flight_lock:
+            future: Optional[Future] = self._in_flight.get(prompt)
+            leader: bool = future is None
+            if leader:
+                future = Future()
+                self._in_flight[prompt] = future
+
+        if not leader:
+            LLM_COALESCED.inc()
+            try:
+                return future.result(timeout=timeout or self.timeout)
+            except FutureTimeoutError as e:
+                raise LlmGatewayError(f"{call_name}: an identical in-flight request did not finish in time") from e
+
+        try:
+            response = self._call(
+                lambda remaining: self._plain_model.generate_content(
+                    prompt, request_options={"timeout": remaining}
+                ),
+                call_name=call_name,
+                timeout=timeout,
+            )
+            future.set_result(response.text)
+        except LlmGatewayError as e:
+            future.set_exception(e)
+        except Exception as e:
+            # For example, response.text raises ValueError when the response was blocked.
+            error: LlmGatewayError = LlmGatewayError(f"{call_name}: {e}")
+            error.__cause__ = e
+            future.set_exception(error)
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(prompt, None)
+        return future.result()
+
+
+_gateway: Optional[LlmGateway] = None
+_gateway_lock: threading.Lock = threading.Lock()
+
+
+def get_gateway() -> LlmGateway:
+    """Return the process-wide gateway, configured from environment variables.
+
+    Returns:
+        The shared LlmGateway instance.
+    """
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            load_dotenv()
+            _gateway = LlmGateway(
+                model_name=os.getenv("GEMINI_MODEL", "gemini-2.5-flash"),
+                requests_per_second=float(os.getenv("GEMINI_REQUESTS_PER_SECOND", "5")),
+                burst=int(os.getenv("GEMINI_BURST", "10")),
+                max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")),
+                timeout=float(os.getenv("GEMINI_TIMEOUT", "60")),
+                max_retries=int(os.getenv("GEMINI_MAX_RETRIES", "4")),
+            )
+        return _gateway
@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from models import engine
+from .text_store import _block_cache
+from .tracing import span
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STAGE_LATENCY: Histogram = Histogram(
+    "rag_stage_duration_seconds",
+    "Time spent in each stage of the chat and ingestion pipelines.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+LLM_CALL_LATENCY: Histogram = Histogram(
+    "rag_llm_call_duration_seconds",
+    "Time spent in each Gemini call, including rate-limit waits and retries.",
+    ["call", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_RETRIES: Counter = Counter("rag_llm_retries_total", "Gemini requests retried after a transient error.", ["call"])
+LLM_COALESCED: Counter = Counter("rag_llm_coalesced_total", "Gemini calls served by an identical in-flight request.")
+LLM_IN_FLIGHT: Gauge = Gauge("rag_llm_requests_in_flight", "Gemini requests currently sent to the provider.")
+
+TOOL_LATENCY: Histogram = Histogram(
+    "rag_tool_duration_seconds",
+    "Time spent executing each function-calling tool.",
+    ["tool", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+CONTEXT_TOKENS: Histogram = Histogram(
+    "rag_context_tokens",
+    "Estimated tokens of retrieved context, as retrieved and as sent in the prompt after compression.",
+    ["stage"],
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384),
+)
+
+INGEST_DOCUMENTS: Counter = Counter("rag_ingest_documents_total", "Documents processed for ingestion.", ["outcome"])
+INGEST_PAGES: Counter = Counter("rag_ingest_pages_total", "PDF pages extracted.")
+INGEST_CHUNKS: Counter = Counter("rag_ingest_chunks_total", "Chunks written to the vector store and SQLite.")
+INGEST_FAILED_OBJECTS: Counter = Counter("rag_ingest_failed_objects_total", "Objects Weaviate rejected during batch import.")
+INGEST_OBJECTS_PER_SECOND: Gauge = Gauge(
+    "rag_ingest_last_objects_per_second", "Chunks per second achieved by the most recent ingestion."
+)
+
+SQL_POOL_CHECKED_OUT: Gauge = Gauge("rag_sql_pool_checked_out", "SQLAlchemy connections currently checked out.")
+SQL_POOL_CHECKED_OUT.set_function(lambda: getattr(engine.pool, "checkedout", lambda: 0)())
+
+TEXT_BLOCK_CACHE_ENTRIES: Gauge = Gauge(
+    "rag_text_block_cache_entries", "Decompressed source text blocks held in the block cache."
+)
+TEXT_BLOCK_CACHE_ENTRIES.set_function(lambda: len(_block_cache))
+
+
+@contextmanager
+def track_stage(stage: str) -> Iterator[None]:
+    """Record the duration of the enclosed block under the given stage label.
+
+    The block is also a span of the current request's trace, if it is traced.
+
+    Args:
+        stage: The pipeline stage name, e.g. "retrieval" or "history_load".
+    """
+    with STAGE_LATENCY.labels(stage).time(), span(stage):
+        yield
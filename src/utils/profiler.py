@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Dict, List, Optional
+
+from type_definitions import ProfileResult
+
+# Upper bound on the length of one profile.
+PROFILE_MAX_SECONDS: float = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+
+
+def _frame_label(frame: FrameType) -> str:
+    """Name a frame as module:function, without the characters collapsed stacks use as separators."""
+    code = frame.f_code
+    module: str = frame.f_globals.get("__name__", "?")
+    label: str = f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+    return label.replace(";", ":").replace(" ", "_")
+
+
+class SamplingProfiler:
+    """Samples the stack of every thread of the process at a fixed interval.
+
+    Sampling uses sys._current_frames(), so nothing is instrumented and the
+    process runs at full speed between samples; the cost is one stack walk
+    per thread per sample. Only one profile runs at a time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self._running: threading.Lock = threading.Lock()
+
+    def profile(self, seconds: float, interval: float = 0.005) -> ProfileResult:
+        """Sample all threads for a while and count the distinct stacks.
+
+        The result is in the collapsed stack format read by flamegraph.pl and
+        speedscope: one line per stack, root first, with the thread name as
+        the root frame, followed by its number of samples.
+
+        Args:
+            seconds: How long to sample, at most PROFILE_MAX_SECONDS.
+            interval: Seconds between samples.
+
+        Returns:
+            The number of samples taken, the seconds sampled and the collapsed stacks.
+
+        Raises:
+            ValueError: If seconds or interval is out of range.
+            RuntimeError: If another profile is running.
+        """
+        if not 0 < seconds <= PROFILE_MAX_SECONDS:
+            raise ValueError(f"seconds must be greater than 0 and at most {PROFILE_MAX_SECONDS:g}.")
+        if interval <= 0:
+            raise ValueError("interval must be greater than 0.")
+        if not self._running.acquire(blocking=False):
+            raise RuntimeError("A profile is already running.")
+
+        try:
+            own_thread: int = threading.get_ident()
+            stacks: Counter = Counter()
+            samples: int = 0
+            started: float = time.monotonic()
+            deadline: float = started + seconds
+            while time.monotonic() < deadline:
+                names: Dict[int, str] = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_thread:
+                        continue
+                    labels: List[str] = []
+                    current: Optional[FrameType] = frame
+                    while current is not None:
+                        labels.append(_frame_label(current))
+                        current = current.f_back
+                    labels.append(names.get(thread_id, f"thread-{thread_id}").replace(";", ":").replace(" ", "_"))
+                    stacks[";".join(reversed(labels))] += 1
+                samples += 1
+                time.sleep(interval)
+            elapsed: float = time.monotonic() - started
+        finally:
+            self._running.release()
+
+        return ProfileResult(
+            samples=samples,
+            seconds=round(elapsed, 3),
+            collapsed="".join(f"{stack} {count}\n" for stack, count in stacks.most_common()),
+        )
+
+
+profiler: SamplingProfiler = SamplingProfiler()
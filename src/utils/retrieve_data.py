@@ -1,88 +1,424 @@
-from typing import List, Optional
+import os
+import datetime
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import List, Optional, Dict, Any, Iterator
 
-from sqlalchemy.orm import Session
-from sqlalchemy import exc
-import weaviate
-from weaviate.client import WeaviateClient
+from sqlalchemy.orm import scoped_session
+from sqlalchemy import exc, and_, or_, Row
 
-from models import engine, SessionLocal, sql_models
+from models import engine, SessionLocal, sql_models, DEFAULT_TENANT
+from type_definitions import ContextPassage, StoredChunk
+from .metrics import track_stage
+from .keyword_index import KeywordIndex, ensure_keyword_index
+from .text_store import SourceTextStore
+from .vector_backend import VectorBackend, get_vector_backend
 
 sql_models.Base.metadata.create_all(bind=engine)
 
+# hybrid: the vector store's hybrid query; lexical: SQLite FTS5 only;
+# fusion: FTS5 and vector results merged by reciprocal rank fusion.
+RETRIEVAL_MODES = ("hybrid", "lexical", "fusion")
+
+# Rank offset of reciprocal rank fusion; 60 is the value from the original paper.
+RRF_K: int = 60
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], limit: int, k: int = RRF_K) -> List[str]:
+    """Merge ranked lists, scoring each item by the sum of 1 / (k + rank) over the lists.
+
+    Args:
+        rankings: Ranked lists of ids, best first.
+        limit: Maximum number of ids to return.
+        k: Rank offset; larger values flatten the difference between top ranks.
+
+    Returns:
+        The fused ids, best first.
+    """
+    scores: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] += 1.0 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)[:limit]
+
 
 class SqlData:
     """A class to handle database operations using SQLAlchemy."""
     
-    def __init__(self) -> None:
-        """Initialize a new database session and Weaviate client."""
-        self.db: Session = SessionLocal()
-        self.client: WeaviateClient = weaviate.connect_to_local()
-        self.collection = self.client.collections.get('interview_queries')
+    def __init__(self, backend: Optional[VectorBackend] = None, retrieval_mode: Optional[str] = None) -> None:
+        """Initialize a thread-local database session, the keyword index and the vector backend.
 
-    def get_interview_data(self) -> List[sql_models.DataInterview]:
-        """Retrieve all interview data from the database.
+        Args:
+            backend: The vector backend to search; defaults to the shared backend.
+            retrieval_mode: One of RETRIEVAL_MODES; defaults to RETRIEVAL_MODE or "hybrid".
+
+        Raises:
+            ValueError: If the retrieval mode is unknown.
+        """
+        self.retrieval_mode: str = self._check_mode(retrieval_mode or os.getenv("RETRIEVAL_MODE", "hybrid"))
+        ensure_keyword_index(engine)
+        self.db: scoped_session = scoped_session(SessionLocal)
+        self.keyword_index: KeywordIndex = KeywordIndex(engine)
+        self.text_store: SourceTextStore = SourceTextStore()
+        self._backend: Optional[VectorBackend] = backend
+
+    @property
+    def backend(self) -> VectorBackend:
+        """The vector backend, resolved on first use, so lexical retrieval never connects to it."""
+        if self._backend is None:
+            self._backend = get_vector_backend()
+        return self._backend
+
+    @contextmanager
+    def _reading(self) -> Iterator[scoped_session]:
+        """Yield the thread's session and end its transaction when the read is done.
+
+        Transactions start with an explicit BEGIN, and in WAL mode an open
+        read transaction keeps its snapshot: the long-lived session would not
+        see rows committed later, and checkpoints could not advance past it.
+        """
+        try:
+            yield self.db
+        finally:
+            self.db.rollback()
+
+    @staticmethod
+    def _check_mode(mode: str) -> str:
+        """Return the retrieval mode if it is known, otherwise raise ValueError."""
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{mode}'. Please use one of {', '.join(RETRIEVAL_MODES)}.")
+        return mode
+
+    def get_interview_data(
+        self,
+        start_date: Optional[datetime.date] = None,
+        end_date: Optional[datetime.date] = None,
+        candidate: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Row]:
+        """Retrieve a page of interview data, most recent first.
+
+        Filters are served by the (interview_date, interview_time) and
+        candidate indexes, and only the columns needed for a schedule entry
+        are loaded.
+
+        Args:
+            start_date: Earliest interview date to include.
+            end_date: Latest interview date to include.
+            candidate: Candidate name or email to match (case-insensitive).
+            limit: Maximum number of rows to return.
+            offset: Number of matching rows to skip.
+
+        Returns:
+            Rows with id, candidate_name, candidate_email, interview_date and interview_time.
+        """
+        interview = sql_models.DataInterview
+        with self._reading() as db:
+            query = db.query(
+                interview.id,
+                interview.candidate_name,
+                interview.candidate_email,
+                interview.interview_date,
+                interview.interview_time,
+            )
+            if start_date is not None:
+                query = query.filter(interview.interview_date >= start_date)
+            if end_date is not None:
+                query = query.filter(interview.interview_date <= end_date)
+            if candidate:
+                query = query.filter(or_(
+                    interview.candidate_name == candidate,
+                    interview.candidate_email == candidate,
+                ))
+
+            return query.order_by(
+                interview.interview_date.desc(), interview.interview_time.desc()
+            ).limit(limit).offset(offset).all()
+
+    def _stored_chunks(self, rows: List[sql_models.DataChunks]) -> List[StoredChunk]:
+        """Turn chunk rows into records with their text, read from the source text where needed.
+
+        Args:
+            rows: Chunks as returned by a query.
 
         Returns:
-            A list of all DataInterview objects.
+            One record per row, in order.
         """
-        return self.db.query(sql_models.DataInterview).all()
+        return [
+            StoredChunk(
+                chunk_id=row.chunkID,
+                tenant_id=row.tenantId,
+                source_id=row.sourceId,
+                text=text,
+                chunk_index=row.chunkIndex,
+                start_offset=row.startOffset,
+                end_offset=row.endOffset,
+            )
+            for row, text in zip(rows, self.text_store.texts(self.db, rows))
+        ]
 
-    def get_chunk_data(self, chunk_id: str) -> Optional[sql_models.DataChunks]:
+    def get_chunk_data(self, chunk_id: str, tenant_id: str = DEFAULT_TENANT) -> Optional[StoredChunk]:
         """Retrieve a single data chunk by its ID.
 
         Args:
             chunk_id: The ID of the data chunk to retrieve.
+            tenant_id: The tenant that owns the chunk.
 
         Returns:
-            The DataChunks object with the specified ID, or None if not found.
+            The chunk with the specified ID, or None if not found.
         """
-        return self.db.query(sql_models.DataChunks).filter(
-            sql_models.DataChunks.chunkID == chunk_id
-        ).first()
+        with self._reading() as db:
+            chunk: Optional[sql_models.DataChunks] = db.query(sql_models.DataChunks).filter(
+                sql_models.DataChunks.tenantId == tenant_id,
+                sql_models.DataChunks.chunkID == chunk_id
+            ).first()
+            if chunk is None:
+                return None
+            return self._stored_chunks([chunk])[0]
+
+    def get_chunks_data(self, chunk_ids: List[str], tenant_id: str = DEFAULT_TENANT) -> List[StoredChunk]:
+        """Retrieve the data chunks for several IDs in a single query.
+
+        Args:
+            chunk_ids: The IDs of the data chunks to retrieve.
+            tenant_id: The tenant that owns the chunks.
+
+        Returns:
+            The chunks found, in the same order as chunk_ids.
+        """
+        if not chunk_ids:
+            return []
+
+        with self._reading() as db:
+            rows: List[sql_models.DataChunks] = db.query(sql_models.DataChunks).filter(
+                sql_models.DataChunks.tenantId == tenant_id,
+                sql_models.DataChunks.chunkID.in_(chunk_ids)
+            ).all()
+            by_id: Dict[str, StoredChunk] = {chunk["chunk_id"]: chunk for chunk in self._stored_chunks(rows)}
+        return [by_id[chunk_id] for chunk_id in chunk_ids if chunk_id in by_id]
+
+    def get_neighbour_chunks(
+        self, hits: List[StoredChunk], neighbours: int
+    ) -> List[StoredChunk]:
+        """Retrieve every chunk within `neighbours` positions of the given hits.
+
+        All windows are fetched with one range query over the
+        (tenantId, sourceId, chunkIndex) index.
+
+        Args:
+            hits: The chunks returned by the search.
+            neighbours: How many chunks to include on each side of a hit.
+
+        Returns:
+            The chunks in the windows, ordered by source and position.
+        """
+        windows = [
+            and_(
+                sql_models.DataChunks.tenantId == hit["tenant_id"],
+                sql_models.DataChunks.sourceId == hit["source_id"],
+                sql_models.DataChunks.chunkIndex.between(
+                    hit["chunk_index"] - neighbours, hit["chunk_index"] + neighbours
+                ),
+            )
+            for hit in hits if hit["chunk_index"] is not None
+        ]
+        if not windows:
+            return []
+
+        with self._reading() as db:
+            rows: List[sql_models.DataChunks] = db.query(sql_models.DataChunks).filter(or_(*windows)).order_by(
+                sql_models.DataChunks.sourceId, sql_models.DataChunks.chunkIndex
+            ).all()
+            return self._stored_chunks(rows)
 
     def close(self) -> None:
-        """Close the database session."""
+        """Close the database session of the calling thread."""
         self.db.close()
 
-    def _weaviate_data(self, user_query: str) -> List[str]:
-        """Retrieve relevant UUIDs from Weaviate based on the user query.
+    def _weaviate_data(self, user_query: str, tenant_id: str = DEFAULT_TENANT) -> List[str]:
+        """Retrieve relevant UUIDs from the tenant's vectors based on the user query.
         
         Args:
             user_query: The query to search for.
+            tenant_id: The tenant whose documents are searched.
             
         Returns:
-            List of UUIDs for relevant documents.
+            List of UUIDs for relevant documents; empty if the tenant has no documents yet.
         """
-        all_responses = self.collection.query.hybrid(
-            query=user_query,
-            limit=10,
-        )
-        all_uuid: List[str] = []
-        for responses in all_responses.objects:
-            uuid_string: str = str(responses.uuid)
-            all_uuid.append(uuid_string)
+        return self.backend.hybrid_search(user_query=user_query, limit=10, tenant_id=tenant_id)
+
+    def _keyword_data(self, user_query: str, limit: int = 10, tenant_id: str = DEFAULT_TENANT) -> List[str]:
+        """Retrieve the UUIDs of the tenant's chunks that best match the query's terms in SQLite FTS5.
+
+        Args:
+            user_query: The query to search for.
+            limit: Maximum number of results.
+            tenant_id: The tenant whose documents are searched.
+
+        Returns:
+            List of UUIDs for matching chunks, best BM25 score first.
+        """
+        with self._reading() as db:
+            return self.keyword_index.search(db, user_query, limit=limit, tenant_id=tenant_id)
+
+    def _fused_data(self, user_query: str, tenant_id: str = DEFAULT_TENANT) -> List[str]:
+        """Retrieve UUIDs by fusing FTS5 keyword results with vector results.
 
-        return all_uuid
+        Args:
+            user_query: The query to search for.
+            tenant_id: The tenant whose documents are searched.
+
+        Returns:
+            List of UUIDs ranked by reciprocal rank fusion.
+        """
+        candidates: int = 50
+        keyword_uuids: List[str] = self._keyword_data(user_query, limit=candidates, tenant_id=tenant_id)
+        vector_uuids: List[str] = self.backend.vector_search(user_query=user_query, limit=candidates, tenant_id=tenant_id)
+        return reciprocal_rank_fusion([keyword_uuids, vector_uuids], limit=10)
+
+    def search(self, user_query: str, tenant_id: str = DEFAULT_TENANT, mode: Optional[str] = None) -> List[str]:
+        """Retrieve the UUIDs of the chunks most relevant to a query.
+
+        Args:
+            user_query: The query to search for.
+            tenant_id: The tenant whose documents are searched.
+            mode: One of RETRIEVAL_MODES; defaults to the instance's retrieval mode.
+
+        Returns:
+            Up to 10 chunk UUIDs, best first.
+
+        Raises:
+            ValueError: If the retrieval mode is unknown.
+        """
+        mode = self._check_mode(mode or self.retrieval_mode)
+        if mode == "lexical":
+            return self._keyword_data(user_query, tenant_id=tenant_id)
+        elif mode == "fusion":
+            return self._fused_data(user_query, tenant_id=tenant_id)
+        return self._weaviate_data(user_query=user_query, tenant_id=tenant_id)
     
-    def all_context(self, query: str) -> str:
-        """Retrieve all relevant context for a given query.
-        
+    def _merge_passages(
+        self,
+        hits: List[StoredChunk],
+        window_chunks: List[StoredChunk],
+        neighbours: int,
+    ) -> List[ContextPassage]:
+        """Stitch each hit and its neighbours into a passage.
+
+        Overlapping windows from the same source are merged so that no text is
+        repeated, and the passages keep the rank order of their best hit.
+
         Args:
-            query: The search query.
-            
+            hits: The chunks returned by the search, best first.
+            window_chunks: The chunks around the hits, ordered by source and position.
+            neighbours: How many chunks were fetched on each side of a hit.
+
         Returns:
-            Concatenated text content from relevant chunks.
+            The passages with their source, best first.
         """
-        weaviate_uuid: List[str] = self._weaviate_data(user_query=query)
+        by_source: Dict[str, Dict[int, StoredChunk]] = {}
+        for chunk in window_chunks:
+            by_source.setdefault(chunk["source_id"], {})[chunk["chunk_index"]] = chunk
+
+        # Each entry is [best_rank, source, low, high]; windows that touch are merged.
+        # Chunks stored without a position become a window of their own rank.
+        windows: List[List[Any]] = []
+        for rank, hit in enumerate(hits):
+            if hit["chunk_index"] is None:
+                windows.append([rank, None, rank, rank])
+                continue
 
-        context_list: List[str] = []
-        for uuid in weaviate_uuid:
-            meta_data: Optional[sql_models.DataChunks] = self.get_chunk_data(chunk_id=uuid)
+            low: int = hit["chunk_index"] - neighbours
+            high: int = hit["chunk_index"] + neighbours
+            best_rank: int = rank
+            for window in list(windows):
+                if window[1] == hit["source_id"] and window[2] <= high + 1 and low - 1 <= window[3]:
+                    low, high = min(low, window[2]), max(high, window[3])
+                    best_rank = min(best_rank, window[0])
+                    windows.remove(window)
+            windows.append([best_rank, hit["source_id"], low, high])
 
-            if meta_data is None:
+        passages: List[ContextPassage] = []
+        for best_rank, source, low, high in sorted(windows, key=lambda window: window[0]):
+            if source is None:
+                passages.append(ContextPassage(source=hits[low]["source_id"], text=hits[low]["text"]))
                 continue
+            chunks = [
+                chunk for index, chunk in sorted(by_source.get(source, {}).items())
+                if low <= index <= high
+            ]
+            passages.append(ContextPassage(source=source, text=self._stitch_chunks(chunks)))
+
+        return passages
+
+    def _stitch_chunks(self, chunks: List[StoredChunk]) -> str:
+        """Join consecutive chunks, dropping the text they overlap on.
+
+        Args:
+            chunks: Chunks of one source in position order.
+
+        Returns:
+            The combined text.
+        """
+        parts: List[str] = []
+        previous_end: Optional[int] = None
+        for chunk in chunks:
+            if previous_end is None or chunk["start_offset"] is None:
+                parts.append(chunk["text"])
+            elif chunk["start_offset"] <= previous_end:
+                parts.append(chunk["text"][previous_end - chunk["start_offset"]:])
             else:
-                context_list.append(meta_data.textChunk)
+                parts.append(" " + chunk["text"])
+            previous_end = chunk["end_offset"]
+        return "".join(parts)
+
+    def context_passages(
+        self, query: str, neighbours: int = 0, tenant_id: str = DEFAULT_TENANT, mode: Optional[str] = None
+    ) -> List[ContextPassage]:
+        """Retrieve the passages relevant to a query, each with the document it came from.
+
+        Args:
+            query: The search query.
+            neighbours: Number of adjacent chunks from the same source to merge
+                into each hit, giving coherent passages instead of fragments.
+            tenant_id: The tenant whose documents are searched.
+            mode: One of RETRIEVAL_MODES; defaults to the instance's retrieval mode.
+
+        Returns:
+            The passages, best first; with no neighbours, one passage per hit.
+        """
+        with track_stage("retrieval"):
+            weaviate_uuid: List[str] = self.search(user_query=query, tenant_id=tenant_id, mode=mode)
+
+        with track_stage("chunk_lookup"):
+            hits: List[StoredChunk] = self.get_chunks_data(chunk_ids=weaviate_uuid, tenant_id=tenant_id)
+
+            if neighbours <= 0:
+                return [ContextPassage(source=hit["source_id"], text=hit["text"]) for hit in hits]
+
+            window_chunks: List[StoredChunk] = self.get_neighbour_chunks(
+                hits=hits, neighbours=neighbours
+            )
+        return self._merge_passages(hits, window_chunks, neighbours)
+
+    def all_context(
+        self, query: str, neighbours: int = 0, tenant_id: str = DEFAULT_TENANT, mode: Optional[str] = None
+    ) -> str:
+        """Retrieve all relevant context for a given query.
         
-        total_context: str = "".join(context_list)
-        return total_context
\ No newline at end of file
+        Args:
+            query: The search query.
+            neighbours: Number of adjacent chunks from the same source to merge
+                into each hit, giving coherent passages instead of fragments.
+            tenant_id: The tenant whose documents are searched.
+            mode: One of RETRIEVAL_MODES; defaults to the instance's retrieval mode.
+            
+        Returns:
+            Concatenated text content from relevant chunks.
+        """
+        passages: List[ContextPassage] = self.context_passages(
+            query=query, neighbours=neighbours, tenant_id=tenant_id, mode=mode
+        )
+        separator: str = "\n\n" if neighbours > 0 else ""
+        return separator.join(passage["text"] for passage in passages)
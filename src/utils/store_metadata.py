@@ -1,44 +1,113 @@
-from typing import List, Dict, Optional, Any
+import os
+import datetime
+from typing import List, Dict, Optional, Any, Tuple
 
-from sqlalchemy.orm import Session
-from sqlalchemy import exc
+from sqlalchemy.orm import scoped_session
+from sqlalchemy import exc, insert
 
-from models import engine, SessionLocal, sql_models
-from type_definitions import ContentUUID
+from models import engine, WriteSessionLocal, sql_models, DEFAULT_TENANT
+from type_definitions import ChunkRecord, FunctionResponse
+from .keyword_index import KeywordIndex, ensure_keyword_index
+from .text_store import SourceTextStore
+
+# Length of an interview; bookings whose slots overlap are rejected.
+INTERVIEW_SLOT_MINUTES: int = 30
+
+# blocks: document text stored once in compressed blocks, chunks as offset ranges;
+# inline: every chunk stores its own text.
+CHUNK_TEXT_STORAGES = ("blocks", "inline")
 
 class MetaData:
     """A class to handle the ingestion of document data into the database."""
     
-    def __init__(self) -> None:
-        """Initialize the MetaData class with database tables and session."""
+    def __init__(self, text_storage: Optional[str] = None) -> None:
+        """Initialize the MetaData class with database tables, the keyword index and a thread-local session.
+
+        Args:
+            text_storage: One of CHUNK_TEXT_STORAGES; defaults to CHUNK_TEXT_STORAGE or "blocks".
+
+        Raises:
+            ValueError: If the text storage is unknown.
+        """
+        self.text_storage: str = text_storage or os.getenv("CHUNK_TEXT_STORAGE", "blocks")
+        if self.text_storage not in CHUNK_TEXT_STORAGES:
+            raise ValueError(
+                f"Unknown chunk text storage '{self.text_storage}'. Please use one of {', '.join(CHUNK_TEXT_STORAGES)}."
+            )
         sql_models.Base.metadata.create_all(bind=engine)
-        self.db: Session = SessionLocal()
+        ensure_keyword_index(engine)
+        # Ingestion reads (the source text dedupe) before it writes, so its
+        # transactions take the write lock up front; a deferred transaction
+        # would fail to upgrade once another writer had committed.
+        self.db: scoped_session = scoped_session(WriteSessionLocal)
+        self.keyword_index: KeywordIndex = KeywordIndex(engine)
+        self.text_store: SourceTextStore = SourceTextStore()
+
+    def _text_columns(
+        self, document_name: str, text_chunks: List[ChunkRecord], tenant_id: str
+    ) -> List[Dict[str, Any]]:
+        """Store the document's text and return the textChunk and sourceTextId of each chunk.
+
+        Args:
+            document_name: The name of the source document.
+            text_chunks: The document's chunks in document order.
+            tenant_id: The tenant that owns the document.
+
+        Returns:
+            One dictionary of column values per chunk.
+        """
+        if self.text_storage == "inline":
+            return [{"textChunk": item['content'], "sourceTextId": None} for item in text_chunks]
+
+        source_text_id, sliced = self.text_store.add(self.db, document_name, text_chunks, tenant_id)
+        return [
+            {"textChunk": None, "sourceTextId": source_text_id} if is_slice
+            else {"textChunk": item['content'], "sourceTextId": None}
+            for item, is_slice in zip(text_chunks, sliced)
+        ]
 
-    def add_data(self, document_name: str, text_chunks: List[ContentUUID]) -> Optional[str]:
-        """Add document chunks to the database.
+    def add_data(
+        self, document_name: str, text_chunks: List[ChunkRecord], tenant_id: str = DEFAULT_TENANT
+    ) -> Optional[str]:
+        """Add document chunks to the database and the keyword index.
+
+        The document text is stored once, and chunks as offset ranges into it,
+        unless the text storage is "inline".
 
         Args:
             document_name: The name of the source document.
-            text_chunks: A list of ContentUUID dictionaries containing 'content' and 'uuid' 
-                        for each text chunk.
+            text_chunks: A list of ChunkRecord dictionaries containing 'content', 'uuid',
+                        the chunk's ordinal position and its offsets in the document.
+            tenant_id: The tenant that owns the document.
 
         Returns:
             Success message if data is added successfully, error message otherwise.
         """
         source_id: str = document_name
+        db_chunks: List[sql_models.DataChunks] = []
 
         try:
-            for item in text_chunks:
-                chunk_str: str = item['content']
+            text_columns: List[Dict[str, Any]] = self._text_columns(source_id, text_chunks, tenant_id)
+            for item, columns in zip(text_chunks, text_columns):
                 chunk_id: str = item['uuid']
                 
                 db_chunk = sql_models.DataChunks(
+                    tenantId=tenant_id,
                     sourceId=source_id,
                     chunkID=chunk_id,
-                    textChunk=chunk_str
+                    textChunk=columns["textChunk"],
+                    sourceTextId=columns["sourceTextId"],
+                    chunkIndex=item['chunk_index'],
+                    startOffset=item['start_offset'],
+                    endOffset=item['end_offset']
                 )
                 self.db.add(db_chunk)
+                db_chunks.append(db_chunk)
 
+            self.db.flush()
+            self.keyword_index.add(
+                self.db, [(chunk.id, item['content']) for chunk, item in zip(db_chunks, text_chunks)]
+            )
             self.db.commit()
             return f"Successfully added {len(text_chunks)} chunks for document '{document_name}'."
 
@@ -46,29 +115,105 @@ class MetaData:
             self.db.rollback()
             return f"Error adding data: {e}"
     
-    def add_interview(self, name: str, email: str, date: str, time: str) -> Optional[str]:
-        """Add interview scheduling information to the database.
+    def add_documents(
+        self, documents: List[Tuple[str, List[ChunkRecord]]], tenant_id: str = DEFAULT_TENANT
+    ) -> Optional[str]:
+        """Add the chunks of several documents in one bulk insert and one commit.
+
+        Each document's text is stored as in add_data, and the chunks are
+        indexed for keyword search in the same transaction.
+
+        Args:
+            documents: (source document name, ChunkRecord list) pairs.
+            tenant_id: The tenant that owns the documents.
+
+        Returns:
+            Success message if data is added successfully, error message otherwise.
+        """
+        rows: List[Dict[str, Any]] = []
+        contents: List[str] = []
+
+        try:
+            for document_name, text_chunks in documents:
+                text_columns: List[Dict[str, Any]] = self._text_columns(document_name, text_chunks, tenant_id)
+                for item, columns in zip(text_chunks, text_columns):
+                    rows.append({
+                        "tenantId": tenant_id,
+                        "sourceId": document_name,
+                        "chunkID": item['uuid'],
+                        "chunkIndex": item['chunk_index'],
+                        "startOffset": item['start_offset'],
+                        "endOffset": item['end_offset'],
+                        **columns,
+                    })
+                    contents.append(item['content'])
+
+            if rows:
+                chunk_ids: List[int] = self.db.execute(
+                    insert(sql_models.DataChunks).returning(
+                        sql_models.DataChunks.id, sort_by_parameter_order=True
+                    ),
+                    rows,
+                ).scalars().all()
+                self.keyword_index.add(self.db, list(zip(chunk_ids, contents)))
+            self.db.commit()
+            return f"Successfully added {len(rows)} chunks for {len(documents)} documents."
+
+        except exc.SQLAlchemyError as e:
+            self.db.rollback()
+            return f"Error adding data: {e}"
+
+    def add_interview(self, name: str, email: str, date: str, time: str) -> FunctionResponse:
+        """Book an interview slot if it does not overlap an existing booking.
+
+        The overlap check and the insert run in one write-locked transaction,
+        so concurrent requests for the same slot cannot both succeed.
         
         Args:
             name: Candidate's name.
             email: Candidate's email.
-            date: Interview date.
-            time: Interview time.
+            date: Interview date in "YYYY-MM-DD" format.
+            time: Interview time in "HH:MM" format.
             
         Returns:
-            Success message if interview is added successfully, error message otherwise.
+            A FunctionResponse whose status is "success", "conflict" or "error".
         """
         try:
-            db_chunk = sql_models.DataInterview(
-                candidate_name=name,
-                candidate_email=email,
-                interview_date=date,
-                interview_time=time
+            interview_date: datetime.date = datetime.date.fromisoformat(date)
+            interview_time: datetime.time = datetime.time.fromisoformat(time)
+        except ValueError as e:
+            return FunctionResponse(status="error", message=f"Invalid date or time: {e}")
+
+        starts_at: datetime.datetime = datetime.datetime.combine(interview_date, interview_time)
+        slot: datetime.timedelta = datetime.timedelta(minutes=INTERVIEW_SLOT_MINUTES)
+        interview = sql_models.DataInterview
+
+        try:
+            with WriteSessionLocal() as db, db.begin():
+                conflict: Optional[sql_models.DataInterview] = db.query(interview).filter(
+                    interview.starts_at > starts_at - slot,
+                    interview.starts_at < starts_at + slot,
+                ).first()
+                if conflict is not None:
+                    return FunctionResponse(
+                        status="conflict",
+                        message=(
+                            f"The slot {date} at {time} overlaps an interview already booked for "
+                            f"{conflict.starts_at.strftime('%Y-%m-%d at %H:%M')}. Please choose another time."
+                        )
+                    )
+
+                db.add(interview(
+                    candidate_name=name,
+                    candidate_email=email,
+                    interview_date=interview_date,
+                    interview_time=interview_time,
+                    starts_at=starts_at
+                ))
+            return FunctionResponse(
+                status="success",
+                message=f"Interview for {name} has been booked for {date} at {time}."
             )
-            self.db.add(db_chunk)
-            self.db.commit()
-            return f"Successfully added Interview for {name} has been booked for {date} at {time}."
 
         except exc.SQLAlchemyError as e:
-            self.db.rollback()
-            return f"Error adding data: {e}"
\ No newline at end of file
+            return FunctionResponse(status="error", message=f"Error adding data: {e}")
@@ -1,60 +1,70 @@
-from typing import List, Dict, Any
+from typing import List, Optional
 
-import weaviate
-from weaviate.client import WeaviateClient
-
-from models import WeaviateManager
+from models import DEFAULT_TENANT
 from type_definitions import ContentUUID, TextChunk
+from .vector_backend import VectorBackend, get_vector_backend
 
 class WeaviateCollection:
-    """Manages interactions with a specific Weaviate collection for data storage and retrieval."""
-    
-    def __init__(self) -> None:
-        """Initialize the WeaviateCollection instance with collection setup."""
-        self.collection_name: str = 'interview_queries'
-        self.new_collection: WeaviateManager = WeaviateManager()
+    """Manages interactions with the vector store for data storage.
 
-        self._create_collection()
+    Calls are delegated to the configured VectorBackend: Weaviate by default,
+    or the embedded NumPy store when VECTOR_BACKEND=embedded.
+    """
 
-        self.client: WeaviateClient = weaviate.connect_to_local()
-        self.collection = self.client.collections.get(self.collection_name)
-    
-    def _create_collection(self) -> None:
-        """Create the Weaviate collection if it does not already exist."""
-        self.new_collection.create_collection(self.collection_name)
+    def __init__(self, backend: Optional[VectorBackend] = None) -> None:
+        """Initialize the WeaviateCollection instance.
 
-    def import_data(self, data_rows: List[TextChunk]) -> List[ContentUUID]:
-        """Import a list of data rows into the Weaviate collection.
+        Args:
+            backend: The backend to use; defaults to the shared backend.
+        """
+        self.backend: VectorBackend = backend or get_vector_backend()
 
-        This method uses a fixed-size batching process to efficiently import
-        data with a retry mechanism for failed objects.
+    def import_data(self, data_rows: List[TextChunk], tenant_id: str = DEFAULT_TENANT) -> List[ContentUUID]:
+        """Import a list of data rows into a tenant of the vector store.
 
         Args:
             data_rows: A list of TextChunk dictionaries to be imported.
+            tenant_id: The tenant that owns the data.
 
         Returns:
             A list of ContentUUID dictionaries containing content and UUID pairs.
         """
-        content_uuids: List[ContentUUID] = []
-        
-        with self.collection.batch.fixed_size(batch_size=200) as batch:
-            for data_row in data_rows:
-                uuid = batch.add_object(properties=data_row)
-                data = ContentUUID(
-                    content=data_row['text_content'],
-                    uuid=str(uuid)
-                )
-                content_uuids.append(data)
-        
-        failed_objects = self.collection.batch.failed_objects
-        if failed_objects:
-            with self.collection.batch.fixed_size(batch_size=50) as failed_batch:
-                for data_row in failed_objects:
-                    uuid = failed_batch.add_object(properties=data_row)
-                    data = ContentUUID(
-                        content=str(data_row),
-                        uuid=str(uuid)
-                    )
-                    content_uuids.append(data)
-        
-        return content_uuids
\ No newline at end of file
+        return self.backend.import_data(data_rows=data_rows, tenant_id=tenant_id)
+
+    def delete_data(self, uuids: List[str], tenant_id: str = DEFAULT_TENANT) -> str:
+        """Delete chunks from a tenant of the vector store.
+
+        Args:
+            uuids: The UUIDs of the chunks to delete.
+            tenant_id: The tenant that owns the chunks.
+
+        Returns:
+            Success or error message.
+        """
+        return self.backend.delete_data(uuids=uuids, tenant_id=tenant_id)
+
+    def deactivate_tenant(self, tenant_id: str, offload: bool = False) -> str:
+        """Release the memory held by an idle tenant.
+
+        A deactivated tenant is reactivated automatically on its next request;
+        an offloaded one stays unavailable until activate_tenant is called.
+
+        Args:
+            tenant_id: The tenant to deactivate.
+            offload: Move the tenant to cloud storage instead of local disk.
+
+        Returns:
+            Success or error message.
+        """
+        return self.backend.deactivate_tenant(tenant_id=tenant_id, offload=offload)
+
+    def activate_tenant(self, tenant_id: str) -> str:
+        """Load a deactivated or offloaded tenant back so it can serve requests.
+
+        Args:
+            tenant_id: The tenant to activate.
+
+        Returns:
+            Success or error message.
+        """
+        return self.backend.activate_tenant(tenant_id=tenant_id)
@@ -0,0 +1,274 @@
+import os
+import zlib
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from models import sql_models, DEFAULT_TENANT
+from type_definitions import ChunkRecord
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Characters of source text per compressed block. A chunk read decompresses
+# the one or two blocks it falls in, so smaller blocks read faster and
+# larger blocks compress better.
+BLOCK_CHARS: int = 8192
+
+# zstd when the zstandard package is installed, otherwise zlib from the
+# standard library. The codec is stored per block, so both can be read.
+DEFAULT_CODEC: str = "zstd" if zstandard is not None else "zlib"
+
+BlockKey = Tuple[int, int]
+
+
+def compress(data: bytes, codec: str = DEFAULT_CODEC) -> bytes:
+    """Compress a block with the given codec ("zstd" or "zlib")."""
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    """Decompress a block written with the given codec.
+
+    Raises:
+        RuntimeError: If the block is zstd-compressed and zstandard is not installed.
+    """
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("This database has zstd-compressed text. Please install the zstandard package.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def source_text(chunks: Sequence[ChunkRecord]) -> Tuple[str, List[bool]]:
+    """Rebuild a document's text from its chunks, keeping overlapping text once.
+
+    Gaps between chunks (whitespace between sentences) are filled with
+    spaces, so every chunk keeps its offsets.
+
+    Args:
+        chunks: The document's chunks in document order.
+
+    Returns:
+        The text, and for each chunk whether it is exactly text[start_offset:end_offset].
+    """
+    pieces: List[str] = []
+    position: int = 0
+    for chunk in chunks:
+        start: Optional[int] = chunk['start_offset']
+        end: Optional[int] = chunk['end_offset']
+        if start is None or end is None or start < 0 or end - start != len(chunk['content']):
+            continue
+        if start > position:
+            pieces.append(" " * (start - position))
+            position = start
+        if end > position:
+            pieces.append(chunk['content'][position - start:])
+            position = end
+
+    text: str = "".join(pieces)
+    sliced: List[bool] = [
+        chunk['start_offset'] is not None and chunk['end_offset'] is not None
+        and text[chunk['start_offset']:chunk['end_offset']] == chunk['content']
+        for chunk in chunks
+    ]
+    return text, sliced
+
+
+class LruCache:
+    """A thread-safe LRU cache; source texts never change, so entries need no invalidation."""
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            capacity: Maximum number of entries kept.
+        """
+        self.capacity: int = capacity
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a cached entry and mark it as recently used, or None."""
+        with self._lock:
+            value: Optional[Any] = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache an entry, evicting the least recently used ones beyond capacity."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+
+# Decompressed blocks, keyed by (SourceText id, block index).
+_block_cache: LruCache = LruCache(int(os.getenv("TEXT_BLOCK_CACHE_SIZE", "1024")))
+# Block size of each SourceText id.
+_block_sizes: LruCache = LruCache(65536)
+
+
+class SourceTextStore:
+    """Stores each document's text once in compressed blocks and reads chunks as slices of it."""
+
+    def __init__(self, cache: Optional[LruCache] = None, codec: str = DEFAULT_CODEC) -> None:
+        """Initialize the store.
+
+        Args:
+            cache: The block cache; defaults to the process-wide cache (TEXT_BLOCK_CACHE_SIZE blocks).
+            codec: Compression of new blocks ("zstd" or "zlib").
+        """
+        self.cache: LruCache = _block_cache if cache is None else cache
+        self.codec: str = codec
+
+    def add(
+        self, db: Session, source_id: str, chunks: Sequence[ChunkRecord], tenant_id: str = DEFAULT_TENANT
+    ) -> Tuple[Optional[int], List[bool]]:
+        """Store a document's text in the caller's transaction.
+
+        A text the tenant has already stored is not stored again.
+
+        Args:
+            db: The session that stores the chunks.
+            source_id: The name of the source document.
+            chunks: The document's chunks in document order.
+            tenant_id: The tenant that owns the document.
+
+        Returns:
+            The SourceText id (None if no chunk can be read from it) and, for
+            each chunk, whether it is a slice of that text.
+        """
+        text, sliced = source_text(chunks)
+        if not any(sliced):
+            return None, sliced
+
+        digest: str = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        existing = db.query(sql_models.DataSourceText.id).filter(
+            sql_models.DataSourceText.tenantId == tenant_id,
+            sql_models.DataSourceText.contentHash == digest,
+        ).first()
+        if existing is not None:
+            return existing.id, sliced
+
+        source = sql_models.DataSourceText(
+            tenantId=tenant_id,
+            sourceId=source_id,
+            contentHash=digest,
+            charCount=len(text),
+            blockChars=BLOCK_CHARS,
+        )
+        db.add(source)
+        db.flush()
+        db.execute(insert(sql_models.DataTextBlock), [
+            {
+                "sourceTextId": source.id,
+                "blockIndex": index,
+                "codec": self.codec,
+                "data": compress(text[start:start + BLOCK_CHARS].encode("utf-8"), self.codec),
+            }
+            for index, start in enumerate(range(0, len(text), BLOCK_CHARS))
+        ])
+        return source.id, sliced
+
+    def _block_chars(self, db: Session, source_ids: Iterable[int]) -> Dict[int, int]:
+        """Return the block size of each source text, querying only the uncached ones."""
+        sizes: Dict[int, int] = {}
+        missing: List[int] = []
+        for source_id in source_ids:
+            size: Optional[int] = _block_sizes.get(source_id)
+            if size is None:
+                missing.append(source_id)
+            else:
+                sizes[source_id] = size
+
+        if missing:
+            for source_id, size in db.query(sql_models.DataSourceText.id, sql_models.DataSourceText.blockChars).filter(
+                sql_models.DataSourceText.id.in_(missing)
+            ).all():
+                sizes[source_id] = size
+                _block_sizes.put(source_id, size)
+        return sizes
+
+    def _blocks(self, db: Session, keys: Set[BlockKey]) -> Dict[BlockKey, str]:
+        """Return the given blocks decompressed, loading the uncached ones in one query."""
+        blocks: Dict[BlockKey, str] = {}
+        missing: List[BlockKey] = []
+        for key in keys:
+            block: Optional[str] = self.cache.get(key)
+            if block is None:
+                missing.append(key)
+            else:
+                blocks[key] = block
+
+        if missing:
+            # Row-value IN is not matched to the primary key index by SQLite, and
+            # building the OR-ed key pairs as SQLAlchemy expressions costs more
+            # than the lookups, so the statement is passed to the driver as is.
+            conditions: str = " OR ".join(["(sourceTextId = ? AND blockIndex = ?)"] * len(missing))
+            rows = db.connection().exec_driver_sql(
+                f"SELECT sourceTextId, blockIndex, codec, data FROM TextBlock WHERE {conditions}",
+                tuple(value for key in missing for value in key),
+            ).all()
+            for source_text_id, block_index, codec, data in rows:
+                block = decompress(data, codec).decode("utf-8")
+                blocks[(source_text_id, block_index)] = block
+                self.cache.put((source_text_id, block_index), block)
+        return blocks
+
+    def texts(self, db: Session, chunks: Sequence[sql_models.DataChunks]) -> List[str]:
+        """Return the text of each chunk, reading chunks stored as offset ranges from their source text.
+
+        The chunks are not modified, so the text does not depend on the
+        session's state after the transaction ends.
+
+        Args:
+            db: The session to read blocks with.
+            chunks: Chunks as returned by a query.
+
+        Returns:
+            One text per chunk, in order.
+        """
+        pending: List[sql_models.DataChunks] = [
+            chunk for chunk in chunks if chunk.textChunk is None and chunk.sourceTextId is not None
+        ]
+        if not pending:
+            return [chunk.textChunk for chunk in chunks]
+
+        block_chars: Dict[int, int] = self._block_chars(db, {chunk.sourceTextId for chunk in pending})
+        keys: Set[BlockKey] = set()
+        for chunk in pending:
+            size: int = block_chars[chunk.sourceTextId]
+            keys.update(
+                (chunk.sourceTextId, index)
+                for index in range(chunk.startOffset // size, (chunk.endOffset - 1) // size + 1)
+            )
+        blocks: Dict[BlockKey, str] = self._blocks(db, keys)
+
+        texts: List[str] = []
+        for chunk in chunks:
+            if chunk.textChunk is not None or chunk.sourceTextId is None:
+                texts.append(chunk.textChunk)
+                continue
+            size = block_chars[chunk.sourceTextId]
+            first: int = chunk.startOffset // size
+            text: str = "".join(
+                blocks[(chunk.sourceTextId, index)] for index in range(first, (chunk.endOffset - 1) // size + 1)
+            )
+            base: int = first * size
+            texts.append(text[chunk.startOffset - base:chunk.endOffset - base])
+        return texts
@@ -0,0 +1,244 @@
+import os
+import json
+import time
+import uuid
+import heapq
+import itertools
+import datetime
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, MutableMapping, Optional, Tuple
+
+from type_definitions import RequestTraceRecord, TraceSpan
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+AsgiApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+# Trace every request. When off, a span costs one context variable lookup.
+REQUEST_TRACING: bool = os.getenv("REQUEST_TRACING", "off").lower() in ("1", "on", "true")
+
+# Traced requests kept by the slow request log, slowest first.
+SLOW_REQUEST_LOG_SIZE: int = int(os.getenv("SLOW_REQUEST_LOG_SIZE", "20"))
+
+# A request sending this header with any value other than "0" gets its spans back in it.
+DEBUG_HEADER: str = "x-debug-trace"
+
+# Spans returned in the debug header; proxies commonly reject headers above 8 KB.
+MAX_HEADER_SPANS: int = 64
+
+# Admin and scrape requests are not traced, so they never crowd out real traffic.
+UNTRACED_PREFIXES: Tuple[str, ...] = ("/admin", "/metrics")
+
+_current_trace: ContextVar[Optional["RequestTrace"]] = ContextVar("current_trace", default=None)
+_span_depth: ContextVar[int] = ContextVar("span_depth", default=0)
+
+
+class RequestTrace:
+    """The spans recorded while serving one request, from any thread that inherited its context."""
+
+    def __init__(self, method: str, path: str) -> None:
+        """Start a trace.
+
+        Args:
+            method: The HTTP method of the request.
+            path: The request path, without the query string.
+        """
+        self.trace_id: str = uuid.uuid4().hex[:16]
+        self.method: str = method
+        self.path: str = path
+        self.started_at: datetime.datetime = datetime.datetime.now(datetime.timezone.utc)
+        self._started: float = time.perf_counter()
+        self._spans: List[TraceSpan] = []
+        self._lock: threading.Lock = threading.Lock()
+
+    def add(self, name: str, started: float, finished: float, depth: int) -> None:
+        """Record a finished span.
+
+        Args:
+            name: The stage name.
+            started: time.perf_counter() when the span was entered.
+            finished: time.perf_counter() when the span was left.
+            depth: The nesting level of the span.
+        """
+        trace_span = TraceSpan(
+            name=name,
+            start_ms=round((started - self._started) * 1000, 3),
+            duration_ms=round((finished - started) * 1000, 3),
+            depth=depth,
+            thread=threading.current_thread().name,
+        )
+        with self._lock:
+            self._spans.append(trace_span)
+
+    def spans(self) -> List[TraceSpan]:
+        """Return the spans recorded so far, in the order they started."""
+        with self._lock:
+            return sorted(self._spans, key=lambda trace_span: trace_span["start_ms"])
+
+    def elapsed_ms(self) -> float:
+        """Return the milliseconds since the request started."""
+        return round((time.perf_counter() - self._started) * 1000, 3)
+
+    def server_timing(self) -> str:
+        """Format the spans as a Server-Timing header value, summing spans of the same stage."""
+        totals: Dict[str, List[float]] = {}
+        for trace_span in self.spans():
+            total: List[float] = totals.setdefault(trace_span["name"], [0.0, 0])
+            total[0] += trace_span["duration_ms"]
+            total[1] += 1
+        entries: List[str] = [
+            f'{name};dur={duration:.1f}' + (f';desc="{count} calls"' if count > 1 else "")
+            for name, (duration, count) in totals.items()
+        ]
+        entries.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(entries)
+
+    def debug_header(self) -> str:
+        """Format the trace as compact JSON for the debug header: [name, start ms, duration ms, depth] per span."""
+        return json.dumps({
+            "trace_id": self.trace_id,
+            "total_ms": self.elapsed_ms(),
+            "spans": [
+                [trace_span["name"], trace_span["start_ms"], trace_span["duration_ms"], trace_span["depth"]]
+                for trace_span in self.spans()[:MAX_HEADER_SPANS]
+            ],
+        }, separators=(",", ":"))
+
+    def record(self, status: int) -> RequestTraceRecord:
+        """Return the finished request and its spans.
+
+        Args:
+            status: The HTTP status code of the response.
+        """
+        return RequestTraceRecord(
+            trace_id=self.trace_id,
+            method=self.method,
+            path=self.path,
+            status=status,
+            started_at=self.started_at.isoformat(),
+            duration_ms=self.elapsed_ms(),
+            spans=self.spans(),
+        )
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as a span of the current request's trace, if it has one.
+
+    Threads see the trace only if they run in a copy of the request's context,
+    as run_in_threadpool does; submit to other executors with
+    contextvars.copy_context().run.
+
+    Args:
+        name: The stage name, e.g. "retrieval" or "llm.chat".
+    """
+    trace: Optional[RequestTrace] = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    depth: int = _span_depth.get()
+    token = _span_depth.set(depth + 1)
+    started: float = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, started, time.perf_counter(), depth)
+        _span_depth.reset(token)
+
+
+class SlowRequestLog:
+    """Keeps the slowest traced requests, evicting the fastest when full."""
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the log.
+
+        Args:
+            capacity: Maximum number of requests kept.
+        """
+        self.capacity: int = capacity
+        self._heap: List[Tuple[float, int, RequestTraceRecord]] = []
+        self._sequence: Iterator[int] = itertools.count()
+        self._lock: threading.Lock = threading.Lock()
+
+    def add(self, record: RequestTraceRecord) -> None:
+        """Keep the request if it is among the slowest seen."""
+        entry: Tuple[float, int, RequestTraceRecord] = (record["duration_ms"], next(self._sequence), record)
+        with self._lock:
+            if len(self._heap) < self.capacity:
+                heapq.heappush(self._heap, entry)
+            elif self._heap and entry[:2] > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, entry)
+
+    def slowest(self, limit: Optional[int] = None) -> List[RequestTraceRecord]:
+        """Return the kept requests, slowest first.
+
+        Args:
+            limit: Maximum number of requests to return; all if None.
+        """
+        with self._lock:
+            entries: List[Tuple[float, int, RequestTraceRecord]] = sorted(self._heap, reverse=True)
+        return [record for _, _, record in entries[:limit]]
+
+    def clear(self) -> None:
+        """Forget every kept request."""
+        with self._lock:
+            self._heap.clear()
+
+
+slow_requests: SlowRequestLog = SlowRequestLog(SLOW_REQUEST_LOG_SIZE)
+
+
+class TraceMiddleware:
+    """ASGI middleware that traces each request and reports its stage timings.
+
+    Responses get a Server-Timing header, and also the spans as JSON in
+    X-Debug-Trace if the request sent that header. Finished requests go to
+    the slow request log.
+    """
+
+    def __init__(self, app: AsgiApp, enabled: Optional[bool] = None, log: Optional[SlowRequestLog] = None) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application.
+            enabled: Whether requests are traced; defaults to REQUEST_TRACING.
+            log: Where finished requests go; defaults to the process-wide slow request log.
+        """
+        self.app: AsgiApp = app
+        self.enabled: bool = REQUEST_TRACING if enabled is None else enabled
+        self.log: SlowRequestLog = slow_requests if log is None else log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.enabled or scope["type"] != "http" or scope["path"].startswith(UNTRACED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        trace: RequestTrace = RequestTrace(scope["method"], scope["path"])
+        debug: bool = any(
+            name.decode("latin-1").lower() == DEBUG_HEADER and value not in (b"", b"0")
+            for name, value in scope["headers"]
+        )
+        status: int = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers: List[Tuple[bytes, bytes]] = list(message.get("headers", []))
+                headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                if debug:
+                    headers.append((DEBUG_HEADER.encode("latin-1"), trace.debug_header().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current_trace.set(trace)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_trace.reset(token)
+            self.log.add(trace.record(status))
@@ -0,0 +1,323 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from weaviate.classes.query import Filter
+from weaviate.client import WeaviateClient
+from weaviate.exceptions import WeaviateQueryError
+
+from models import WeaviateManager, DEFAULT_TENANT
+from type_definitions import ContentUUID, TextChunk
+from .metrics import INGEST_FAILED_OBJECTS
+
+# UUIDs per delete request; Weaviate deletes at most QUERY_MAXIMUM_RESULTS
+# (10000 by default) objects per request.
+DELETE_BATCH_SIZE: int = 5000
+
+
+class VectorBackend(ABC):
+    """Storage for chunk vectors: imports chunks and finds the ones matching a query."""
+
+    @abstractmethod
+    def import_data(self, data_rows: List[TextChunk], tenant_id: str = DEFAULT_TENANT) -> List[ContentUUID]:
+        """Store chunks and return the UUID assigned to each.
+
+        Args:
+            data_rows: A list of TextChunk dictionaries to be imported.
+            tenant_id: The tenant that owns the data.
+
+        Returns:
+            A list of ContentUUID dictionaries containing content and UUID pairs.
+        """
+
+    @abstractmethod
+    def delete_data(self, uuids: List[str], tenant_id: str = DEFAULT_TENANT) -> str:
+        """Delete chunks, e.g. ones whose metadata could not be stored.
+
+        Args:
+            uuids: The UUIDs of the chunks to delete.
+            tenant_id: The tenant that owns the chunks.
+
+        Returns:
+            Success or error message.
+        """
+
+    @abstractmethod
+    def hybrid_search(self, user_query: str, limit: int = 10, tenant_id: str = DEFAULT_TENANT) -> List[str]:
+        """Find the chunks that best match a query, combining vector and keyword scores.
+
+        Args:
+            user_query: The query to search for.
+            limit: Maximum number of results.
+            tenant_id: The tenant whose chunks are searched.
+
+        Returns:
+            The UUIDs of the matching chunks, best first; empty if the tenant has no data.
+        """
+
+    @abstractmethod
+    def vector_search(self, user_query: str, limit: int = 10, tenant_id: str = DEFAULT_TENANT) -> List[str]:
+        """Find the chunks nearest to a query by vector similarity alone.
+
+        Args:
+            user_query: The query to search for.
+            limit: Maximum number of results.
+            tenant_id: The tenant whose chunks are searched.
+
+        Returns:
+            The UUIDs of the matching chunks, best first; empty if the tenant has no data.
+        """
+
+    @abstractmethod
+    def deactivate_tenant(self, tenant_id: str, offload: bool = False) -> str:
+        """Release the memory held by an idle tenant.
+
+        Args:
+            tenant_id: The tenant to deactivate.
+            offload: Move the tenant to cloud storage instead of local disk.
+
+        Returns:
+            Success or error message.
+        """
+
+    @abstractmethod
+    def activate_tenant(self, tenant_id: str) -> str:
+        """Load a deactivated or offloaded tenant back so it can serve requests.
+
+        Args:
+            tenant_id: The tenant to activate.
+
+        Returns:
+            Success or error message.
+        """
+
+
+class WeaviateBackend(VectorBackend):
+    """Stores chunks in a multi-tenant Weaviate collection vectorized by multi2vec-clip."""
+
+    def __init__(self, collection_name: str = 'interview_queries', client: Optional[WeaviateClient] = None) -> None:
+        """Initialize the backend; the collection is created or opened on first use.
+
+        Args:
+            collection_name: The Weaviate collection holding the chunks.
+            client: The client to use; defaults to the shared client.
+        """
+        self.collection_name: str = collection_name
+        self._client: Optional[WeaviateClient] = client
+        self._collection = None
+        self._connect_lock: threading.Lock = threading.Lock()
+
+    @property
+    def collection(self):
+        """The Weaviate collection, created if needed on first use.
+
+        Raises:
+            RuntimeError: If the collection does not exist and cannot be created.
+        """
+        if self._collection is None:
+            with self._connect_lock:
+                if self._collection is None:
+                    manager: WeaviateManager = WeaviateManager(self._client)
+                    error: Optional[str] = manager.create_collection(self.collection_name)
+                    if error is not None:
+                        raise RuntimeError(error)
+                    self._collection = manager.client.collections.get(self.collection_name)
+        return self._collection
+
+    def import_data(self, data_rows: List[TextChunk], tenant_id: str = DEFAULT_TENANT) -> List[ContentUUID]:
+        """Import a list of data rows into a tenant of the Weaviate collection.
+
+        This method uses a fixed-size batching process to efficiently import
+        data with a retry mechanism for failed objects. The tenant is created
+        on first import.
+
+        Args:
+            data_rows: A list of TextChunk dictionaries to be imported.
+            tenant_id: The tenant that owns the data.
+
+        Returns:
+            A list of ContentUUID dictionaries containing content and UUID pairs.
+        """
+        content_uuids: List[ContentUUID] = []
+        collection = self.collection.with_tenant(tenant_id)
+
+        with collection.batch.fixed_size(batch_size=200) as batch:
+            for data_row in data_rows:
+                uuid = batch.add_object(properties=data_row)
+                data = ContentUUID(
+                    content=data_row['text_content'],
+                    uuid=str(uuid)
+                )
+                content_uuids.append(data)
+
+        failed_objects = collection.batch.failed_objects
+        if failed_objects:
+            INGEST_FAILED_OBJECTS.inc(len(failed_objects))
+            with collection.batch.fixed_size(batch_size=50) as failed_batch:
+                for data_row in failed_objects:
+                    uuid = failed_batch.add_object(properties=data_row)
+                    data = ContentUUID(
+                        content=str(data_row),
+                        uuid=str(uuid)
+                    )
+                    content_uuids.append(data)
+
+        return content_uuids
+
+    def delete_data(self, uuids: List[str], tenant_id: str = DEFAULT_TENANT) -> str:
+        """Delete objects from the tenant's shard by UUID.
+
+        Args:
+            uuids: The UUIDs of the chunks to delete.
+            tenant_id: The tenant that owns the chunks.
+
+        Returns:
+            Success or error message.
+        """
+        collection = self.collection.with_tenant(tenant_id)
+        failed: int = 0
+        try:
+            for start in range(0, len(uuids), DELETE_BATCH_SIZE):
+                result = collection.data.delete_many(
+                    where=Filter.by_id().contains_any(uuids[start:start + DELETE_BATCH_SIZE])
+                )
+                failed += result.failed
+        except Exception as e:
+            return f"Error deleting chunks: {e}"
+        if failed:
+            return f"Error deleting chunks: {failed} of {len(uuids)} could not be deleted."
+        return f"Deleted {len(uuids)} chunks."
+
+    def hybrid_search(self, user_query: str, limit: int = 10, tenant_id: str = DEFAULT_TENANT) -> List[str]:
+        """Run a Weaviate hybrid query against the tenant's shard.
+
+        Args:
+            user_query: The query to search for.
+            limit: Maximum number of results.
+            tenant_id: The tenant whose chunks are searched.
+
+        Returns:
+            The UUIDs of the matching chunks, best first; empty if the tenant has no data.
+        """
+        try:
+            all_responses = self.collection.with_tenant(tenant_id).query.hybrid(
+                query=user_query,
+                limit=limit,
+            )
+        except WeaviateQueryError:
+            if not self.collection.tenants.exists(tenant_id):
+                return []
+            raise
+
+        return [str(responses.uuid) for responses in all_responses.objects]
+
+    def vector_search(self, user_query: str, limit: int = 10, tenant_id: str = DEFAULT_TENANT) -> List[str]:
+        """Run a Weaviate near_text query against the tenant's shard.
+
+        Args:
+            user_query: The query to search for.
+            limit: Maximum number of results.
+            tenant_id: The tenant whose chunks are searched.
+
+        Returns:
+            The UUIDs of the matching chunks, best first; empty if the tenant has no data.
+        """
+        try:
+            all_responses = self.collection.with_tenant(tenant_id).query.near_text(
+                query=user_query,
+                limit=limit,
+            )
+        except WeaviateQueryError:
+            if not self.collection.tenants.exists(tenant_id):
+                return []
+            raise
+
+        return [str(responses.uuid) for responses in all_responses.objects]
+
+    def deactivate_tenant(self, tenant_id: str, offload: bool = False) -> str:
+        """Release the memory held by an idle tenant.
+
+        Inactive tenants stay on local disk and are reactivated automatically
+        on their next request. Offloaded tenants are moved to cloud storage,
+        which requires an offload module on the Weaviate server, and stay
+        unavailable until activate_tenant loads them back.
+
+        Args:
+            tenant_id: The tenant to deactivate.
+            offload: Move the tenant to cloud storage instead of local disk.
+
+        Returns:
+            Success or error message.
+        """
+        try:
+            if not self.collection.tenants.exists(tenant_id):
+                return f"Error: tenant '{tenant_id}' does not exist."
+            if offload:
+                self.collection.tenants.offload(tenant_id)
+                return f"Tenant '{tenant_id}' is being offloaded."
+            self.collection.tenants.deactivate(tenant_id)
+            return f"Tenant '{tenant_id}' was deactivated."
+        except Exception as e:
+            return f"Error deactivating tenant '{tenant_id}': {e}"
+
+    def activate_tenant(self, tenant_id: str) -> str:
+        """Set a tenant active, onloading it from cloud storage if it was offloaded.
+
+        Onloading runs in the background; the tenant serves requests once
+        Weaviate reports it ACTIVE.
+
+        Args:
+            tenant_id: The tenant to activate.
+
+        Returns:
+            Success or error message.
+        """
+        try:
+            if not self.collection.tenants.exists(tenant_id):
+                return f"Error: tenant '{tenant_id}' does not exist."
+            self.collection.tenants.activate(tenant_id)
+            return f"Tenant '{tenant_id}' is being activated."
+        except Exception as e:
+            return f"Error activating tenant '{tenant_id}': {e}"
+
+
+_shared_backend: Optional[VectorBackend] = None
+_backend_lock: threading.Lock = threading.Lock()
+
+
+def get_vector_backend() -> VectorBackend:
+    """Return the process-wide vector backend, creating it on first use.
+
+    VECTOR_BACKEND selects the implementation: "weaviate" (default) or
+    "embedded" for the in-process NumPy store.
+
+    Returns:
+        The shared VectorBackend.
+
+    Raises:
+        ValueError: If VECTOR_BACKEND names an unknown backend.
+    """
+    global _shared_backend
+    with _backend_lock:
+        if _shared_backend is None:
+            name: str = os.getenv("VECTOR_BACKEND", "weaviate")
+            if name == "weaviate":
+                _shared_backend = WeaviateBackend()
+            elif name == "embedded":
+                from .embedded_store import EmbeddedBackend
+                _shared_backend = EmbeddedBackend()
+            else:
+                raise ValueError(f"Unknown VECTOR_BACKEND '{name}'. Please use 'weaviate' or 'embedded'.")
+        return _shared_backend
+
+
+def set_vector_backend(backend: VectorBackend) -> None:
+    """Use the given backend for all vector storage, e.g. an embedded store in tests.
+
+    Args:
+        backend: The backend to use.
+    """
+    global _shared_backend
+    with _backend_lock:
+        _shared_backend = backend